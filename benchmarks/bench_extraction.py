@@ -0,0 +1,74 @@
+"""Per-page latency of the single-pass DOM helper vs. separate round-trips
+
+Usage: python -m benchmarks.bench_extraction [iterations]
+
+Loads a synthetic page with many links and buttons into headless Chromium
+and times, per page:
+  * separate: page.title(), metadata evaluate, links evaluate, clickables
+    evaluate and page.content() (what _crawl_page used to do)
+  * bundle:   one extract_page_bundle() call returning all of the above
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from playwright.async_api import async_playwright
+
+from crawler.extraction import extract_page_bundle
+
+
+def build_page(links=300, buttons=150, paragraphs=200):
+    body = []
+    for i in range(paragraphs):
+        body.append(f"<p>Paragraph {i} with some filler text for the benchmark page.</p>")
+    for i in range(links):
+        body.append(f'<a href="/page-{i}" title="Page {i}">Link {i}</a>')
+    for i in range(buttons):
+        body.append(f'<button class="btn" id="b{i}">Button {i}</button>')
+    meta = ''.join(f'<meta name="m{i}" content="v{i}">' for i in range(20))
+    return f"<!DOCTYPE html><html><head><title>Bench</title>{meta}</head><body>{''.join(body)}</body></html>"
+
+
+async def separate_round_trips(page):
+    await page.title()
+    await extract_page_bundle(page, links=False, clickables=False, html=False)
+    await extract_page_bundle(page, metadata=False, clickables=False, html=False)
+    await extract_page_bundle(page, metadata=False, links=False, html=False)
+    await page.content()
+
+
+async def single_bundle(page):
+    await extract_page_bundle(page)
+
+
+async def time_it(func, page, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func(page)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main(iterations):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(build_page())
+
+        # Warm up both paths
+        await separate_round_trips(page)
+        await single_bundle(page)
+
+        separate_ms = await time_it(separate_round_trips, page, iterations)
+        bundle_ms = await time_it(single_bundle, page, iterations)
+        await browser.close()
+
+    print(f"separate round-trips: {separate_ms:.2f} ms/page (median of {iterations})")
+    print(f"single bundle:        {bundle_ms:.2f} ms/page (median of {iterations})")
+    print(f"saved per page:       {separate_ms - bundle_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
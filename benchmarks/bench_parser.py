@@ -0,0 +1,55 @@
+"""parse_html backend comparison on large pages
+
+Usage: python -m benchmarks.bench_parser [iterations]
+
+Builds synthetic pages of increasing size and reports the median parse
+time of the BeautifulSoup backend and the single-pass lxml backend.
+"""
+import statistics
+import sys
+import time
+
+from crawler.soup_parser import parse_html
+
+
+def build_page(sections):
+    body = []
+    for i in range(sections):
+        body.append(f"""
+        <section>
+            <h2>Section {i}</h2>
+            <p>Paragraph {i} talks about crawling, parsing and <b>keyword</b> extraction.</p>
+            <p>Another paragraph with a <a href="/page-{i}">link</a> and
+               a <a href="https://twitter.com/user{i}">social link</a>.</p>
+            <ul><li>Item {i}.1</li><li>Item {i}.2 <ol><li>Nested</li></ol></li></ul>
+            <table><tr><th>Name</th><th>Value</th></tr><tr><td>{i}</td><td>{i * 2}</td></tr></table>
+            <img src="/img/{i}.png" alt="Image {i}" width="100">
+            <form action="/search" method="get"><input type="text" name="q{i}"></form>
+            <script>var x{i} = {i};</script>
+        </section>""")
+    return f"""<!DOCTYPE html><html><head><title>Benchmark</title>
+        <meta name="description" content="Large benchmark page"></head>
+        <body><header><nav>Nav</nav></header><main>{''.join(body)}</main>
+        <footer>Footer</footer></body></html>"""
+
+
+def median_ms(html, backend, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        parse_html(html, backend=backend)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(iterations):
+    print(f"{'sections':>8} {'size KB':>8} {'bs4 ms':>9} {'lxml ms':>9} {'speedup':>8}")
+    for sections in (50, 200, 1000):
+        html = build_page(sections)
+        bs4_ms = median_ms(html, "bs4", iterations)
+        lxml_ms = median_ms(html, "lxml", iterations)
+        print(f"{sections:>8} {len(html) / 1024:>8.0f} {bs4_ms:>9.1f} {lxml_ms:>9.1f} {bs4_ms / lxml_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,30 @@
+import json
+import os
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path, state):
+    """Write state as JSON so that path always holds a complete checkpoint
+
+    The data goes to a temporary file in the same directory first and is
+    moved into place with os.replace, which is atomic, so a crash mid-write
+    leaves the previous checkpoint intact.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding='utf-8') as f:
+        json.dump(dict(state, version=CHECKPOINT_VERSION), f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path):
+    """Read a checkpoint written by save_checkpoint"""
+    with open(path, encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version in {path}: {state.get('version')}")
+    return state
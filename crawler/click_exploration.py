@@ -0,0 +1,96 @@
+# What to do when a click navigates away from the page being explored:
+#   back   - page.go_back(), which the back-forward cache usually serves
+#            without a network round-trip; falls back to a reload
+#   reload - navigate to the page again
+#   none   - keep clicking on whatever page the click landed on
+RESTORE_MODES = ('back', 'reload', 'none')
+
+
+class ClickStats:
+    """Click throughput and how often the explored page was restored correctly"""
+
+    def __init__(self):
+        self.clicks = 0
+        self.failed_clicks = 0
+        self.missing_elements = 0
+        self.navigations = 0
+        self.restored = {mode: 0 for mode in RESTORE_MODES if mode != 'none'}
+        self.restore_failures = 0
+        self.copy_mismatches = 0
+        self.skipped_navigations = 0
+        self.click_time = 0.0
+        self.restore_time = 0.0
+        # Wall-clock time spent exploring; less than click_time + restore_time
+        # when several pages click in parallel
+        self.exploration_time = 0.0
+
+    def stats(self):
+        busy = self.click_time + self.restore_time
+        return {
+            "clicks": self.clicks,
+            "failed_clicks": self.failed_clicks,
+            "missing_elements": self.missing_elements,
+            "navigations": self.navigations,
+            "restored": dict(self.restored),
+            "restore_failures": self.restore_failures,
+            "copy_mismatches": self.copy_mismatches,
+            "skipped_navigations": self.skipped_navigations,
+            "restore_time": round(self.restore_time, 3),
+            "exploration_time": round(self.exploration_time, 3),
+            "clicks_per_second": round(self.clicks / busy, 2) if busy else 0.0,
+            "wall_clicks_per_second": (
+                round(self.clicks / self.exploration_time, 2) if self.exploration_time else 0.0
+            )
+        }
+
+
+async def _polite(politeness, url, request):
+    """Await request() -> (response, info) within url's host limits when there are any"""
+    if politeness is None:
+        return await request()
+    return await politeness.run(url, request)
+
+
+async def restore_page(page, url, readiness, canonicalize, mode='back', href=None, politeness=None):
+    """Bring page back to url after a click navigated away
+
+    url is the canonical form the restored page must match; a reload loads
+    href, the page's original address, when given. Both go_back and the
+    reload are requests to the site, so they go through politeness (a
+    PolitenessScheduler) when one is given. Returns the method that worked
+    ('back' or 'reload'), or None if the page could not be brought back.
+    """
+    href = href or url
+    if mode == 'back':
+        async def go_back():
+            timeout = readiness.strategy_for(url).timeout_ms
+            return await page.go_back(wait_until='domcontentloaded', timeout=timeout), None
+
+        try:
+            await _polite(politeness, href, go_back)
+            if canonicalize(page.url) == url:
+                return 'back'
+        except Exception:
+            pass
+
+    try:
+        await _polite(politeness, href, lambda: readiness.navigate(page, href))
+    except Exception:
+        return None
+    return 'reload' if canonicalize(page.url) == url else None
+
+
+
+def is_plain_navigation(clickable):
+    """True for anchors that only navigate to their href
+
+    Once link following has queued their href, clicking them would load
+    the same page a second time through a different code path.
+    """
+    if clickable.get('tag') != 'A':
+        return False
+    if not clickable.get('href', '').startswith(('http://', 'https://')):
+        # javascript:, mailto:, tel: and empty hrefs
+        return False
+    return not (clickable.get('onclick') or clickable.get('role') == 'button'
+                or clickable.get('scripted'))
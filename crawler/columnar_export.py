@@ -0,0 +1,162 @@
+import os
+from urllib.parse import urljoin
+
+from .crawl_store import click_outcome, page_links
+from .url_normalizer import canonicalize_url
+
+ELEMENT_KINDS = ('headings', 'paragraphs', 'links', 'images', 'forms', 'tables', 'lists')
+STRUCTURE_KEYS = ('has_navigation', 'has_footer', 'has_header', 'has_main', 'has_aside')
+
+# Columns with few distinct values relative to rows; stored dictionary encoded
+DICTIONARY_COLUMNS = {'url', 'previous_url', 'title', 'action', 'readiness_strategy', 'content_hash',
+                      'page_url', 'target_url', 'tag', 'text', 'outcome', 'href'}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet export needs the 'pyarrow' package: pip install pyarrow")
+    return pyarrow
+
+
+def _is_page(record):
+    action = record.get("action", "")
+    return action.startswith(("Loaded page", "Failed to crawl")) or "Navigated to new page" in action
+
+
+def page_row(record):
+    """One flat row of per-page metrics for a page load, navigating click or failed page"""
+    data = record.get("data") or {}
+    readiness = record.get("readiness") or {}
+    elements = data.get("total_elements") or {}
+    structure = data.get("page_structure") or {}
+    row = {
+        "url": record.get("url", ""),
+        "previous_url": record.get("previous_url"),
+        "depth": record.get("depth"),
+        "action": record.get("action", ""),
+        "timestamp": record.get("timestamp"),
+        "title": data.get("title"),
+        "word_count": data.get("word_count"),
+        "sentences_count": data.get("sentences_count"),
+        "content_hash": data.get("content_hash"),
+        "readiness_strategy": readiness.get("strategy"),
+        "wait_time": readiness.get("wait_time"),
+        "condition_met": readiness.get("condition_met"),
+        "click_time": record.get("click_time"),
+        "error": record.get("error") or data.get("error")
+    }
+    for kind in ELEMENT_KINDS:
+        row[f"total_elements.{kind}"] = elements.get(kind)
+    for key in STRUCTURE_KEYS:
+        row[f"page_structure.{key}"] = structure.get(key)
+    return row
+
+
+def link_rows(record):
+    """Link edges of a page record, resolved and canonicalized"""
+    page_url = record.get("url", "")
+    return [
+        {"page_url": page_url, "depth": record.get("depth"),
+         "target_url": canonicalize_url(urljoin(page_url, link))}
+        for link in page_links(record)
+    ]
+
+
+def clickable_row(record):
+    """The clicked element and outcome of a click record"""
+    element = record.get("clicked_element") or {}
+    outcome = click_outcome(record)
+    return {
+        "page_url": record.get("previous_url", record.get("url", "")),
+        "depth": record.get("depth"),
+        "tag": element.get("tag"),
+        "text": element.get("text"),
+        "href": element.get("href"),
+        "selector": element.get("selector"),
+        "scripted": element.get("scripted"),
+        "outcome": outcome,
+        "target_url": record.get("url") if outcome == "navigated" else None,
+        "click_time": record.get("click_time"),
+        "error": record.get("error")
+    }
+
+
+def flatten_records(records):
+    """Split crawl records into (table, row) pairs for the pages, links and clickables tables"""
+    for record in records:
+        if _is_page(record):
+            yield "pages", page_row(record)
+            for row in link_rows(record):
+                yield "links", row
+        if "clicked_element" in record or record.get("action", "").startswith("Failed to click"):
+            yield "clickables", clickable_row(record)
+
+
+def _schemas(pa):
+    def string(name):
+        return pa.dictionary(pa.int32(), pa.string()) if name in DICTIONARY_COLUMNS else pa.string()
+
+    page_fields = [
+        ("url", string("url")), ("previous_url", string("previous_url")), ("depth", pa.int32()),
+        ("action", string("action")), ("timestamp", pa.float64()), ("title", string("title")),
+        ("word_count", pa.int64()), ("sentences_count", pa.int64()), ("content_hash", string("content_hash")),
+        ("readiness_strategy", string("readiness_strategy")), ("wait_time", pa.float64()),
+        ("condition_met", pa.bool_()), ("click_time", pa.float64()), ("error", pa.string())
+    ]
+    page_fields += [(f"total_elements.{kind}", pa.int32()) for kind in ELEMENT_KINDS]
+    page_fields += [(f"page_structure.{key}", pa.bool_()) for key in STRUCTURE_KEYS]
+    return {
+        "pages": pa.schema(page_fields),
+        "links": pa.schema([("page_url", string("page_url")), ("depth", pa.int32()),
+                            ("target_url", string("target_url"))]),
+        "clickables": pa.schema([
+            ("page_url", string("page_url")), ("depth", pa.int32()), ("tag", string("tag")),
+            ("text", string("text")), ("href", string("href")), ("selector", pa.string()),
+            ("scripted", pa.bool_()), ("outcome", string("outcome")), ("target_url", string("target_url")),
+            ("click_time", pa.float64()), ("error", pa.string())
+        ])
+    }
+
+
+def export_parquet(records, directory, prefix="", batch_size=1000):
+    """Write a crawl as pages, links and clickables Parquet files in one pass
+
+    Records are flattened and written in row groups of batch_size, so the
+    crawl never has to be in memory as a whole. Returns the paths written,
+    keyed by table name. URL, title and other repetitive string columns are
+    dictionary encoded and load as categoricals in pandas.
+    """
+    pa = _pyarrow()
+    schemas = _schemas(pa)
+    os.makedirs(directory, exist_ok=True)
+    paths = {table: os.path.join(directory, f"{prefix}{table}.parquet") for table in schemas}
+    writers = {table: pa.parquet.ParquetWriter(paths[table], schema) for table, schema in schemas.items()}
+    batches = {table: [] for table in schemas}
+
+    def write(table):
+        writers[table].write_table(pa.Table.from_pylist(batches[table], schema=schemas[table]))
+        batches[table].clear()
+
+    try:
+        for table, row in flatten_records(records):
+            batches[table].append(row)
+            if len(batches[table]) >= batch_size:
+                write(table)
+        for table in schemas:
+            if batches[table]:
+                write(table)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return paths
+
+
+def export_comparison_parquet(comparison_data, directory):
+    """Export both crawls of a WebsiteComparator result as website1_*/website2_* tables"""
+    return {
+        site: export_parquet(comparison_data[f"{site}_logs"], directory, prefix=f"{site}_")
+        for site in ("website1", "website2")
+    }
@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+def extract_corpus_keywords(documents, top_n=15):
+    """Top TF-IDF terms for each document, with IDF fitted across all of them
+
+    documents are keyword_text() strings, one per page, from any iterable;
+    it is read once, so texts can be streamed from disk. A single
+    vectorizer is fitted over the whole batch, so terms shared by every
+    page are weighted down and page-specific terms rise to the top.
+    Returns one list of terms per document, best first.
+    """
+    count = 0
+
+    def counted():
+        nonlocal count
+        for document in documents:
+            count += 1
+            yield document
+
+    vectorizer = TfidfVectorizer(stop_words='english')
+    try:
+        matrix = vectorizer.fit_transform(counted()).tocsr()
+    except ValueError:
+        # No documents, or only empty and stop-word-only ones
+        return [[] for _ in range(count)]
+    matrix.sort_indices()
+    feature_names = vectorizer.get_feature_names_out()
+
+    keywords = []
+    for row in range(matrix.shape[0]):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        scores = matrix.data[start:end]
+        terms = matrix.indices[start:end]
+        best = np.argsort(-scores, kind='stable')[:top_n]
+        keywords.append([feature_names[terms[i]] for i in best if scores[i] > 0])
+    return keywords
+
+
+class SiteKeywordIndex:
+    """Collects page texts during a crawl and fills in site-level keywords
+
+    Each page is registered with its data dict, the index of its record in
+    the crawl output, or both. With spool=True the texts wait in a
+    temporary file rather than in memory, for crawls that stream their
+    records to disk. Given spool_path, the spool is that file instead, so a
+    checkpoint can refer to it by length (spool_state) rather than copy it.
+    """
+
+    def __init__(self, top_n=15, spool=False, spool_path=None):
+        self.top_n = top_n
+        self.spool = spool or spool_path is not None
+        self.spool_path = spool_path
+        self._pages = []
+        self._texts = []
+        self._spool_file = None
+
+    def _open_spool(self, mode='w+b'):
+        if self.spool_path is None:
+            self._spool_file = tempfile.TemporaryFile(mode)
+        else:
+            self._spool_file = open(self.spool_path, mode)
+
+    def add(self, page_data, text, record_index=None):
+        """Register a page's data dict and/or record index with its keyword_text()"""
+        self._pages.append((page_data, record_index))
+        if not self.spool:
+            self._texts.append(text)
+            return
+        if self._spool_file is None:
+            self._open_spool()
+        self._spool_file.seek(0, os.SEEK_END)
+        self._spool_file.write((json.dumps(text) + '\n').encode('utf-8'))
+
+    def _iter_texts(self):
+        if not self.spool:
+            return iter(self._texts)
+        if self._spool_file is None:
+            return iter(())
+        self._spool_file.seek(0)
+        return (json.loads(line) for line in self._spool_file)
+
+    def spool_state(self):
+        """Spool file, its length and the record indexes it holds, synced to disk
+
+        Only for an index whose pages are all registered by record index.
+        """
+        length = 0
+        if self._spool_file is not None:
+            self._spool_file.flush()
+            os.fsync(self._spool_file.fileno())
+            length = self._spool_file.seek(0, os.SEEK_END)
+        return {"path": self.spool_path, "length": length,
+                "record_indexes": [record_index for _, record_index in self._pages]}
+
+    def restore_spool(self, state):
+        """Pick up a spool_state(), dropping texts written to the file after it was taken"""
+        self.spool = True
+        self.spool_path = state["path"]
+        self._pages = [(None, record_index) for record_index in state["record_indexes"]]
+        self._open_spool('a+b')
+        self._spool_file.truncate(state["length"])
+
+    def pending(self):
+        """(page_data, record_index, text) for pages registered since the last apply()"""
+        return [
+            (page_data, record_index, text)
+            for (page_data, record_index), text in zip(self._pages, self._iter_texts())
+        ]
+
+    def apply(self):
+        """Fit once over every registered page and hand out the keywords
+
+        important_words is set on each registered data dict; the keywords
+        of pages registered by record index are returned as {index: words}.
+        """
+        words_by_index = {}
+        keywords = extract_corpus_keywords(self._iter_texts(), self.top_n)
+        for (page_data, record_index), words in zip(self._pages, keywords):
+            if page_data is not None:
+                page_data["important_words"] = words
+            if record_index is not None:
+                words_by_index[record_index] = words
+
+        self._pages = []
+        self._texts = []
+        if self._spool_file is not None:
+            self._spool_file.close()
+            self._spool_file = None
+            if self.spool_path is not None:
+                os.remove(self.spool_path)
+        return words_by_index
+
+    def __len__(self):
+        return len(self._pages)
@@ -0,0 +1,379 @@
+import json
+import sqlite3
+import time
+from urllib.parse import urljoin
+
+from .url_normalizer import canonicalize_url
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawls (
+    id INTEGER PRIMARY KEY,
+    start_url TEXT,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS records (
+    crawl_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    action TEXT,
+    url TEXT,
+    depth INTEGER,
+    timestamp REAL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (crawl_id, seq)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    crawl_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    url TEXT,
+    depth INTEGER,
+    title TEXT,
+    word_count INTEGER,
+    links_count INTEGER,
+    images_count INTEGER,
+    forms_count INTEGER,
+    content_hash TEXT,
+    wait_time REAL
+);
+CREATE TABLE IF NOT EXISTS links (
+    crawl_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    source_url TEXT,
+    target_url TEXT
+);
+CREATE TABLE IF NOT EXISTS clicks (
+    crawl_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    url TEXT,
+    element_tag TEXT,
+    element_text TEXT,
+    outcome TEXT,
+    target_url TEXT,
+    click_time REAL
+);
+CREATE TABLE IF NOT EXISTS errors (
+    crawl_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    url TEXT,
+    action TEXT,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    crawl_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    url TEXT,
+    rank INTEGER,
+    keyword TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_records_url ON records (url);
+CREATE INDEX IF NOT EXISTS idx_pages_crawl_depth ON pages (crawl_id, depth);
+CREATE INDEX IF NOT EXISTS idx_pages_url ON pages (url);
+CREATE INDEX IF NOT EXISTS idx_links_crawl_source ON links (crawl_id, source_url);
+CREATE INDEX IF NOT EXISTS idx_links_target ON links (target_url);
+CREATE INDEX IF NOT EXISTS idx_clicks_crawl_url ON clicks (crawl_id, url);
+CREATE INDEX IF NOT EXISTS idx_errors_crawl ON errors (crawl_id);
+CREATE INDEX IF NOT EXISTS idx_keywords_crawl_keyword ON keywords (crawl_id, keyword);
+"""
+
+# Tables whose rows are derived from one record each, keyed by (crawl_id, seq)
+RECORD_TABLES = ('records', 'pages', 'links', 'clicks', 'errors', 'keywords')
+
+INSERTS = {
+    'records': "INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?)",
+    'pages': "INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    'links': "INSERT INTO links VALUES (?, ?, ?, ?)",
+    'clicks': "INSERT INTO clicks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    'errors': "INSERT INTO errors VALUES (?, ?, ?, ?, ?)",
+    'keywords': "INSERT INTO keywords VALUES (?, ?, ?, ?, ?)"
+}
+
+
+def click_outcome(record):
+    """navigated / content_changed / unchanged / failed for a click record"""
+    action = record.get("action", "")
+    if action.startswith("Failed to click"):
+        return "failed"
+    if record.get("unchanged"):
+        return "unchanged"
+    if "Navigated" in action:
+        return "navigated"
+    return "content_changed"
+
+
+def page_links(record):
+    """Every link href of a page record
+
+    Page loads carry the full list the crawler followed links from in
+    record["links"]; parse_html's data["links"] keeps only the first 20 and
+    is the fallback for records without it, such as navigating clicks.
+    """
+    links = record.get("links")
+    if links is None:
+        links = (record.get("data") or {}).get("links", [])
+    return links
+
+
+def is_page_record(record):
+    """Records that describe a full page: initial loads and navigating clicks"""
+    action = record.get("action", "")
+    return isinstance(record.get("data"), dict) and (
+        action.startswith("Loaded page") or "Navigated to new page" in action
+    )
+
+
+class CrawlStore:
+    """SQLite crawl database with one row set per crawl
+
+    Every record is kept verbatim in `records` so a crawl can be read back
+    in order, and is also split into normalized `pages`, `links`, `clicks`,
+    `errors` and `keywords` rows for querying. Crawls accumulate in the
+    same file, each under its own crawl id.
+    """
+
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._pending = {table: [] for table in RECORD_TABLES}
+        self._pending_count = 0
+
+    def start_crawl(self, start_url=None):
+        cursor = self.conn.execute("INSERT INTO crawls (start_url, started_at) VALUES (?, ?)",
+                                   (start_url, time.time()))
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def finish_crawl(self, crawl_id):
+        self.flush()
+        self.conn.execute("UPDATE crawls SET finished_at = ? WHERE id = ?", (time.time(), crawl_id))
+        self.conn.commit()
+
+    def latest_unfinished_crawl(self):
+        row = self.conn.execute(
+            "SELECT id FROM crawls WHERE finished_at IS NULL ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        return row[0] if row else None
+
+    def latest_finished_crawl(self, start_url):
+        """Most recent crawl of start_url that ran to completion"""
+        row = self.conn.execute(
+            "SELECT id FROM crawls WHERE start_url = ? AND finished_at IS NOT NULL ORDER BY id DESC LIMIT 1",
+            (start_url,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def truncate_crawl(self, crawl_id, keep):
+        """Delete a crawl's records from seq keep onwards"""
+        self.flush()
+        for table in RECORD_TABLES:
+            self.conn.execute(f"DELETE FROM {table} WHERE crawl_id = ? AND seq >= ?", (crawl_id, keep))
+        self.conn.commit()
+
+    def add_record(self, crawl_id, seq, record):
+        """Queue a record and its normalized rows; written in batches"""
+        url = record.get("url", "")
+        self._pending['records'].append((
+            crawl_id, seq, record.get("action", ""), url, record.get("depth"),
+            record.get("timestamp"), json.dumps(record, ensure_ascii=False)
+        ))
+
+        data = record.get("data")
+        if is_page_record(record):
+            links = page_links(record)
+            self._pending['pages'].append((
+                crawl_id, seq, url, record.get("depth"), data.get("title"), data.get("word_count", 0),
+                len(links), len(data.get("images", [])), len(data.get("forms", [])),
+                data.get("content_hash"), (record.get("readiness") or {}).get("wait_time")
+            ))
+            for link in links:
+                self._pending['links'].append((crawl_id, seq, url, canonicalize_url(urljoin(url, link))))
+
+        if "clicked_element" in record or record.get("action", "").startswith("Failed to click"):
+            element = record.get("clicked_element") or {}
+            outcome = click_outcome(record)
+            self._pending['clicks'].append((
+                crawl_id, seq, record.get("previous_url", url), element.get("tag"), element.get("text"),
+                outcome, url if outcome == "navigated" else None, record.get("click_time")
+            ))
+
+        if "error" in record:
+            self._pending['errors'].append((crawl_id, seq, url, record.get("action", ""), record["error"]))
+
+        if isinstance(data, dict) and data.get("important_words"):
+            self._add_keywords(crawl_id, seq, url, data["important_words"])
+
+        self._pending_count += 1
+        if self._pending_count >= self.batch_size:
+            self.flush()
+
+    def _add_keywords(self, crawl_id, seq, url, words):
+        self._pending['keywords'].extend(
+            (crawl_id, seq, url, rank, word) for rank, word in enumerate(words, 1)
+        )
+
+    def set_keywords(self, crawl_id, words_by_seq):
+        """Store keywords decided after their records were written"""
+        self.flush()
+        urls = dict(self.conn.execute("SELECT seq, url FROM records WHERE crawl_id = ?", (crawl_id,)))
+        for seq, words in words_by_seq.items():
+            self._add_keywords(crawl_id, seq, urls.get(seq), words)
+        self.conn.executemany(
+            "UPDATE records SET record = json_set(record, '$.data.important_words', json(?)) "
+            "WHERE crawl_id = ? AND seq = ?",
+            [(json.dumps(words, ensure_ascii=False), crawl_id, seq) for seq, words in words_by_seq.items()]
+        )
+        self.flush()
+
+    def flush(self):
+        """Write queued rows in one transaction"""
+        if not self._pending_count and not any(self._pending.values()):
+            return
+        with self.conn:
+            for table, rows in self._pending.items():
+                if rows:
+                    self.conn.executemany(INSERTS[table], rows)
+                    rows.clear()
+        self._pending_count = 0
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def records(self, crawl_id):
+        """A crawl's records, in order, read back lazily"""
+        return StoredRecords(self, crawl_id)
+
+    def records_at(self, crawl_id, seqs):
+        """A crawl's records at the given seqs, in seq order"""
+        # Reads finished crawls only, so there is no need to flush the
+        # current crawl's batch first
+        placeholders = ", ".join("?" * len(seqs))
+        cursor = self.conn.execute(
+            f"SELECT record FROM records WHERE crawl_id = ? AND seq IN ({placeholders}) ORDER BY seq",
+            (crawl_id, *seqs)
+        )
+        return [json.loads(record) for (record,) in cursor]
+
+    def crawls(self):
+        """Crawl history, newest first"""
+        rows = self.conn.execute(
+            "SELECT id, start_url, started_at, finished_at FROM crawls ORDER BY id DESC"
+        )
+        return [dict(zip(("id", "start_url", "started_at", "finished_at"), row)) for row in rows]
+
+    def crawl_summary(self, crawl_id):
+        """Headline counts for a crawl, as printed after a crawl"""
+        self.flush()
+
+        def scalar(sql):
+            return self.conn.execute(sql, (crawl_id,)).fetchone()[0]
+
+        return {
+            "total_actions": scalar("SELECT COUNT(*) FROM records WHERE crawl_id = ?"),
+            "errors": scalar("SELECT COUNT(*) FROM errors WHERE crawl_id = ?"),
+            "pages_visited": scalar("SELECT COUNT(DISTINCT url) FROM records WHERE crawl_id = ?"),
+            "buttons_clicked": scalar("SELECT COUNT(*) FROM clicks WHERE crawl_id = ? AND outcome != 'failed'"),
+            "total_words": scalar("SELECT COALESCE(SUM(word_count), 0) FROM pages WHERE crawl_id = ?"),
+            "link_targets": scalar("SELECT COUNT(DISTINCT target_url) FROM links WHERE crawl_id = ?")
+        }
+
+    def pages(self, crawl_id, depth=None):
+        """Page rows of a crawl, optionally at one depth"""
+        self.flush()
+        sql = ("SELECT url, depth, title, word_count, links_count, images_count, forms_count, "
+               "content_hash, wait_time FROM pages WHERE crawl_id = ?")
+        params = [crawl_id]
+        if depth is not None:
+            sql += " AND depth = ?"
+            params.append(depth)
+        columns = ("url", "depth", "title", "word_count", "links_count", "images_count",
+                   "forms_count", "content_hash", "wait_time")
+        return [dict(zip(columns, row)) for row in self.conn.execute(sql + " ORDER BY seq", params)]
+
+    def link_targets(self, crawl_id):
+        """Distinct canonical link targets found in a crawl"""
+        self.flush()
+        return {row[0] for row in self.conn.execute(
+            "SELECT DISTINCT target_url FROM links WHERE crawl_id = ?", (crawl_id,))}
+
+    def top_keywords(self, crawl_id, limit=20):
+        """Keywords ranked by how many pages they appear on"""
+        self.flush()
+        return self.conn.execute(
+            "SELECT keyword, COUNT(DISTINCT seq) AS pages FROM keywords WHERE crawl_id = ? "
+            "GROUP BY keyword ORDER BY pages DESC, keyword LIMIT ?", (crawl_id, limit)
+        ).fetchall()
+
+    def errors(self, crawl_id):
+        self.flush()
+        return [dict(zip(("url", "action", "error"), row)) for row in self.conn.execute(
+            "SELECT url, action, error FROM errors WHERE crawl_id = ? ORDER BY seq", (crawl_id,))]
+
+
+class StoredRecords:
+    """Re-iterable, sized view of one crawl's records in a CrawlStore"""
+
+    def __init__(self, store, crawl_id):
+        self.store = store
+        self.crawl_id = crawl_id
+
+    def __iter__(self):
+        self.store.flush()
+        cursor = self.store.conn.execute(
+            "SELECT record FROM records WHERE crawl_id = ? ORDER BY seq", (self.crawl_id,))
+        for (record,) in cursor:
+            yield json.loads(record)
+
+    def __len__(self):
+        self.store.flush()
+        return self.store.conn.execute(
+            "SELECT COUNT(*) FROM records WHERE crawl_id = ?", (self.crawl_id,)).fetchone()[0]
+
+
+class CrawlStoreSink:
+    """Result sink that writes one crawl into a CrawlStore
+
+    Pass as result_sink to RecursiveWebCrawler or ShardedCrawler. A new
+    crawl id is allocated on open(); when resuming (keep > 0) without an
+    explicit crawl_id, the store's most recent unfinished crawl continues.
+    The crawlers only apply keywords once a crawl has run to completion,
+    so that is when the crawl is marked finished; an interrupted crawl
+    stays open for resume.
+    """
+
+    def __init__(self, store, start_url=None, crawl_id=None):
+        self.store = store
+        self.start_url = start_url
+        self.crawl_id = crawl_id
+        self.written = 0
+
+    def open(self, keep=0):
+        if keep:
+            self.crawl_id = self.crawl_id or self.store.latest_unfinished_crawl()
+        if self.crawl_id is None:
+            self.crawl_id = self.store.start_crawl(self.start_url)
+        else:
+            self.store.truncate_crawl(self.crawl_id, keep)
+        self.written = keep
+
+    def write(self, record):
+        self.store.add_record(self.crawl_id, self.written, record)
+        self.written += 1
+
+    def flush(self):
+        self.store.flush()
+
+    def apply_keywords(self, words_by_index):
+        if words_by_index:
+            self.store.set_keywords(self.crawl_id, words_by_index)
+        self.store.finish_crawl(self.crawl_id)
+
+    def close(self):
+        # The store outlives the crawl; records() reads back from it
+        self.store.flush()
+
+    def records(self):
+        return self.store.records(self.crawl_id)
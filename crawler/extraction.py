@@ -0,0 +1,28 @@
+import os
+
+DOM_HELPER_PATH = os.path.join(os.path.dirname(__file__), 'utils', 'dom_helper.js')
+
+_dom_helper_source = None
+
+
+def load_dom_helper():
+    """Read the extraction script once and reuse the source for every page"""
+    global _dom_helper_source
+    if _dom_helper_source is None:
+        with open(DOM_HELPER_PATH, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        # Drop the header comment so the source is a bare function expression
+        while lines and lines[0].lstrip().startswith('//'):
+            lines.pop(0)
+        _dom_helper_source = '\n'.join(lines).strip()
+    return _dom_helper_source
+
+
+async def extract_page_bundle(page, metadata=True, links=True, clickables=True, html=True):
+    """Collect page metadata, links, clickables and HTML in one evaluate call"""
+    return await page.evaluate(load_dom_helper(), {
+        "metadata": metadata,
+        "links": links,
+        "clickables": clickables,
+        "html": html
+    })
@@ -0,0 +1,48 @@
+from collections import deque
+
+
+class URLFrontier:
+    """FIFO queue of (url, depth) pairs where each URL is enqueued at most once
+
+    URLs are queued as they should be loaded; key, when given, is the
+    identity used for deduplication (the crawler passes the canonical URL).
+    """
+
+    def __init__(self):
+        self._queue = deque()
+        self._seen = set()
+
+    def push(self, url, depth, key=None):
+        """Queue a URL unless its key (the URL itself by default) was already queued or visited"""
+        key = key or url
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self._queue.append((url, depth))
+        return True
+
+    def pop(self):
+        """Return the next (url, depth) pair in O(1)"""
+        return self._queue.popleft()
+
+    def snapshot(self):
+        """Queued pairs and seen URLs as JSON-friendly lists"""
+        return {"queue": [list(item) for item in self._queue], "seen": sorted(self._seen)}
+
+    def restore(self, snapshot):
+        """Replace the queue and seen set with a snapshot() taken earlier"""
+        self._queue = deque((url, depth) for url, depth in snapshot["queue"])
+        self._seen = set(snapshot["seen"])
+
+    def more_expected(self):
+        """Whether URLs may still arrive from outside this process"""
+        return False
+
+    def __contains__(self, url):
+        return url in self._seen
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __bool__(self):
+        return bool(self._queue)
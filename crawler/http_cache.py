@@ -0,0 +1,172 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    body BLOB NOT NULL,
+    parse_key TEXT,
+    parsed TEXT,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+"""
+
+
+class CachedResponse:
+    """A cached page standing in for a requests.Response after a 304"""
+
+    from_cache = True
+
+    def __init__(self, url, text, content_type):
+        self.url = url
+        self.text = text
+        self.status_code = 200
+        self.headers = {'content-type': content_type or 'text/html'}
+
+
+class HttpCache:
+    """Persistent conditional-request cache for the HTTP fast path
+
+    Responses that carry an ETag or Last-Modified header are stored with
+    their body (zlib compressed) in a SQLite file, keyed by canonical URL.
+    The next crawl revalidates them with If-None-Match / If-Modified-Since
+    and, on 304, reuses the stored body and the parse result saved with it.
+    When the file grows past max_bytes the least recently used entries are
+    evicted. Safe to use from the fetcher's worker threads, and from the
+    shards of a sharded crawl, which each reopen the file.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evictions = 0
+        self.parse_hits = 0
+        self._connect()
+
+    def _connect(self):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['conn'], state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._connect()
+
+    def conditional_headers(self, url):
+        """Validators to send for url, empty if it is not cached"""
+        with self._lock:
+            row = self.conn.execute("SELECT etag, last_modified FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return {}
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def revalidated(self, url, response_url=None):
+        """The cached page for url after a 304, or None if it has gone missing"""
+        with self._lock:
+            row = self.conn.execute("SELECT body, content_type FROM responses WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+            self.hits += 1
+        return CachedResponse(response_url or url, zlib.decompress(row[0]).decode('utf-8'), row[1])
+
+    def store(self, url, response):
+        """Cache a 200 response if it has validators; otherwise count a plain miss"""
+        self.misses += 1
+        etag = response.headers.get('etag')
+        last_modified = response.headers.get('last-modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return False
+        body = zlib.compress(response.text.encode('utf-8'))
+        with self._lock:
+            self._delete(url)
+            self.conn.execute(
+                "INSERT INTO responses (url, etag, last_modified, content_type, body, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, response.headers.get('content-type'), body, len(body), time.time())
+            )
+            self.total_bytes += len(body)
+            self.stored += 1
+            self._evict()
+            self.conn.commit()
+        return True
+
+    def parsed(self, url, parse_key):
+        """Parse result saved for url's cached body, if it was parsed the same way"""
+        with self._lock:
+            row = self.conn.execute("SELECT parse_key, parsed FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is None or row[0] != parse_key or row[1] is None:
+            return None
+        self.parse_hits += 1
+        return json.loads(row[1])
+
+    def store_parsed(self, url, parse_key, parsed):
+        """Save the parse result of url's cached body next to it"""
+        text = json.dumps(parsed, ensure_ascii=False)
+        with self._lock:
+            row = self.conn.execute("SELECT size, parsed FROM responses WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return
+            grown = len(text.encode('utf-8')) - len((row[1] or '').encode('utf-8'))
+            self.conn.execute("UPDATE responses SET parse_key = ?, parsed = ?, size = size + ? WHERE url = ?",
+                              (parse_key, text, grown, url))
+            self.total_bytes += grown
+            self._evict()
+            self.conn.commit()
+
+    def _delete(self, url):
+        row = self.conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is not None:
+            self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self.total_bytes -= row[0]
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        while self.total_bytes > self.max_bytes:
+            row = self.conn.execute("SELECT url, size FROM responses ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                self.total_bytes = 0
+                return
+            self.conn.execute("DELETE FROM responses WHERE url = ?", (row[0],))
+            self.total_bytes -= row[1]
+            self.evictions += 1
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 3) if requests else 0.0,
+            "parse_hits": self.parse_hits,
+            "stored": self.stored,
+            "evictions": self.evictions,
+            "bytes": self.total_bytes
+        }
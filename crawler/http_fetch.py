@@ -0,0 +1,250 @@
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .click_exploration import is_plain_navigation
+
+# Mount points of client-side apps; empty in the served HTML of a JS shell
+APP_ROOT_IDS = ('root', 'app', '__next', '__nuxt', 'svelte', 'ember-app')
+NOSCRIPT_HINTS = ('enable javascript', 'javascript is required', 'requires javascript',
+                  'javascript to run this app', 'turn on javascript')
+SCRIPTED_ATTRIBUTES = ('aria-haspopup', 'aria-expanded', 'aria-controls', 'data-toggle',
+                       'data-bs-toggle', 'data-action')
+SKIPPED_TEXT_TAGS = ('script', 'style', 'template', 'noscript')
+VOID_TAGS = ('input', 'img', 'br', 'hr', 'meta', 'link', 'base', 'source', 'wbr', 'area', 'col', 'embed')
+
+
+class PageScan(HTMLParser):
+    """One pass over served HTML: links, clickables and signs of a JS-rendered shell
+
+    Clickables follow the DOM helper's selectors, and plain navigation
+    links are told apart with is_plain_navigation, so the scan predicts
+    whether click exploration would find anything to click. Each one is
+    kept as an approximation of the crawler's tag_text_type button id, so
+    buttons it already clicked elsewhere need not send the page to the
+    browser. base_url should be the address the HTML was served from; a
+    <base href> in the page overrides it, as in the browser.
+    """
+
+    def __init__(self, base_url, skip_link_clicks=True):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.skip_link_clicks = skip_link_clicks
+        self.links = []
+        self.clickable_ids = []
+        self.words = 0
+        self.empty_app_roots = 0
+        self.noscript_warning = False
+        self._skipping = 0
+        self._in_noscript = False
+        self._open_root = None
+        self._base_seen = False
+        # (tag, attrs, text parts) of clickables whose end tag is still to come
+        self._open_clickables = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or '' for name, value in attrs}
+        if tag in SKIPPED_TEXT_TAGS:
+            self._skipping += 1
+            self._in_noscript = self._in_noscript or tag == 'noscript'
+        if self._open_root is not None:
+            # The app root has children, so it is not an empty shell
+            self._open_root = None
+        if tag == 'div' and attrs.get('id') in APP_ROOT_IDS:
+            self._open_root = attrs['id']
+
+        href = attrs.get('href', '')
+        if tag == 'base' and href and not self._base_seen:
+            # Only the first <base href> counts
+            self._base_seen = True
+            self.base_url = urljoin(self.base_url, href)
+        if tag == 'a' and href:
+            self.links.append({"href": urljoin(self.base_url, href), "text": "", "title": attrs.get('title', '')})
+        if self._is_clickable(tag, attrs):
+            clickable = {
+                "tag": tag.upper(),
+                "href": urljoin(self.base_url, href) if href else '',
+                "onclick": attrs.get('onclick', ''),
+                "role": attrs.get('role', ''),
+                "scripted": any(name in attrs for name in SCRIPTED_ATTRIBUTES)
+            }
+            if not (self.skip_link_clicks and is_plain_navigation(clickable)):
+                self._open_clickables.append((tag, attrs, []))
+                if tag in VOID_TAGS:
+                    self._close_clickable()
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self._open_clickables and self._open_clickables[-1][0] == tag:
+            self._close_clickable()
+
+    def _close_clickable(self):
+        """Turn the innermost open clickable into its approximate button id"""
+        tag, attrs, parts = self._open_clickables.pop()
+        # As the DOM helper: innerText, else value, else aria-label
+        text = ' '.join(' '.join(parts).split()) or attrs.get('value') or attrs.get('aria-label') or 'Unnamed'
+        # The DOM helper reads el.type, which defaults to "submit" for buttons
+        kind = attrs.get('type', '').lower() or ('submit' if tag == 'button' else '')
+        self.clickable_ids.append(f"{tag.upper()}_{text}_{kind}")
+
+    def handle_endtag(self, tag):
+        if any(open_tag == tag for open_tag, _, _ in self._open_clickables):
+            # Also closes clickables left open inside it
+            while self._open_clickables[-1][0] != tag:
+                self._close_clickable()
+            self._close_clickable()
+        if tag == 'div' and self._open_root is not None:
+            self.empty_app_roots += 1
+            self._open_root = None
+        if tag in SKIPPED_TEXT_TAGS and self._skipping:
+            self._skipping -= 1
+            if tag == 'noscript':
+                self._in_noscript = False
+
+    def handle_data(self, data):
+        if self._open_root is not None and data.strip():
+            self._open_root = None
+        if self._in_noscript:
+            lowered = data.lower()
+            self.noscript_warning = self.noscript_warning or any(hint in lowered for hint in NOSCRIPT_HINTS)
+        elif not self._skipping:
+            self.words += len(data.split())
+            for _, _, parts in self._open_clickables:
+                parts.append(data)
+
+    def close(self):
+        super().close()
+        while self._open_clickables:
+            self._close_clickable()
+
+    @staticmethod
+    def _is_clickable(tag, attrs):
+        if 'disabled' in attrs:
+            return False
+        if tag == 'button' or attrs.get('role') == 'button' or 'onclick' in attrs:
+            return True
+        if tag == 'a':
+            href = attrs.get('href')
+            return href is None or not (href.startswith('#') or href == 'javascript:void(0)')
+        if tag == 'input':
+            return attrs.get('type', '').lower() in ('button', 'submit')
+        classes = attrs.get('class', '').split()
+        return 'btn' in classes or 'button' in classes
+
+
+def escalation_reason(response, scan, min_words=20, visited_buttons=()):
+    """Why a page fetched over HTTP still needs the browser, or None if it does not
+
+    Clickables only count when their button id is not in visited_buttons,
+    since the crawler would skip those in the browser too.
+    """
+    if not 200 <= response.status_code < 300:
+        return "status"
+    if 'html' not in response.headers.get('content-type', 'text/html').lower():
+        return "not_html"
+    if scan.empty_app_roots:
+        return "app_root"
+    if scan.noscript_warning:
+        return "noscript"
+    if scan.words < min_words:
+        return "empty_body"
+    if any(button_id not in visited_buttons for button_id in scan.clickable_ids):
+        return "clickables"
+    return None
+
+
+class HttpFetcher:
+    """Pooled HTTP client for the crawler's browserless fast path
+
+    Pages are first fetched with a keep-alive requests.Session. When the
+    served HTML is complete on its own (no empty app root, no noscript
+    warning, enough text and nothing click exploration would click) the
+    crawler parses it directly; otherwise it escalates the page to
+    Playwright. stats() reports how often that happened and why.
+    """
+
+    def __init__(self, pool_size=16, timeout=10, min_words=20, user_agent=None, session=None, cache=None):
+        self.timeout = timeout
+        # Optional HttpCache: conditional requests and stored parse results
+        self.cache = cache
+        self.min_words = min_words
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        if user_agent:
+            session.headers['User-Agent'] = user_agent
+        self.session = session
+        self.pages = 0
+        self.escalated = 0
+        self.reasons = {}
+        self.fetch_time = 0.0
+
+    def fetch(self, url, key=None):
+        """GET url; returns the requests.Response, or a CachedResponse after a 304
+
+        key is the page's canonical URL, which the cache entry is stored
+        under; url itself when not given.
+        """
+        key = key or url
+        started = time.perf_counter()
+        try:
+            if self.cache is None:
+                return self.session.get(url, timeout=self.timeout)
+            response = self.session.get(url, timeout=self.timeout, headers=self.cache.conditional_headers(key))
+            if response.status_code == 304:
+                cached = self.cache.revalidated(key, response.url)
+                if cached is not None:
+                    return cached
+                # Evicted since the validators were read; fetch it in full
+                response = self.session.get(url, timeout=self.timeout)
+            self.cache.store(key, response)
+            return response
+        finally:
+            self.fetch_time += time.perf_counter() - started
+
+    def cached_parse(self, url, response, parse_key):
+        """The stored parse result for a page served from the cache, if any"""
+        if self.cache is None or not getattr(response, 'from_cache', False):
+            return None
+        return self.cache.parsed(url, parse_key)
+
+    def store_parse(self, url, parse_key, parsed):
+        if self.cache is not None:
+            self.cache.store_parsed(url, parse_key, parsed)
+
+    def scan(self, url, response, skip_link_clicks=True, visited_buttons=()):
+        """Scan a fetched page; returns (PageScan, escalation reason or None)
+
+        Links resolve against response.url, where redirects ended, rather
+        than the url that was requested.
+        """
+        scan = PageScan(getattr(response, 'url', None) or url, skip_link_clicks)
+        if 'html' in response.headers.get('content-type', 'text/html').lower():
+            scan.feed(response.text)
+            scan.close()
+        reason = escalation_reason(response, scan, self.min_words, visited_buttons)
+        self.record(reason)
+        return scan, reason
+
+    def record(self, reason):
+        """Count one page as served over HTTP, or as escalated for reason"""
+        self.pages += 1
+        if reason is not None:
+            self.escalated += 1
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def stats(self):
+        return {
+            "pages": self.pages,
+            "http_only": self.pages - self.escalated,
+            "escalated": self.escalated,
+            "escalation_ratio": round(self.escalated / self.pages, 3) if self.pages else 0.0,
+            "escalation_reasons": dict(self.reasons),
+            "fetch_time": round(self.fetch_time, 3),
+            **({"cache": self.cache.stats()} if self.cache is not None else {})
+        }
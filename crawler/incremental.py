@@ -0,0 +1,157 @@
+from urllib.parse import urljoin
+
+from .crawl_store import page_links
+from .url_normalizer import canonicalize_url
+
+
+def _is_click(record):
+    return "clicked_element" in record or record.get("action", "").startswith("Failed to click")
+
+
+def _link_targets(record):
+    url = record.get("url", "")
+    return {canonicalize_url(urljoin(url, link)) for link in page_links(record)}
+
+
+def _loaded_address(record):
+    """The address a page was last loaded from, when it is the same page as its canonical url"""
+    loaded = (record.get("data") or {}).get("url")
+    if loaded and canonicalize_url(loaded) == record["url"]:
+        return loaded
+    return record["url"]
+
+
+def _is_loaded_page(record):
+    """A page load that succeeded; failed loads and HTTP error pages are not"""
+    return (record.get("action", "").startswith("Loaded page") and isinstance(record.get("data"), dict)
+            and (record.get("status") or 200) < 400)
+
+
+class CrawlBaseline:
+    """The previous crawl of a site, indexed for an incremental re-crawl
+
+    Each page the previous crawl loaded is kept as its depth, content hash,
+    sitemap priority and link targets, plus the seqs of its own record and
+    of the click records made on it. When the crawler meets a page whose
+    HTML hashes the same, match() hands back those records so they can be
+    carried forward without parsing or clicking again. Records are read
+    from the CrawlStore on demand when the baseline comes from one, so
+    only the index is held in memory.
+    """
+
+    def __init__(self, records, crawl_id=None, store=None):
+        self.crawl_id = crawl_id
+        self.store = store
+        if store is None:
+            records = list(records)
+        self._records = records if store is None else None
+        self.pages = {}
+        self.unchanged = 0
+        self.changed = 0
+        self.new = 0
+        self._index(records)
+
+    @classmethod
+    def from_store(cls, store, crawl_id):
+        return cls(store.records(crawl_id), crawl_id=crawl_id, store=store)
+
+    def _index(self, records):
+        clicks = {}
+        for seq, record in enumerate(records):
+            if _is_click(record):
+                page_url = record.get("previous_url", record.get("url"))
+                clicks.setdefault(page_url, []).append(seq)
+            elif _is_loaded_page(record) and record["url"] not in self.pages:
+                self.pages[record["url"]] = {
+                    "seq": seq,
+                    "depth": record.get("depth", 0),
+                    "content_hash": record["data"].get("content_hash"),
+                    "priority": (record.get("sitemap") or {}).get("priority", 0.5),
+                    "links": _link_targets(record),
+                    "href": _loaded_address(record)
+                }
+        for url, page in self.pages.items():
+            # Clicks made on the page after its own record, not on an earlier visit
+            page["clicks"] = [seq for seq in clicks.get(url, []) if seq > page["seq"]]
+
+    def revisit_order(self):
+        """(address, depth) of the previous crawl's pages: shallowest, then highest sitemap priority, first"""
+        pages = sorted(self.pages.items(), key=lambda item: (item[1]["depth"], -item[1]["priority"],
+                                                             item[1]["seq"]))
+        return [(page["href"], page["depth"]) for url, page in pages]
+
+    def match(self, url, html_hash):
+        """(page record, click records) from the previous crawl if url's HTML is unchanged, else None"""
+        page = self.pages.get(url)
+        if page is None:
+            self.new += 1
+            return None
+        if page["content_hash"] != html_hash:
+            self.changed += 1
+            return None
+        self.unchanged += 1
+        records = self._load([page["seq"]] + page["clicks"])
+        return records[0], records[1:]
+
+    def _load(self, seqs):
+        if self.store is not None:
+            return self.store.records_at(self.crawl_id, seqs)
+        return [self._records[seq] for seq in seqs]
+
+    def stats(self):
+        return {
+            "previous_crawl_id": self.crawl_id,
+            "unchanged": self.unchanged,
+            "changed": self.changed,
+            "new": self.new
+        }
+
+
+def crawl_delta(baseline, records, unreached=()):
+    """New, changed and removed pages and links of a re-crawl against its baseline
+
+    A previous page that is missing from records counts as removed, unless
+    it is in unreached (still queued when the page budget ran out), in
+    which case it is listed as not revisited. Failed loads and HTTP error
+    statuses count as missing.
+    """
+    current = {}
+    for record in records:
+        if _is_loaded_page(record) and record["url"] not in current:
+            current[record["url"]] = record
+    unreached = set(unreached)
+
+    previous_urls = set(baseline.pages)
+    current_urls = set(current)
+    missing = previous_urls - current_urls
+    removed = sorted(missing - unreached)
+    changed = sorted(
+        url for url in previous_urls & current_urls
+        if (current[url].get("data") or {}).get("content_hash") != baseline.pages[url]["content_hash"]
+    )
+
+    added_links = []
+    removed_links = []
+    for url in sorted(current_urls):
+        targets = _link_targets(current[url])
+        before = baseline.pages[url]["links"] if url in baseline.pages else set()
+        added_links += [{"page_url": url, "target_url": target} for target in sorted(targets - before)]
+        removed_links += [{"page_url": url, "target_url": target} for target in sorted(before - targets)]
+    for url in removed:
+        removed_links += [{"page_url": url, "target_url": target}
+                          for target in sorted(baseline.pages[url]["links"])]
+
+    return {
+        "previous_crawl_id": baseline.crawl_id,
+        "pages": {
+            "new": sorted(current_urls - previous_urls),
+            "changed": changed,
+            "removed": removed,
+            "not_revisited": sorted(missing & unreached),
+            "unchanged": len(previous_urls & current_urls) - len(changed)
+        },
+        "links": {
+            "added": added_links,
+            "removed": removed_links
+        }
+    }
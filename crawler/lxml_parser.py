@@ -0,0 +1,255 @@
+from lxml import etree
+
+from .soup_parser import _assemble_result, _social_platform
+
+# Text under these tags is never part of get_text(): BeautifulSoup removes
+# script/style and stores template/rt/rp contents as special string types
+HIDDEN_TEXT_TAGS = {'script', 'style', 'template', 'rt', 'rp'}
+
+# BeautifulSoup collapses whitespace-only strings everywhere except inside these
+PRESERVE_WHITESPACE_TAGS = {'pre', 'textarea'}
+ASCII_SPACES = frozenset('\x20\x0a\x09\x0c\x0d')
+
+HEADING_TAGS = {'h1', 'h2', 'h3'}
+STRUCTURE_TAGS = {
+    'nav': 'has_navigation',
+    'footer': 'has_footer',
+    'header': 'has_header',
+    'main': 'has_main',
+    'aside': 'has_aside'
+}
+
+
+class _TitleNode:
+    """Children of an element inside the first <title>, for Tag.string"""
+
+    def __init__(self):
+        self.children = []
+
+    def string(self):
+        node = self
+        while len(node.children) == 1:
+            child = node.children[0]
+            if not isinstance(child, _TitleNode):
+                return child
+            node = child
+        return None
+
+
+class _PageTarget:
+    """lxml parser target that builds parse_html's fields in one pass
+
+    BeautifulSoup(html, "lxml") is itself an lxml parser target, so
+    consuming the same start/end/data/comment events reproduces its view
+    of the document exactly without building any tree.
+    """
+
+    def __init__(self):
+        self.headings = []
+        self.paragraphs = []
+        self.links = []
+        self.meta_description = None
+        self.forms_data = []
+        self.images_data = []
+        self.tables_data = []
+        self.lists_data = []
+        self.social_links = []
+        self.title = "No title"
+        self.page_structure = {flag: False for flag in STRUCTURE_TAGS.values()}
+
+        # Visible strings in document order; an element's text is the
+        # slice of pieces added between its start and end events
+        self.pieces = []
+        self._data = []
+        self._hidden_depth = 0
+        self._preserve_depth = 0
+
+        # One entry per open element: (tag, text slots, pieces index)
+        self._stack = []
+        self._open_forms = []
+        self._open_tables = []
+        self._open_lists = []
+
+        # Open elements inside the first <title>, outermost first
+        self._title_stack = []
+        self._seen_title = False
+
+    def _flush(self):
+        """Turn buffered character data into one string, as BeautifulSoup's endData does"""
+        if not self._data:
+            return
+        text = ''.join(self._data)
+        self._data = []
+        if not self._preserve_depth and ASCII_SPACES.issuperset(text):
+            text = '\n' if '\n' in text else ' '
+        if self._title_stack:
+            self._title_stack[-1].children.append(text)
+        if not self._hidden_depth:
+            self.pieces.append(text)
+
+    def _stripped_text(self, start):
+        """get_text(strip=True) over the strings added since start"""
+        return ''.join(piece.strip() for piece in self.pieces[start:] if piece.strip())
+
+    def start(self, tag, attrib, nsmap=None):
+        self._flush()
+        slots = []
+
+        if tag in HEADING_TAGS:
+            self.headings.append(None)
+            slots.append((self.headings, len(self.headings) - 1))
+        elif tag == 'p':
+            self.paragraphs.append(None)
+            slots.append((self.paragraphs, len(self.paragraphs) - 1))
+        elif tag == 'a':
+            href = attrib.get('href')
+            if href is not None:
+                if href:
+                    self.links.append(href)
+                platform = _social_platform(href)
+                if platform:
+                    self.social_links.append({'platform': platform, 'url': href})
+        elif tag == 'meta':
+            if self.meta_description is None and attrib.get('name') == 'description':
+                self.meta_description = attrib.get('content', '')
+        elif tag == 'form':
+            form_info = {
+                'action': attrib.get('action', ''),
+                'method': attrib.get('method', 'get'),
+                'inputs': []
+            }
+            self.forms_data.append(form_info)
+            self._open_forms.append(form_info)
+        elif tag == 'input':
+            for form_info in self._open_forms:
+                form_info['inputs'].append({
+                    'type': attrib.get('type', 'text'),
+                    'name': attrib.get('name', ''),
+                    'placeholder': attrib.get('placeholder', ''),
+                    'required': 'required' in attrib
+                })
+        elif tag == 'img':
+            self.images_data.append({
+                'src': attrib.get('src', ''),
+                'alt': attrib.get('alt', ''),
+                'width': attrib.get('width', ''),
+                'height': attrib.get('height', ''),
+                'title': attrib.get('title', '')
+            })
+        elif tag == 'table':
+            table_info = {'rows': 0, 'headers': []}
+            self.tables_data.append(table_info)
+            self._open_tables.append(table_info)
+        elif tag == 'tr':
+            for table_info in self._open_tables:
+                table_info['rows'] += 1
+        elif tag == 'th':
+            for table_info in self._open_tables:
+                table_info['headers'].append(None)
+                slots.append((table_info['headers'], len(table_info['headers']) - 1))
+        elif tag in ('ul', 'ol'):
+            list_info = {'type': tag, 'items': []}
+            self.lists_data.append(list_info)
+            self._open_lists.append(list_info)
+        elif tag == 'li':
+            for list_info in self._open_lists:
+                list_info['items'].append(None)
+                slots.append((list_info['items'], len(list_info['items']) - 1))
+        elif tag in STRUCTURE_TAGS:
+            self.page_structure[STRUCTURE_TAGS[tag]] = True
+
+        if self._title_stack:
+            node = _TitleNode()
+            self._title_stack[-1].children.append(node)
+            self._title_stack.append(node)
+        elif tag == 'title' and not self._seen_title:
+            self._seen_title = True
+            self._title_stack.append(_TitleNode())
+
+        if tag in HIDDEN_TEXT_TAGS:
+            self._hidden_depth += 1
+        if tag in PRESERVE_WHITESPACE_TAGS:
+            self._preserve_depth += 1
+        self._stack.append((tag, slots, len(self.pieces)))
+
+    def end(self, tag):
+        self._flush()
+        tag, slots, start = self._stack.pop()
+
+        if slots:
+            text = self._stripped_text(start)
+            for items, index in slots:
+                items[index] = text
+
+        if tag == 'form':
+            self._open_forms.pop()
+        elif tag == 'table':
+            self._open_tables.pop()
+        elif tag in ('ul', 'ol'):
+            self._open_lists.pop()
+
+        if self._title_stack:
+            node = self._title_stack.pop()
+            if not self._title_stack:
+                self.title = node.string()
+
+        if tag in HIDDEN_TEXT_TAGS:
+            self._hidden_depth -= 1
+        if tag in PRESERVE_WHITESPACE_TAGS:
+            self._preserve_depth -= 1
+
+    def data(self, data):
+        self._data.append(data)
+
+    def comment(self, text):
+        self._flush()
+        if self._title_stack:
+            # A lone comment is what Tag.string returns
+            self._title_stack[-1].children.append(text)
+
+    def pi(self, target, data=None):
+        self._flush()
+        if self._title_stack:
+            self._title_stack[-1].children.append(target)
+
+    def doctype(self, *args):
+        self._flush()
+
+    def close(self):
+        self._flush()
+        return self
+
+
+def parse_html_lxml(html, keywords=True):
+    """parse_html output from a single pass over lxml's parse events"""
+    if html and html[0] == '\N{BYTE ORDER MARK}':
+        html = html[1:]
+
+    # Same parser settings BeautifulSoup(html, "lxml") uses
+    target = _PageTarget()
+    parser = etree.HTMLParser(target=target, recover=True)
+    try:
+        parser.feed(html)
+        parser.close()
+    except etree.XMLSyntaxError:
+        # Empty or comment-only documents have no root element
+        target.close()
+
+    return _assemble_result(
+        headings=[heading for heading in target.headings if heading],
+        paragraphs=[paragraph for paragraph in target.paragraphs if paragraph],
+        links=target.links,
+        visible_text=''.join(target.pieces),
+        title=target.title,
+        meta_description=target.meta_description or '',
+        forms_data=target.forms_data,
+        images_data=target.images_data,
+        tables_data=target.tables_data,
+        lists_data=[
+            {'type': list_info['type'], 'items': list_info['items'][:10]}
+            for list_info in target.lists_data
+        ],
+        social_links=target.social_links,
+        page_structure=target.page_structure,
+        keywords=keywords
+    )
@@ -0,0 +1,45 @@
+import hashlib
+from collections import OrderedDict
+
+
+def content_hash(html):
+    """Fast 128-bit fingerprint of a page's HTML"""
+    return hashlib.blake2b(html.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+class ParseCache:
+    """Bounded LRU of parse_html results keyed by content_hash(html)"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return a copy of the cached parse for key, or None"""
+        parsed = self._entries.get(key)
+        if parsed is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # Callers add and pop top-level keys on the dict they get back
+        return dict(parsed)
+
+    def put(self, key, parsed):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = dict(parsed)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "size": len(self._entries)
+        }
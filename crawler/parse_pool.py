@@ -0,0 +1,50 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .soup_parser import parse_html
+
+
+def default_parse_workers():
+    """Leave one core for the event loop and the browser"""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+class ParsePool:
+    """Runs parse_html in worker processes so parsing overlaps with page loads
+
+    workers=0 parses inline on the event loop. max_pending bounds how many
+    documents may be queued or parsing at once; callers past that limit
+    wait, which keeps crawl workers from piling up HTML faster than it can
+    be parsed. Workers are spawned rather than forked: the pool starts
+    while the Playwright driver connection and the event loop's threads are
+    live, and forking those can deadlock the child.
+    """
+
+    def __init__(self, workers=None, max_pending=None):
+        self.workers = default_parse_workers() if workers is None else workers
+        self.max_pending = max_pending or max(1, self.workers * 2)
+        self._executor = None
+        self._slots = None
+
+    def start(self):
+        if self.workers > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        self._slots = asyncio.Semaphore(self.max_pending)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def parse(self, html, **kwargs):
+        """Parse html off the event loop and return parse_html's dict"""
+        if self._executor is None:
+            return parse_html(html, **kwargs)
+
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(parse_html, html, **kwargs))
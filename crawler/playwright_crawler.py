@@ -1,65 +1,220 @@
-from playwright.sync_api import sync_playwright
-from .soup_parser import parse_html
+from playwright.async_api import async_playwright
+from .frontier import URLFrontier
+from .url_normalizer import canonicalize_url, DEFAULT_TRACKING_PARAMS
+from .readiness import ReadinessPolicy
+from .extraction import extract_page_bundle
+from .parse_pool import ParsePool
+from .corpus_keywords import SiteKeywordIndex
+from .parse_cache import ParseCache, content_hash
+from .checkpoint import save_checkpoint, load_checkpoint
+from .click_exploration import ClickStats, RESTORE_MODES, is_plain_navigation, restore_page
+from .incremental import crawl_delta
+import asyncio
+import contextvars
 import time
 from urllib.parse import urljoin, urlparse
 import json
 
+# Records of the page the current worker task is crawling, held back until
+# the page finishes
+_PAGE_RECORDS = contextvars.ContextVar("page_records", default=None)
+
 class RecursiveWebCrawler:
-    def __init__(self, max_depth=3, max_pages=50, delay=0):
+    def __init__(self, max_depth=3, max_pages=50, delay=0, concurrency=4,
+                 tracking_params=DEFAULT_TRACKING_PARAMS, resource_policy=None,
+                 readiness=None, parse_workers=None, max_pending_parses=None,
+                 parser_backend="bs4", keyword_mode="site", parse_cache_size=256,
+                 click_restore="back", click_pages=1, skip_link_clicks=True, frontier=None,
+                 checkpoint_path=None, checkpoint_every=50, result_sink=None, keep_results=True,
+                 politeness=None, seeder=None, http_fetcher=None, baseline=None):
+        if click_restore not in RESTORE_MODES:
+            raise ValueError(f"Unknown click restore mode: {click_restore}")
         self.max_depth = max_depth
         self.max_pages = max_pages
         self.delay = delay
+        # Optional PolitenessScheduler: per-host rate limits for page loads
+        self.politeness = politeness
+        # Optional SitemapSeeder: seeds the frontier from sitemaps before the
+        # crawl and supplies the robots.txt rules every queued URL must pass
+        self.seeder = seeder
+        # Optional HttpFetcher: try each page over plain HTTP first and only
+        # open it in the browser when the served HTML is not enough
+        self.http_fetcher = http_fetcher
+        # Optional CrawlBaseline: the site's previous crawl. Its pages are
+        # revisited first, and pages whose HTML has not changed carry their
+        # previous records forward instead of being parsed and clicked again
+        self.baseline = baseline
+        self.concurrency = max(1, concurrency)
+        self.tracking_params = tracking_params
+        self.resource_policy = resource_policy
+        self.readiness = readiness or ReadinessPolicy()
+        self.parse_pool = ParsePool(workers=parse_workers, max_pending=max_pending_parses)
+        self.parser_backend = parser_backend
+        # "site": one TF-IDF fit over every crawled page once the crawl ends;
+        # "page": the original per-page fit inside parse_html
+        self.keyword_mode = keyword_mode
+        # Records go to result_sink (e.g. a JsonlResultSink) as they are made;
+        # keep_results=False leaves them out of memory altogether
+        self.result_sink = result_sink
+        self.keep_results = keep_results
+        self.result_count = 0
+        # Streamed crawls spool keyword texts to disk; with checkpoints the spool
+        # sits next to the checkpoint file, which records only its length
+        keyword_spool = f"{checkpoint_path}.keywords" if checkpoint_path and not keep_results else None
+        self.site_keywords = SiteKeywordIndex(spool=not keep_results, spool_path=keyword_spool)
+        self.parse_cache = ParseCache(maxsize=parse_cache_size)
+        self.click_restore = click_restore
+        # Pages per crawled URL that click in parallel: the page itself plus
+        # click_pages - 1 copies loaded in the same context
+        self.click_pages = max(1, click_pages)
+        # Leave plain <a href> links to the frontier instead of clicking them
+        self.skip_link_clicks = skip_link_clicks
+        self.click_stats = ClickStats()
         self.visited_urls = set()
         self.visited_buttons = set()
         self.results = []
-        self.pages_to_visit = []
+        self.pages_to_visit = frontier if frontier is not None else URLFrontier()
         self.current_depth = 0
+        self._active_pages = 0
+        # Pages being crawled right now, re-queued if a checkpoint is taken mid-page
+        self._in_flight = {}
+        self._in_flight_buttons = {}
+        self.start_url = None
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = max(1, checkpoint_every)
+        self._pages_since_checkpoint = 0
 
     def crawl_website(self, start_url):
         """Main crawling method that handles recursive exploration"""
-        self.pages_to_visit = [(start_url, 0)]  # (url, depth)
-        
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context()
-            
+        return asyncio.run(self.crawl_website_async(start_url))
+
+    def resume(self, checkpoint_path=None):
+        """Continue the crawl saved in a checkpoint by an earlier, interrupted run"""
+        self.checkpoint_path = checkpoint_path or self.checkpoint_path
+        self._restore_checkpoint(load_checkpoint(self.checkpoint_path))
+        return self.crawl_website(self.start_url)
+
+    async def crawl_website_async(self, start_url):
+        """Crawl with up to `concurrency` pages in flight in one browser context"""
+        self.start_url = start_url
+        await self._queue_start(start_url)
+        if self.result_sink is not None:
+            # On resume, keep exactly the records the checkpoint accounted for
+            self.result_sink.open(keep=self.result_count)
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context()
+            if self.resource_policy:
+                await self.resource_policy.install(context, start_url)
+
+            self.parse_pool.start()
             try:
-                while self.pages_to_visit and len(self.results) < self.max_pages:
-                    current_url, depth = self.pages_to_visit.pop(0)
-                    
-                    if depth > self.max_depth or current_url in self.visited_urls:
-                        continue
-                        
-                    self.current_depth = depth
-                    print(f"\nCrawling depth {depth}: {current_url}")
-                    
-                    page = context.new_page()
+                workers = [
+                    asyncio.create_task(self._crawl_worker(context))
+                    for _ in range(self.concurrency)
+                ]
+                await asyncio.gather(*workers)
+            except BaseException:
+                # Interrupted or crashed: keep what was crawled so far for resume()
+                self._write_checkpoint()
+                if self.result_sink is not None:
+                    self.result_sink.close()
+                raise
+            finally:
+                await browser.close()
+                self.parse_pool.close()
+                if self.result_sink is not None:
+                    self.result_sink.flush()
+
+        # Site-level keywords: a single TF-IDF fit across all crawled pages
+        words_by_index = self.site_keywords.apply()
+        if self.result_sink is not None:
+            self.result_sink.apply_keywords(words_by_index)
+            self.result_sink.close()
+        self._write_checkpoint()
+
+        if self.keep_results or self.result_sink is None:
+            return self.results
+        return self.result_sink.records()
+
+    async def _crawl_worker(self, context):
+        """Pull URLs off the queue until it is drained or the page budget is spent"""
+        while self.result_count < self.max_pages:
+            if not self.pages_to_visit:
+                # Another worker may still queue links from the page it is on
+                if self._active_pages == 0 and not self.pages_to_visit.more_expected():
+                    return
+                await asyncio.sleep(0.05)
+                continue
+
+            href, depth = self.pages_to_visit.pop()
+            # The canonical form is the page's identity; href is what gets loaded
+            current_url = self._canonicalize(href)
+
+            if depth > self.max_depth or current_url in self.visited_urls:
+                continue
+
+            # Claim the URL before awaiting so no other worker picks it up
+            self.visited_urls.add(current_url)
+            self._in_flight[current_url] = (href, depth)
+            self._active_pages += 1
+            self.current_depth = depth
+            print(f"\nCrawling depth {depth}: {href}")
+
+            records = []
+            token = _PAGE_RECORDS.set(records)
+            try:
+                if not await self._crawl_page_http(current_url, depth, href):
+                    page = await context.new_page()
                     try:
-                        self._crawl_page(page, current_url, depth)
+                        await self._crawl_page(page, current_url, depth, href)
                     finally:
-                        page.close()
-                        
+                        await page.close()
             finally:
-                browser.close()
-        
-        return self.results
+                _PAGE_RECORDS.reset(token)
+                self._active_pages -= 1
+            
+            # Only a page that finished writes its records and leaves the
+            # in-flight set; one that was interrupted stays there, its records
+            # are dropped and the checkpoint re-queues it
+            self._finish_page(current_url, records)
+            
+            self._pages_since_checkpoint += 1
+            if self._pages_since_checkpoint >= self.checkpoint_every:
+                self._write_checkpoint()
+
+    async def _crawl_page(self, page, url, depth, href=None):
+        """Crawl a single page comprehensively
 
-    def _crawl_page(self, page, url, depth):
-        """Crawl a single page comprehensively"""
+        url is the page's canonical identity, used in its records; href is
+        the address to load, url itself when not given.
+        """
+        readiness = {"strategy": self.readiness.strategy_for(url).describe()}
+        started = time.perf_counter()
         try:
-            # Navigate to page
-            page.goto(url, wait_until='networkidle')
-            time.sleep(self.delay)
+            # Navigate to page and wait until it is ready
+            response, readiness = await self._navigate(page, href or url)
+            await asyncio.sleep(self.delay)
             
-            # Record page visit
-            self.visited_urls.add(url)
+            # Metadata, links, clickables and HTML in one round-trip
+            bundle = await extract_page_bundle(page)
+            page_data = self._get_comprehensive_page_data(page, bundle)
             
-            # Get comprehensive page data
-            page_data = self._get_comprehensive_page_data(page)
+            html_content = bundle["html"]
+            html_hash = content_hash(html_content)
+            carried = self.baseline.match(url, html_hash) if self.baseline is not None else None
+            if carried is not None:
+                self._carry_forward(carried, url, depth, {
+                    "status": getattr(response, "status", None),
+                    "readiness": readiness,
+                    "links": [link["href"] for link in bundle["links"]]
+                })
+                self._follow_links(bundle["links"], url, depth, page.url)
+                return
             
             # Parse with BeautifulSoup
-            html_content = page.content()
-            parsed_data = parse_html(html_content)
+            parsed_data = await self._parse(html_content, html_hash)
             
             # Combine data
             comprehensive_data = {
@@ -68,84 +223,261 @@ class RecursiveWebCrawler:
             }
             
             # Record initial page load
-            self.results.append({
+            self._emit(self._with_sitemap({
                 "action": f"Loaded page (depth {depth})",
                 "url": url,
                 "depth": depth,
                 "timestamp": time.time(),
+                "status": getattr(response, "status", None),
+                "readiness": readiness,
+                # Every link; data["links"] holds only parse_html's first 20
+                "links": [link["href"] for link in bundle["links"]],
                 "data": comprehensive_data
-            })
+            }))
             
             print(f"Recorded page: {comprehensive_data.get('title', 'No title')}")
             
             # Find and follow links to other pages
-            self._follow_links(page, url, depth)
+            self._follow_links(bundle["links"], url, depth, page.url)
             
             # Find and click all buttons
-            self._click_all_buttons(page, url, depth)
+            await self._click_all_buttons(page, url, depth, bundle["clickables"],
+                                          comprehensive_data["content_hash"])
             
         except Exception as e:
-            self.results.append({
+            readiness.setdefault("wait_time", round(time.perf_counter() - started, 3))
+            self._emit({
                 "action": f"Failed to crawl page (depth {depth})",
                 "url": url,
                 "depth": depth,
                 "error": str(e),
+                "readiness": readiness,
                 "timestamp": time.time()
             })
 
-    def _get_comprehensive_page_data(self, page):
+    async def _crawl_page_http(self, url, depth, href=None):
+        """Crawl a page from its served HTML without a browser; False if it needs one"""
+        if self.http_fetcher is None:
+            return False
+        started = time.perf_counter()
+
+        async def request():
+            # Fetched from href, cached under the canonical url
+            return await asyncio.to_thread(self.http_fetcher.fetch, href or url, url), None
+
+        try:
+            if self.politeness is None:
+                response, _ = await request()
+            else:
+                response, _ = await self.politeness.run(url, request)
+            scan, reason = await asyncio.to_thread(self.http_fetcher.scan, url, response,
+                                                   self.skip_link_clicks, frozenset(self.visited_buttons))
+            if reason is not None:
+                print(f"Escalating {url} to the browser ({reason})")
+                return False
+            html_hash = content_hash(response.text)
+            carried = self.baseline.match(url, html_hash) if self.baseline is not None else None
+            if carried is None:
+                # Revalidated pages reuse the parse stored with the cached body
+                parse_key = f"{self.parser_backend}:{self.keyword_mode}"
+                parsed_data = await asyncio.to_thread(self.http_fetcher.cached_parse, url, response, parse_key)
+                if parsed_data is None:
+                    parsed_data = await self._parse(response.text, html_hash)
+                    await asyncio.to_thread(self.http_fetcher.store_parse, url, parse_key, parsed_data)
+        except Exception as e:
+            print(f"HTTP fetch failed for {url}, using the browser: {e}")
+            self.http_fetcher.record("fetch_error")
+            return False
+
+        await asyncio.sleep(self.delay)
+        fetched_with = "http_cache" if getattr(response, "from_cache", False) else "http"
+        readiness = {"strategy": "http", "wait_time": round(time.perf_counter() - started, 3),
+                     "condition_met": True}
+        if carried is not None:
+            self._carry_forward(carried, url, depth, {
+                "status": response.status_code,
+                "fetched_with": fetched_with,
+                "readiness": readiness,
+                "links": [link["href"] for link in scan.links]
+            })
+            self._follow_links(scan.links, url, depth, response.url)
+            return True
+        comprehensive_data = {
+            "title": parsed_data.get("title"),
+            "url": response.url,
+            "load_time": time.time(),
+            **parsed_data
+        }
+        self._emit(self._with_sitemap({
+            "action": f"Loaded page (depth {depth})",
+            "url": url,
+            "depth": depth,
+            "timestamp": time.time(),
+            "status": response.status_code,
+            "fetched_with": fetched_with,
+            "readiness": readiness,
+            "links": [link["href"] for link in scan.links],
+            "data": comprehensive_data
+        }))
+        print(f"Recorded page over HTTP: {comprehensive_data.get('title', 'No title')}")
+        self._follow_links(scan.links, url, depth, response.url)
+        return True
+
+    def _carry_forward(self, carried, url, depth, fields):
+        """Re-emit the previous crawl's records for a page whose HTML is unchanged"""
+        page_record, click_records = carried
+        carried_from = self.baseline.crawl_id
+        self._emit(self._with_sitemap({
+            "action": f"Loaded page (depth {depth})",
+            "url": url,
+            "depth": depth,
+            "timestamp": time.time(),
+            **fields,
+            "carried_from": carried_from,
+            "data": page_record["data"]
+        }))
+        for record in click_records:
+            element = record.get("clicked_element")
+            if element:
+                self.visited_buttons.add(f"{element.get('tag')}_{element.get('text')}_{element.get('type')}")
+            if "previous_url" in record:
+                # A navigating click; queue the address it loaded as clicking it would have
+                href = (record.get("data") or {}).get("url") or record["url"]
+                if record["url"] not in self.visited_urls and depth < self.max_depth and self._allowed(href):
+                    self._queue(href, depth + 1)
+            self._emit(dict(record, depth=depth, timestamp=time.time(), carried_from=carried_from))
+        print(f"Unchanged since crawl #{carried_from}: {url} ({len(click_records)} clicks carried forward)")
+
+    def _seed_from_baseline(self):
+        """Queue the previous crawl's pages, in the baseline's revisit order"""
+        queued = 0
+        for href, depth in self.baseline.revisit_order():
+            if depth <= self.max_depth and self._allowed(href) and self._queue(href, depth):
+                queued += 1
+        print(f"Revisiting {queued} pages from crawl #{self.baseline.crawl_id}")
+
+    def crawl_delta(self, records):
+        """New, changed and removed pages and links against the baseline crawl"""
+        # Pages still queued when max_pages ran out were not checked, not removed
+        unreached = [url for url, _ in self.pages_to_visit.snapshot()["queue"]]
+        return crawl_delta(self.baseline, records, unreached)
+
+    async def _queue_start(self, start_url):
+        """Queue the start page first, then the sitemap and baseline seeds behind it"""
+        if self.seeder is not None:
+            # robots.txt before anything is queued, so the start URL is checked too
+            await asyncio.to_thread(self.seeder.robots_for, start_url)
+        if self._allowed(start_url):
+            self._queue(start_url, 0)
+        else:
+            print(f"Start URL {start_url} is disallowed by robots.txt")
+        if self.seeder is not None:
+            await self._seed_frontier(start_url)
+        if self.baseline is not None:
+            self._seed_from_baseline()
+
+    def _with_sitemap(self, record):
+        """Add the sitemap priority and lastmod of a seeded page to its record"""
+        entry = self.seeder.entries.get(record["url"]) if self.seeder else None
+        if entry:
+            record["sitemap"] = {"priority": entry["priority"], "lastmod": entry["lastmod"]}
+        return record
+
+    async def _seed_frontier(self, start_url):
+        """Queue the URLs the site lists in its sitemaps, one level below the start page"""
+        # Plain HTTP fetches and XML parsing, kept off the event loop
+        entries = await asyncio.to_thread(self.seeder.discover, start_url)
+        if self.max_depth < 1:
+            return
+        queued = 0
+        for entry in entries:
+            href = entry.get("loc", entry["url"])
+            if self._canonicalize(href) not in self.visited_urls and self._queue(href, 1):
+                queued += 1
+        print(f"Seeded {queued} URLs from {self.seeder.stats['sitemaps']} sitemaps "
+              f"({self.seeder.stats['disallowed']} disallowed by robots.txt)")
+
+    def _queue(self, href, depth):
+        """Queue href for loading, deduplicated by its canonical form"""
+        return self.pages_to_visit.push(href, depth, key=self._canonicalize(href))
+
+    def _allowed(self, url):
+        """Whether robots.txt lets us crawl url; everything is allowed without a seeder"""
+        return self.seeder is None or self.seeder.allowed(url)
+
+    def _link_queued(self, href):
+        """Whether href was already queued or visited, so clicking it would load nothing new
+
+        Off-site links, links past max_depth and links robots.txt disallows
+        are never queued by _follow_links; clicking them is the only way the
+        crawl sees where they lead.
+        """
+        key = self._canonicalize(href.split('#', 1)[0])
+        return key in self.pages_to_visit or key in self.visited_urls
+
+    async def _navigate(self, page, url):
+        """Load url under the per-host politeness limits, when there are any"""
+        if self.politeness is None:
+            return await self.readiness.navigate(page, url)
+        return await self.politeness.run(url, lambda: self.readiness.navigate(page, url))
+
+    async def _parse(self, html, html_hash=None):
+        """Parse page HTML, reusing the cached result for identical HTML"""
+        html_hash = html_hash or content_hash(html)
+        parsed_data = self.parse_cache.get(html_hash)
+        if parsed_data is None:
+            parsed_data = await self.parse_pool.parse(html, backend=self.parser_backend,
+                                                      keywords=self.keyword_mode == "page")
+            self.parse_cache.put(html_hash, parsed_data)
+        parsed_data["content_hash"] = html_hash
+        return parsed_data
+
+    def _finish_page(self, url, records):
+        """Write the records of a page that was crawled to the end"""
+        for record in records:
+            self._write_record(record)
+        del self._in_flight[url]
+        self._in_flight_buttons.pop(url, None)
+
+    def _emit(self, record):
+        """Hand a finished record on, or hold it until its page has finished"""
+        page_records = _PAGE_RECORDS.get()
+        if page_records is not None:
+            page_records.append(record)
+        else:
+            self._write_record(record)
+
+    def _write_record(self, record):
+        """Hand a record to the results list and/or the result sink"""
+        self._track_keywords(record, self.result_count)
+        if self.keep_results:
+            self.results.append(record)
+        if self.result_sink is not None:
+            self.result_sink.write(record)
+        self.result_count += 1
+
+    def _track_keywords(self, record, index):
+        """Hand the page text to the site keyword stage instead of the record"""
+        data = record.get("data")
+        if not isinstance(data, dict):
+            return
+        text = data.pop("keyword_text", None)
+        if text is not None:
+            self.site_keywords.add(data if self.keep_results else None, text, index)
+
+    def _get_comprehensive_page_data(self, page, bundle):
         """Extract comprehensive data from the page"""
         try:
             # Basic page info
             data = {
-                "title": page.title(),
+                "title": bundle["metadata"]["document_title"],
                 "url": page.url,
                 "viewport_size": page.viewport_size,
                 "load_time": time.time()
             }
             
-            # JavaScript execution for dynamic data
-            js_data = page.evaluate("""
-                () => {
-                    return {
-                        document_title: document.title,
-                        document_url: document.URL,
-                        document_referrer: document.referrer,
-                        document_domain: document.domain,
-                        window_location: {
-                            href: window.location.href,
-                            protocol: window.location.protocol,
-                            host: window.location.host,
-                            pathname: window.location.pathname,
-                            search: window.location.search,
-                            hash: window.location.hash
-                        },
-                        page_ready_state: document.readyState,
-                        user_agent: navigator.userAgent,
-                        language: navigator.language,
-                        cookie_enabled: navigator.cookieEnabled,
-                        on_line: navigator.onLine,
-                        screen_resolution: {
-                            width: screen.width,
-                            height: screen.height
-                        },
-                        window_size: {
-                            width: window.innerWidth,
-                            height: window.innerHeight
-                        },
-                        forms_count: document.forms.length,
-                        images_count: document.images.length,
-                        scripts_count: document.scripts.length,
-                        stylesheets_count: document.styleSheets.length,
-                        meta_tags: Array.from(document.querySelectorAll('meta')).map(meta => ({
-                            name: meta.name,
-                            content: meta.content,
-                            property: meta.property,
-                            charset: meta.charset
-                        }))
-                    };
-                }
-            """)
+            # Dynamic data collected by the DOM helper
+            js_data = bundle["metadata"]
             
             data.update(js_data)
             return data
@@ -153,168 +485,339 @@ class RecursiveWebCrawler:
         except Exception as e:
             return {"error": f"Failed to extract page data: {str(e)}"}
 
-    def _follow_links(self, page, current_url, depth):
-        """Find and queue links to other pages"""
+    def _follow_links(self, links, current_url, depth, base_url=None):
+        """Queue links to other pages
+
+        current_url is the page's canonical url, which decides what counts as
+        the same domain. base_url is the address the page was served from,
+        which relative links resolve against; current_url when not given.
+        Only the former is trusted, so a redirect off-site does not make the
+        other site's links internal.
+        """
+        base_url = base_url or current_url
         try:
-            # Get all links
-            links = page.evaluate("""
-                () => {
-                    const links = Array.from(document.querySelectorAll('a[href]'));
-                    return links.map(link => ({
-                        href: link.href,
-                        text: link.innerText.trim(),
-                        title: link.title
-                    })).filter(link => link.href && link.href !== window.location.href);
-                }
-            """)
-            
             # Filter and add new links to visit
             for link in links:
                 href = link['href']
                 
-                # Normalize URL
+                # Resolve the link; its canonical form only decides identity
                 if href.startswith('/'):
-                    href = urljoin(current_url, href)
+                    href = urljoin(base_url, href)
                 elif not href.startswith(('http://', 'https://')):
-                    href = urljoin(current_url, href)
+                    href = urljoin(base_url, href)
+                href = href.split('#', 1)[0]
+                key = self._canonicalize(href)
                 
                 # Check if we should follow this link
-                if (href not in self.visited_urls and 
+                if (key not in self.visited_urls and 
                     depth < self.max_depth and
-                    self._is_same_domain(current_url, href)):
+                    self._is_same_domain(current_url, key) and
+                    self._allowed(href)):
                     
-                    self.pages_to_visit.append((href, depth + 1))
-                    print(f"Queued link: {href}")
+                    if self._queue(href, depth + 1):
+                        print(f"Queued link: {href}")
             
         except Exception as e:
             print(f"Error following links: {e}")
 
-    def _click_all_buttons(self, page, url, depth):
+    async def _click_all_buttons(self, page, url, depth, clickables, state_hash=None):
         """Click all clickable elements on the page"""
+        started = time.perf_counter()
         try:
-            # Get all clickable elements
-            clickables = page.evaluate("""
-                () => {
-                    const selectors = [
-                        'button:not([disabled])',
-                        'a:not([href^="#"]):not([href="javascript:void(0)"])',
-                        '[role="button"]:not([disabled])',
-                        '[onclick]',
-                        'input[type="button"]:not([disabled])',
-                        'input[type="submit"]:not([disabled])',
-                        '.btn:not([disabled])',
-                        '.button:not([disabled])'
-                    ];
-                    
-                    const elements = [];
-                    selectors.forEach(selector => {
-                        const found = document.querySelectorAll(selector);
-                        found.forEach(el => {
-                            if (el.offsetParent !== null) { // Check if visible
-                                elements.push({
-                                    tag: el.tagName,
-                                    text: el.innerText?.trim() || el.value || el.getAttribute('aria-label') || 'Unnamed',
-                                    type: el.type || '',
-                                    href: el.href || '',
-                                    onclick: el.onclick ? 'has_onclick' : '',
-                                    id: el.id || '',
-                                    className: el.className || ''
-                                });
-                            }
-                        });
-                    });
-                    
-                    return elements;
-                }
-            """)
-            
-            # Click each unique button
+            # Pick the unique buttons up front so the split across pages is deterministic
+            pending = []
             for i, clickable in enumerate(clickables):
                 button_id = f"{clickable['tag']}_{clickable['text']}_{clickable['type']}"
-                
                 if button_id not in self.visited_buttons:
                     self.visited_buttons.add(button_id)
-                    
-                    try:
-                        print(f"Clicking [{i+1}]: {clickable['text']}")
-                        
-                        # Find and click the element
-                        element = page.query_selector(f"text={clickable['text']}")
-                        if not element:
-                            # Try by tag and text combination
-                            element = page.query_selector(f"{clickable['tag'].lower()}:has-text('{clickable['text']}')")
-                        
-                        if element:
-                            element.click()
-                            time.sleep(self.delay)
-                            
-                            # Check if page changed
-                            new_url = page.url
-                            if new_url != url:
-                                # Page navigated - record new page
-                                self._record_page_after_click(page, clickable, url, new_url, depth)
-                            else:
-                                # Same page - check for content changes
-                                self._record_content_change(page, clickable, url, depth)
-                        
-                    except Exception as e:
-                        self.results.append({
-                            "action": f"Failed to click button: {clickable['text']}",
-                            "url": url,
-                            "depth": depth,
-                            "error": str(e),
-                            "timestamp": time.time()
-                        })
-                        
+                    self._in_flight_buttons.setdefault(url, set()).add(button_id)
+                    if (self.skip_link_clicks and is_plain_navigation(clickable)
+                            and self._link_queued(clickable['href'])):
+                        self.click_stats.skipped_navigations += 1
+                        continue
+                    pending.append((i, clickable))
+            if not pending:
+                return
+            
+            # After redirects the page may not be at the queued URL
+            origin_url = self._canonicalize(page.url)
+            
+            # Round-robin the clicks over this page and up to click_pages - 1 copies of it
+            lanes = min(self.click_pages, len(pending))
+            slices = [pending[lane::lanes] for lane in range(lanes)]
+            lane_results = await asyncio.gather(
+                self._explore_clicks(page, origin_url, url, depth, slices[0], state_hash),
+                *[self._explore_clicks_on_copy(page.context, page.url, url, depth, items)
+                  for items in slices[1:]]
+            )
+            
+            # Copies that did not load like the original hand their clicks back
+            records = []
+            for items, lane_records in zip(slices, lane_results):
+                if lane_records is None:
+                    lane_records = await self._explore_clicks(page, origin_url, url, depth, items)
+                records.extend(lane_records)
+            
+            # Merge in click order, whichever page did the clicking
+            records.sort(key=lambda indexed: indexed[0])
+            for _, record in records:
+                self._emit(record)
+            
         except Exception as e:
             print(f"Error clicking buttons: {e}")
+        finally:
+            self.click_stats.exploration_time += time.perf_counter() - started
+
+    async def _explore_clicks_on_copy(self, context, origin_href, url, depth, items):
+        """Load origin_href in a new page and click items there; None if the copy differs"""
+        origin_url = self._canonicalize(origin_href)
+        page = await context.new_page()
+        try:
+            await self._navigate(page, origin_href)
+            bundle = await extract_page_bundle(page, metadata=False, links=False)
+            
+            # data-crawler-id follows document order, so the same DOM gives the same ids
+            texts = {clickable['crawler_id']: clickable['text'] for clickable in bundle["clickables"]}
+            if any(texts.get(clickable['crawler_id']) != clickable['text'] for _, clickable in items):
+                self.click_stats.copy_mismatches += 1
+                return None
+            
+            return await self._explore_clicks(page, origin_url, url, depth, items,
+                                              content_hash(bundle["html"]))
+        except Exception as e:
+            print(f"Error loading page copy for clicks: {e}")
+            self.click_stats.copy_mismatches += 1
+            return None
+        finally:
+            await page.close()
+
+    async def _explore_clicks(self, page, origin_url, url, depth, items, state_hash=None):
+        """Click items, given as (index, clickable), on one page; returns (index, record) pairs"""
+        origin_hash = state_hash
+        # Restores load the page's own address, not its canonical form
+        origin_href = page.url
+        stats = self.click_stats
+        records = []
+        lost_page = False
+        for i, clickable in items:
+            click_records = []
+            started = time.perf_counter()
+            try:
+                print(f"Clicking [{i+1}]: {clickable['text']}")
+                
+                # The DOM helper tagged the element with a unique attribute
+                element = await page.query_selector(clickable['selector'])
+                if not element:
+                    stats.missing_elements += 1
+                    raise RuntimeError("Element is no longer in the page")
+                
+                await element.click()
+                await asyncio.sleep(self.delay)
+                click_time = round(time.perf_counter() - started, 3)
+                stats.clicks += 1
+                stats.click_time += click_time
+                
+                # Check if page changed
+                new_url = self._canonicalize(page.url)
+                if new_url != origin_url:
+                    # Page navigated - record new page, then go back for the next click
+                    stats.navigations += 1
+                    state_hash = await self._record_page_after_click(page, clickable, url, new_url,
+                                                                     depth, click_time, click_records)
+                    if self.click_restore == "none":
+                        origin_url, origin_href = new_url, page.url
+                    elif await self._restore_page(page, origin_url, origin_href):
+                        state_hash = origin_hash
+                    else:
+                        lost_page = True
+                else:
+                    # Same page - check for content changes
+                    state_hash = await self._record_content_change(page, clickable, url, depth,
+                                                                   state_hash, click_time, click_records)
+                
+            except Exception as e:
+                stats.failed_clicks += 1
+                click_records.append({
+                    "action": f"Failed to click button: {clickable['text']}",
+                    "url": url,
+                    "depth": depth,
+                    "error": str(e),
+                    "click_time": round(time.perf_counter() - started, 3),
+                    "timestamp": time.time()
+                })
+            
+            records.extend((i, record) for record in click_records)
+            if lost_page:
+                print(f"Could not return to {origin_url}; stopping clicks on this page")
+                break
+        return records
+
+    async def _restore_page(self, page, origin_url, origin_href=None):
+        """Return the page to origin_url after a navigating click; False if that failed"""
+        started = time.perf_counter()
+        method = await restore_page(page, origin_url, self.readiness, self._canonicalize,
+                                    self.click_restore, href=origin_href, politeness=self.politeness)
+        self.click_stats.restore_time += time.perf_counter() - started
+        if not method:
+            self.click_stats.restore_failures += 1
+            return False
+        
+        self.click_stats.restored[method] += 1
+        # A reloaded document has lost its data-crawler-id tags; re-run the
+        # helper so the remaining selectors resolve again
+        await extract_page_bundle(page, metadata=False, links=False, html=False)
+        return True
 
-    def _record_page_after_click(self, page, clickable, old_url, new_url, depth):
+    async def _record_page_after_click(self, page, clickable, old_url, new_url, depth, click_time=None,
+                                       records=None):
         """Record the new page after a click that caused navigation"""
+        emit = self._emit if records is None else records.append
+        if not self._allowed(page.url):
+            # Only the click is recorded; the page itself is not read or queued
+            emit({
+                "action": f"Clicked '{clickable['text']}' - Navigated to a page disallowed by robots.txt",
+                "url": new_url,
+                "previous_url": old_url,
+                "depth": depth,
+                "clicked_element": clickable,
+                "click_time": click_time,
+                "timestamp": time.time(),
+                "disallowed": True
+            })
+            return None
         try:
-            html_content = page.content()
-            parsed_data = parse_html(html_content)
-            page_data = self._get_comprehensive_page_data(page)
+            bundle = await extract_page_bundle(page, links=False, clickables=False)
+            parsed_data = await self._parse(bundle["html"])
+            page_data = self._get_comprehensive_page_data(page, bundle)
             
             comprehensive_data = {
                 **page_data,
                 **parsed_data
             }
             
-            self.results.append({
+            emit({
                 "action": f"Clicked '{clickable['text']}' - Navigated to new page",
                 "url": new_url,
                 "previous_url": old_url,
                 "depth": depth,
                 "clicked_element": clickable,
+                "click_time": click_time,
                 "timestamp": time.time(),
                 "data": comprehensive_data
             })
             
             # Add new page to visit queue if not visited
             if new_url not in self.visited_urls and depth < self.max_depth:
-                self.pages_to_visit.append((new_url, depth + 1))
+                self._queue(page.url, depth + 1)
+            
+            return comprehensive_data["content_hash"]
                 
         except Exception as e:
             print(f"Error recording page after click: {e}")
 
-    def _record_content_change(self, page, clickable, url, depth):
-        """Record content changes on the same page after a click"""
+    async def _record_content_change(self, page, clickable, url, depth, previous_hash=None, click_time=None,
+                                     records=None):
+        """Record content changes on the same page after a click; returns the new content hash"""
+        emit = self._emit if records is None else records.append
         try:
-            html_content = page.content()
-            parsed_data = parse_html(html_content)
+            bundle = await extract_page_bundle(page, metadata=False, links=False, clickables=False)
+            html_hash = content_hash(bundle["html"])
+            
+            if html_hash == previous_hash:
+                # Click was a no-op: log a compact marker instead of a full parse
+                emit({
+                    "action": f"Clicked '{clickable['text']}' - No content change",
+                    "url": url,
+                    "depth": depth,
+                    "clicked_element": clickable,
+                    "click_time": click_time,
+                    "timestamp": time.time(),
+                    "unchanged": True,
+                    "content_hash": html_hash
+                })
+                return html_hash
+            
+            parsed_data = await self._parse(bundle["html"], html_hash)
             
-            self.results.append({
+            emit({
                 "action": f"Clicked '{clickable['text']}' - Content changed",
                 "url": url,
                 "depth": depth,
                 "clicked_element": clickable,
+                "click_time": click_time,
                 "timestamp": time.time(),
                 "data": parsed_data
             })
+            return html_hash
             
         except Exception as e:
             print(f"Error recording content change: {e}")
+            return previous_hash
+
+    def _write_checkpoint(self):
+        """Atomically save frontier, visited sets and results if checkpointing is on"""
+        if not self.checkpoint_path:
+            return
+        self._pages_since_checkpoint = 0
+        
+        # Pages still being crawled have no results yet, so they go back in the queue
+        frontier = self.pages_to_visit.snapshot()
+        frontier["queue"] = [[href, depth] for href, depth in self._in_flight.values()] + frontier["queue"]
+        
+        try:
+            if self.result_sink is not None:
+                self.result_sink.flush()
+            # Keyword texts waiting for the site-level fit, by record index
+            if self.site_keywords.spool_path is not None:
+                keywords = {"keyword_spool": self.site_keywords.spool_state()}
+            else:
+                keywords = {"pending_keywords": [[index, text] for _, index, text in self.site_keywords.pending()]}
+            save_checkpoint(self.checkpoint_path, {
+                "start_url": self.start_url,
+                "frontier": frontier,
+                "visited_urls": sorted(set(self.visited_urls) - set(self._in_flight)),
+                "visited_buttons": sorted(self.visited_buttons.difference(*self._in_flight_buttons.values())),
+                "results": self.results,
+                "result_count": self.result_count,
+                **keywords
+            })
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error writing checkpoint: {e}")
+
+    def _restore_checkpoint(self, state):
+        """Load crawl state from a checkpoint dict"""
+        self.start_url = state["start_url"]
+        self.pages_to_visit.restore(state["frontier"])
+        self.visited_urls = set(state["visited_urls"])
+        self.visited_buttons = set(state["visited_buttons"])
+        self.results = state["results"]
+        self.result_count = state.get("result_count", len(self.results))
+        if "keyword_spool" in state:
+            self.site_keywords.restore_spool(state["keyword_spool"])
+            return
+        for index, text in state["pending_keywords"]:
+            data = self.results[index]["data"] if self.keep_results else None
+            self.site_keywords.add(data, text, index)
+
+    def crawl_stats(self):
+        """Counters gathered during the crawl, for the summary"""
+        stats = {
+            "parse_cache": self.parse_cache.stats(),
+            "clicks": self.click_stats.stats()
+        }
+        if self.resource_policy:
+            stats["resource_blocking"] = self.resource_policy.stats
+        if self.politeness:
+            stats["politeness"] = self.politeness.stats()
+        if self.http_fetcher:
+            stats["http_fast_path"] = self.http_fetcher.stats()
+        if self.baseline:
+            stats["incremental"] = self.baseline.stats()
+        return stats
+
+    def _canonicalize(self, url):
+        """Canonical form of a URL used for visited/queued identity"""
+        return canonicalize_url(url, tracking_params=self.tracking_params)
 
     def _is_same_domain(self, url1, url2):
         """Check if two URLs are from the same domain"""
@@ -325,7 +828,23 @@ class RecursiveWebCrawler:
         except:
             return False
 
-def crawl_website(start_url, max_depth=3, max_pages=50, delay=0):
+def crawl_website(start_url, max_depth=3, max_pages=50, delay=0, concurrency=4,
+                  resource_policy=None, readiness=None, parse_workers=None,
+                  parser_backend="bs4", keyword_mode="site", parse_cache_size=256,
+                  click_restore="back", click_pages=1, skip_link_clicks=True, checkpoint_path=None,
+                  politeness=None, seeder=None, http_fetcher=None, baseline=None):
     """Main function to start recursive crawling"""
-    crawler = RecursiveWebCrawler(max_depth=max_depth, max_pages=max_pages, delay=delay)
+    crawler = RecursiveWebCrawler(max_depth=max_depth, max_pages=max_pages, delay=delay,
+                                  concurrency=concurrency, resource_policy=resource_policy,
+                                  readiness=readiness, parse_workers=parse_workers,
+                                  parser_backend=parser_backend, keyword_mode=keyword_mode,
+                                  parse_cache_size=parse_cache_size, click_restore=click_restore,
+                                  click_pages=click_pages, skip_link_clicks=skip_link_clicks,
+                                  checkpoint_path=checkpoint_path, politeness=politeness,
+                                  seeder=seeder, http_fetcher=http_fetcher, baseline=baseline)
     return crawler.crawl_website(start_url)
+
+def resume_crawl(checkpoint_path, **options):
+    """Continue a checkpointed crawl; options are RecursiveWebCrawler arguments"""
+    crawler = RecursiveWebCrawler(checkpoint_path=checkpoint_path, **options)
+    return crawler.resume()
@@ -0,0 +1,201 @@
+import asyncio
+import time
+from urllib.parse import urlparse
+
+# Responses that mean the host wants us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+
+def _retry_after(response):
+    """Seconds asked for by a Retry-After header, if it holds a number"""
+    try:
+        return float(response.headers.get('retry-after'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _response_time(response):
+    """Seconds until the server started answering, when the response records it
+
+    requests responses carry .elapsed; Playwright responses carry their
+    request's timing, in milliseconds. Either leaves out the time the
+    browser then spends loading and rendering the page.
+    """
+    elapsed = getattr(response, 'elapsed', None)
+    if elapsed is not None:
+        return elapsed.total_seconds()
+    try:
+        response_start = response.request.timing['responseStart']
+    except (AttributeError, KeyError, TypeError):
+        return None
+    return response_start / 1000 if response_start >= 0 else None
+
+
+class HostLimiter:
+    """Token bucket plus concurrency cap for one host, with adaptive rate
+
+    Like TCP congestion control, the rate first grows by half per healthy
+    response (slow start) until the host pushes back; after that it grows
+    additively while responses are fast and healthy. It is cut
+    multiplicatively on 429/503, on 5xx errors and requests that fail
+    outright, or when a response is much slower than the host's running
+    average latency.
+    """
+
+    def __init__(self, rate, max_rate, min_rate, max_concurrency, burst,
+                 backoff=0.5, slowdown=0.8, increase=0.5, latency_factor=2.0):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.max_concurrency = max_concurrency
+        self.burst = burst
+        self.backoff = backoff
+        self.slowdown = slowdown
+        self.increase = increase
+        self.latency_factor = latency_factor
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.latency = None
+        self.requests = 0
+        self.throttled = 0
+        self.slowdowns = 0
+        self.failures = 0
+        self.slow_start = True
+        self._slots = None
+
+    async def acquire(self):
+        """Wait for a concurrency slot and a token"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        await self._slots.acquire()
+        try:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                else:
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._slots.release()
+
+    def fail(self):
+        """Back off after a request that raised: a timeout or a connection error"""
+        self.requests += 1
+        self.failures += 1
+        self.slow_start = False
+        self.rate = max(self.min_rate, self.rate * self.backoff)
+
+    def observe(self, status, latency, retry_after=None):
+        """Adapt the rate to one response; latency is the server's response time"""
+        if status is not None and status >= 500 and status not in THROTTLE_STATUSES:
+            self.fail()
+            return
+        self.requests += 1
+        if status in THROTTLE_STATUSES:
+            self.throttled += 1
+            self.slow_start = False
+            self.rate = max(self.min_rate, self.rate * self.backoff)
+            # Drain the bucket so the pause is not followed by a burst
+            self.tokens = 0
+            self.paused_until = time.monotonic() + (retry_after if retry_after is not None else 1 / self.rate)
+            return
+
+        if self.latency is not None and latency > self.latency * self.latency_factor:
+            self.slowdowns += 1
+            self.slow_start = False
+            self.rate = max(self.min_rate, self.rate * self.slowdown)
+        elif status is not None:
+            grown = self.rate * 1.5 if self.slow_start else self.rate + self.increase
+            self.rate = min(self.max_rate, grown)
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+
+    def stats(self):
+        return {
+            "rate": round(self.rate, 2),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "slowdowns": self.slowdowns,
+            "failures": self.failures,
+            "latency": round(self.latency, 3) if self.latency is not None else None
+        }
+
+
+class PolitenessScheduler:
+    """Per-host request scheduling for the crawler
+
+    Each host gets its own HostLimiter: at most max_per_host requests in
+    flight and a token bucket refilled at the host's current rate
+    (requests/sec), which starts at rate and adapts between min_rate and
+    max_rate. Throttled responses are retried up to max_retries times once
+    the host's pause has passed. Limits are per process, so a sharded crawl
+    allows this rate in every shard.
+    """
+
+    def __init__(self, rate=4.0, max_rate=20.0, min_rate=0.2, max_per_host=4, burst=None,
+                 max_retries=2, max_pause=60.0):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.max_per_host = max(1, max_per_host)
+        self.burst = burst or self.max_per_host
+        self.max_retries = max_retries
+        self.max_pause = max_pause
+        self.hosts = {}
+
+    def limiter(self, url):
+        """The HostLimiter for url's host, created on first use"""
+        host = (urlparse(url).netloc or url).lower()
+        if host not in self.hosts:
+            self.hosts[host] = HostLimiter(self.rate, self.max_rate, self.min_rate,
+                                           self.max_per_host, self.burst)
+        return self.hosts[host]
+
+    async def run(self, url, request):
+        """Await request() -> (response, info) within url's host limits
+
+        Returns the last (response, info) pair; a response that is still
+        throttled after max_retries retries is returned as is.
+        """
+        limiter = self.limiter(url)
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response, info = await request()
+            except Exception:
+                limiter.fail()
+                raise
+            finally:
+                limiter.release()
+            latency = _response_time(response)
+            if latency is None:
+                latency = time.perf_counter() - started
+
+            # Playwright responses have .status, requests responses .status_code
+            status = getattr(response, 'status', getattr(response, 'status_code', None))
+            retry_after = _retry_after(response)
+            if retry_after is not None:
+                retry_after = min(retry_after, self.max_pause)
+            limiter.observe(status, latency, retry_after)
+            if status not in THROTTLE_STATUSES:
+                break
+            print(f"{url} answered {status}; slowing {urlparse(url).netloc} to {limiter.rate:.2f} req/s")
+        return response, info
+
+    def stats(self):
+        """Current rate and counters per host"""
+        return {host: limiter.stats() for host, limiter in self.hosts.items()}
@@ -0,0 +1,114 @@
+import re
+import time
+
+# Strategies that map straight onto page.goto(wait_until=...)
+LOAD_STATES = ('commit', 'domcontentloaded', 'load', 'networkidle')
+
+# Strategies that navigate to domcontentloaded and then wait on the page
+CONDITION_STRATEGIES = ('selector', 'dom_quiet')
+
+# Resolves once the DOM has seen no mutations for quietMs, or after capMs
+DOM_QUIET_SCRIPT = """
+([quietMs, capMs]) => new Promise(resolve => {
+    let quietTimer;
+    let capTimer;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done(true), quietMs);
+    });
+    const done = (quiet) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(capTimer);
+        resolve(quiet);
+    };
+    observer.observe(document, {
+        subtree: true,
+        childList: true,
+        attributes: true,
+        characterData: true
+    });
+    quietTimer = setTimeout(() => done(true), quietMs);
+    capTimer = setTimeout(() => done(false), capMs);
+})
+"""
+
+
+class ReadinessStrategy:
+    """How long to wait before a freshly navigated page is considered ready"""
+
+    def __init__(self, kind='networkidle', selector=None, quiet_ms=500, timeout_ms=30000):
+        if kind not in LOAD_STATES + CONDITION_STRATEGIES:
+            raise ValueError(f"Unknown readiness strategy: {kind}")
+        if kind == 'selector' and not selector:
+            raise ValueError("The 'selector' readiness strategy needs a selector")
+        self.kind = kind
+        self.selector = selector
+        self.quiet_ms = quiet_ms
+        self.timeout_ms = timeout_ms
+
+    def describe(self):
+        """Short label recorded alongside each result"""
+        if self.kind == 'selector':
+            return f"selector:{self.selector}"
+        if self.kind == 'dom_quiet':
+            return f"dom_quiet:{self.quiet_ms}ms"
+        return self.kind
+
+    async def navigate(self, page, url):
+        """Navigate to url and wait until ready; returns (response, readiness info)"""
+        start = time.perf_counter()
+        deadline = start + self.timeout_ms / 1000
+
+        wait_until = self.kind if self.kind in LOAD_STATES else 'domcontentloaded'
+        response = await page.goto(url, wait_until=wait_until, timeout=self.timeout_ms)
+
+        condition_met = True
+        remaining_ms = max(0, int((deadline - time.perf_counter()) * 1000))
+        if self.kind == 'selector':
+            try:
+                await page.wait_for_selector(self.selector, timeout=max(1, remaining_ms))
+            except Exception:
+                # Carry on with whatever rendered; the record says it timed out
+                condition_met = False
+        elif self.kind == 'dom_quiet':
+            condition_met = await page.evaluate(DOM_QUIET_SCRIPT, [self.quiet_ms, remaining_ms])
+
+        return response, {
+            "strategy": self.describe(),
+            "wait_time": round(time.perf_counter() - start, 3),
+            "condition_met": bool(condition_met)
+        }
+
+
+class ReadinessPolicy:
+    """Readiness strategy for a crawl, with per-URL-pattern overrides
+
+    overrides is a list of (regex, strategy) pairs; the first pattern that
+    matches the URL (re.search) wins, otherwise the default applies.
+    Strategies may be given as ReadinessStrategy objects or kind names.
+    """
+
+    def __init__(self, default='networkidle', overrides=()):
+        self.default = self._as_strategy(default)
+        self.overrides = [
+            (re.compile(pattern), self._as_strategy(strategy))
+            for pattern, strategy in overrides
+        ]
+
+    @staticmethod
+    def _as_strategy(strategy):
+        if isinstance(strategy, ReadinessStrategy):
+            return strategy
+        return ReadinessStrategy(strategy)
+
+    def strategy_for(self, url):
+        """Pick the strategy for a URL"""
+        for pattern, strategy in self.overrides:
+            if pattern.search(url):
+                return strategy
+        return self.default
+
+    async def navigate(self, page, url):
+        """Navigate using the strategy that applies to url"""
+        return await self.strategy_for(url).navigate(page, url)
@@ -0,0 +1,109 @@
+from urllib.parse import urlparse
+
+# Resource types (Playwright's request.resource_type) that parse_html and
+# the page data extraction never look at
+DEFAULT_BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+
+# Analytics, ad and session-recording hosts
+DEFAULT_TRACKER_DOMAINS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'doubleclick.net',
+    'facebook.net',
+    'hotjar.com',
+    'segment.io',
+    'segment.com',
+    'mixpanel.com',
+    'amplitude.com',
+    'fullstory.com',
+    'clarity.ms',
+    'newrelic.com',
+    'nr-data.net',
+    'adsrvr.org',
+    'scorecardresearch.com',
+    'quantserve.com',
+    'taboola.com',
+    'outbrain.com',
+)
+
+
+def _host_matches(host, domains):
+    """True if host is one of domains or a subdomain of one"""
+    return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+
+def _site_domain(url):
+    """Host of a URL without a leading www., used as the first-party domain"""
+    host = (urlparse(url).hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
+
+class ResourceBlockingPolicy:
+    """Decides which sub-resource requests to abort while pages load"""
+
+    def __init__(self, blocked_resource_types=DEFAULT_BLOCKED_RESOURCE_TYPES,
+                 allow_domains=(), deny_domains=DEFAULT_TRACKER_DOMAINS,
+                 first_party_only=False):
+        self.blocked_resource_types = set(blocked_resource_types)
+        self.allow_domains = tuple(domain.lower() for domain in allow_domains)
+        self.deny_domains = tuple(domain.lower() for domain in deny_domains)
+        self.first_party_only = first_party_only
+        self.first_party_domain = ''
+        self.stats = {
+            "allowed": 0,
+            "blocked": 0,
+            "blocked_by_reason": {}
+        }
+
+    def should_block(self, request_url, resource_type, is_main_document=False):
+        """Return the reason to block a request, or None to let it through"""
+        # Never block the page we are actually crawling
+        if is_main_document:
+            return None
+
+        if resource_type in self.blocked_resource_types:
+            return "resource_type"
+
+        host = (urlparse(request_url).hostname or '').lower()
+        if not host:
+            return None
+
+        if _host_matches(host, self.allow_domains):
+            return None
+
+        if _host_matches(host, self.deny_domains):
+            return "deny_domain"
+
+        if self.first_party_only and self.first_party_domain:
+            if not _host_matches(host, (self.first_party_domain,)):
+                return "third_party"
+
+        return None
+
+    async def install(self, context, start_url):
+        """Route every request made in the browser context through the policy"""
+        self.first_party_domain = _site_domain(start_url)
+        await context.route("**/*", self._handle_route)
+
+    async def _handle_route(self, route):
+        request = route.request
+        try:
+            is_main_document = (request.is_navigation_request() and
+                                request.frame.parent_frame is None)
+        except Exception:
+            # Service worker requests have no frame
+            is_main_document = False
+
+        reason = self.should_block(request.url, request.resource_type, is_main_document)
+        if reason:
+            self.stats["blocked"] += 1
+            by_reason = self.stats["blocked_by_reason"]
+            by_reason[reason] = by_reason.get(reason, 0) + 1
+            await route.abort("blockedbyclient")
+        else:
+            self.stats["allowed"] += 1
+            await route.continue_()
@@ -0,0 +1,194 @@
+import gzip
+import json
+import os
+
+COMPRESSIONS = (None, 'gzip', 'zstd')
+
+
+def infer_compression(path):
+    """Compression implied by a file extension: .gz -> gzip, .zst -> zstd"""
+    if path.endswith('.gz'):
+        return 'gzip'
+    if path.endswith('.zst'):
+        return 'zstd'
+    return None
+
+
+def open_jsonl(path, mode, compression=None):
+    """Open a (possibly compressed) JSON Lines file in text mode"""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd compression needs the 'zstandard' package: pip install zstandard")
+        return zstandard.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class JsonlRecords:
+    """Re-iterable view of the records in a JSON Lines file
+
+    Every iteration streams the file from the start, so it can stand in
+    for the results list in reports and comparisons without loading the
+    whole crawl into memory.
+    """
+
+    def __init__(self, path, compression=None):
+        self.path = path
+        self.compression = compression or infer_compression(path)
+
+    def __iter__(self):
+        with open_jsonl(self.path, 'r', self.compression) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def __len__(self):
+        with open_jsonl(self.path, 'r', self.compression) as f:
+            return sum(1 for line in f if line.strip())
+
+
+def read_jsonl(path, compression=None):
+    """Records written by a JsonlResultSink, read back lazily"""
+    return JsonlRecords(path, compression)
+
+
+def export_json(records, path):
+    """Write records as an indented JSON array, one record in memory at a time
+
+    The output matches json.dump(list(records), f, indent=2, ensure_ascii=False).
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for record in records:
+            f.write(',\n  ' if count else '\n  ')
+            f.write(json.dumps(record, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+            count += 1
+        f.write('\n]' if count else ']')
+
+
+class JsonlResultSink:
+    """Append-only JSON Lines writer for crawl records
+
+    The crawler writes each record as soon as it is produced. Site-level
+    keywords are only known once the crawl ends; apply_keywords() then
+    rewrites the file in one streaming pass to fill them in.
+    """
+
+    def __init__(self, path, compression=None):
+        self.path = path
+        self.compression = compression or infer_compression(path)
+        self._file = None
+        self.written = 0
+
+    def open(self, keep=0):
+        """Start writing; keep > 0 continues after the first keep records of an earlier run"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        if keep and os.path.exists(self.path):
+            # Drop anything written after the checkpoint we are resuming from
+            self._rewrite(lambda index, record: record, limit=keep)
+            self._file = open_jsonl(self.path, 'a', self.compression)
+        else:
+            self._file = open_jsonl(self.path, 'w', self.compression)
+        self.written = keep
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.written += 1
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def apply_keywords(self, words_by_index):
+        """Set important_words on the records at the given indexes"""
+        if not words_by_index:
+            return
+        was_open = self._file is not None
+        self.close()
+
+        def update(index, record):
+            if index in words_by_index:
+                record["data"]["important_words"] = words_by_index[index]
+            return record
+
+        self._rewrite(update)
+        if was_open:
+            self._file = open_jsonl(self.path, 'a', self.compression)
+
+    def _rewrite(self, update, limit=None):
+        """Stream records through update(index, record) into a new copy of the file
+
+        Only the first limit records are kept when limit is given. A file
+        cut short by a crash is read up to where it was last flushed.
+        """
+        temp_path = f"{self.path}.tmp"
+        with open_jsonl(self.path, 'r', self.compression) as source, \
+                open_jsonl(temp_path, 'w', self.compression) as target:
+            index = 0
+            try:
+                for line in source:
+                    if limit is not None and index >= limit:
+                        break
+                    if line.strip():
+                        record = update(index, json.loads(line))
+                        target.write(json.dumps(record, ensure_ascii=False) + '\n')
+                        index += 1
+            except EOFError:
+                # Compressed stream without its end marker
+                pass
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def records(self):
+        """Read what has been written so far"""
+        self.flush()
+        return JsonlRecords(self.path, self.compression)
+
+
+class FanOutSink:
+    """Result sink that forwards every record to several sinks
+
+    records() and written come from the first sink, so put the one the
+    caller reads back from first.
+    """
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    @property
+    def written(self):
+        return self.sinks[0].written
+
+    def open(self, keep=0):
+        for sink in self.sinks:
+            sink.open(keep)
+
+    def write(self, record):
+        for sink in self.sinks:
+            sink.write(record)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def apply_keywords(self, words_by_index):
+        for sink in self.sinks:
+            sink.apply_keywords(words_by_index)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def records(self):
+        return self.sinks[0].records()
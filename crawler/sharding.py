@@ -0,0 +1,267 @@
+import multiprocessing
+import os
+import queue
+import sys
+import zlib
+from collections import deque
+
+from .corpus_keywords import SiteKeywordIndex
+from .playwright_crawler import RecursiveWebCrawler
+from .url_normalizer import canonicalize_url, DEFAULT_TRACKING_PARAMS
+
+
+def shard_for(url, shards):
+    """Shard that owns a canonical URL; stable across processes and runs"""
+    # hash() is salted per process, so it cannot be used to route URLs
+    return zlib.crc32(url.encode('utf-8')) % shards
+
+
+def default_shards():
+    """One browser process per two cores; each also runs Chromium's own processes"""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+class ShardFrontier:
+    """Frontier for one shard process
+
+    Discovered URLs are reported to the coordinator, which owns the global
+    visited set and routes each new URL to the shard that owns it. This
+    shard's own URLs arrive on inbox; None means the crawl is over.
+    """
+
+    def __init__(self, inbox, outbox):
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stopped = False
+        self._queue = deque()
+        # URLs this shard already reported, to save IPC round-trips
+        self._reported = set()
+
+    def push(self, url, depth, key=None):
+        """Report a URL to the coordinator unless this shard already did"""
+        key = key or url
+        if key in self._reported:
+            return False
+        self._reported.add(key)
+        self.outbox.put(("discovered", url, depth))
+        return True
+
+    def pop(self):
+        self._drain()
+        return self._queue.popleft()
+
+    def more_expected(self):
+        self._drain()
+        return not self.stopped
+
+    def _drain(self):
+        """Move whatever the coordinator has sent into the local queue"""
+        while True:
+            try:
+                item = self.inbox.get_nowait()
+            except queue.Empty:
+                return
+            if item is None:
+                self.stopped = True
+            else:
+                self._queue.append(item)
+
+    def __contains__(self, url):
+        return url in self._reported
+
+    def __len__(self):
+        self._drain()
+        return len(self._queue)
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+class _ShardCrawler(RecursiveWebCrawler):
+    """RecursiveWebCrawler that streams each page's records to the coordinator"""
+
+    def __init__(self, shard, outbox, **kwargs):
+        super().__init__(**kwargs)
+        self.shard = shard
+        self.outbox = outbox
+
+    async def _queue_start(self, start_url):
+        # The coordinator already queued the start page and the sitemap seeds
+        pass
+
+    def _track_keywords(self, record, index):
+        # keyword_text stays in the record; the coordinator fits site
+        # keywords once across every shard's pages
+        pass
+
+    def _finish_page(self, url, records):
+        super()._finish_page(url, records)
+        self._page_done()
+
+    def _page_done(self):
+        """Stream the records of the page that just finished to the coordinator"""
+        # The coordinator keeps them from here on, so the shard's memory stays flat
+        records, self.results = self.results, []
+        self.outbox.put(("page_done", self.shard, records))
+
+
+def _run_shard(shard, inbox, outbox, start_url, crawler_options):
+    """Entry point of a shard process"""
+    crawler = _ShardCrawler(shard, outbox, frontier=ShardFrontier(inbox, outbox),
+                            max_pages=sys.maxsize, **crawler_options)
+    try:
+        crawler.crawl_website(start_url)
+    finally:
+        outbox.put(("shard_stats", shard, crawler.crawl_stats()))
+
+
+class ShardedCrawler:
+    """Spreads a crawl over several processes, each with its own browser
+
+    The frontier is sharded by a stable hash of the canonical URL. This
+    process is the coordinator: it keeps the visited set, routes newly
+    discovered URLs to their shard over multiprocessing queues and merges
+    the records the shards stream back. max_pages bounds the number of
+    pages crawled across all shards; click records do not count towards
+    it. With a result_sink, records are written in arrival order as shards
+    report them instead of being held until the end. Options not listed
+    here are passed to each shard's RecursiveWebCrawler.
+    """
+
+    def __init__(self, shards=None, max_depth=3, max_pages=50, keyword_mode="site",
+                 parse_workers=0, start_method="spawn", result_sink=None, **crawler_options):
+        self.shards = shards or default_shards()
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.keyword_mode = keyword_mode
+        self.start_method = start_method
+        self.result_sink = result_sink
+        # Each shard already has a core to itself, so parse inline by default
+        self.crawler_options = dict(crawler_options, max_depth=max_depth, keyword_mode=keyword_mode,
+                                    parse_workers=parse_workers)
+        self.tracking_params = crawler_options.get('tracking_params', DEFAULT_TRACKING_PARAMS)
+        self._reset()
+
+    def _reset(self):
+        self.visited_urls = set()
+        self.results = []
+        self.shard_results = [[] for _ in range(self.shards)]
+        self.pages_per_shard = [0] * self.shards
+        self.site_keywords = SiteKeywordIndex(spool=self.result_sink is not None)
+        self.shard_stats = {}
+        self.inboxes = []
+        self.dispatched = 0
+        self.completed = 0
+
+    def crawl_website(self, start_url):
+        """Crawl start_url across all shards and return the merged records"""
+        self._reset()
+        if self.result_sink is not None:
+            self.result_sink.open()
+        seeder = self.crawler_options.get('seeder')
+        # Discover before the shards start so they inherit the robots.txt rules
+        seeds = seeder.discover(start_url) if seeder is not None else []
+        ctx = multiprocessing.get_context(self.start_method)
+        outbox = ctx.Queue()
+        self.inboxes = [ctx.Queue() for _ in range(self.shards)]
+        processes = [
+            ctx.Process(target=_run_shard,
+                        args=(shard, self.inboxes[shard], outbox, start_url, self.crawler_options))
+            for shard in range(self.shards)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            if seeder is None or seeder.allowed(start_url):
+                self._dispatch(start_url, 0)
+            else:
+                print(f"Start URL {start_url} is disallowed by robots.txt")
+            for entry in seeds:
+                self._dispatch(entry.get("loc", entry["url"]), 1)
+            while self.completed < self.dispatched:
+                try:
+                    message = outbox.get(timeout=1)
+                except queue.Empty:
+                    if not all(process.is_alive() for process in processes):
+                        print("A crawl shard exited unexpectedly; keeping the partial results")
+                        break
+                    continue
+                self._handle(message)
+        finally:
+            for inbox in self.inboxes:
+                inbox.put(None)
+
+        # Each live shard reports its counters on the way out
+        while len(self.shard_stats) < sum(process.is_alive() for process in processes):
+            try:
+                self._handle(outbox.get(timeout=5))
+            except queue.Empty:
+                break
+        for process in processes:
+            process.join()
+
+        return self._merge()
+
+    def _dispatch(self, url, depth):
+        """Send a URL to its shard if it is new, within depth and within budget
+
+        The canonical URL decides identity and shard; the shard is sent the
+        URL as found, which is the address it loads.
+        """
+        key = canonicalize_url(url, tracking_params=self.tracking_params)
+        if key in self.visited_urls or depth > self.max_depth or self.dispatched >= self.max_pages:
+            return False
+        self.visited_urls.add(key)
+        self.inboxes[shard_for(key, self.shards)].put((url, depth))
+        self.dispatched += 1
+        return True
+
+    def _handle(self, message):
+        kind, *payload = message
+        if kind == "discovered":
+            self._dispatch(*payload)
+        elif kind == "page_done":
+            shard, records = payload
+            self.completed += 1
+            self.pages_per_shard[shard] += sum(
+                1 for record in records if record.get("action", "").startswith(("Loaded", "Failed to crawl"))
+            )
+            if self.result_sink is None:
+                self.shard_results[shard].extend(records)
+                return
+            for record in records:
+                self._track_keywords(record, self.result_sink.written)
+                self.result_sink.write(record)
+        elif kind == "shard_stats":
+            shard, stats = payload
+            self.shard_stats[shard] = stats
+
+    def _track_keywords(self, record, index):
+        """Move a record's keyword text into the site keyword index"""
+        data = record.get("data")
+        if isinstance(data, dict) and "keyword_text" in data:
+            text = data.pop("keyword_text")
+            if self.keyword_mode == "site":
+                self.site_keywords.add(None if self.result_sink else data, text, index)
+
+    def _merge(self):
+        """Concatenate shard records by shard and fit site keywords across all of them"""
+        if self.result_sink is not None:
+            self.result_sink.apply_keywords(self.site_keywords.apply())
+            self.result_sink.close()
+            return self.result_sink.records()
+
+        self.results = [record for records in self.shard_results for record in records]
+        for index, record in enumerate(self.results):
+            self._track_keywords(record, index)
+        self.site_keywords.apply()
+        return self.results
+
+    def crawl_stats(self):
+        """Per-shard counters plus how the pages were spread over shards"""
+        return {
+            "pages_dispatched": self.dispatched,
+            "pages_per_shard": self.pages_per_shard,
+            "shards": [self.shard_stats.get(shard) for shard in range(self.shards)]
+        }
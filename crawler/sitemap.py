@@ -0,0 +1,159 @@
+import xml.etree.ElementTree as ET
+import zlib
+from urllib import robotparser
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from .url_normalizer import canonicalize_url
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _local(tag):
+    """Tag name without its XML namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_sitemap(stream, chunk_size=64 * 1024):
+    """Yield ("url", entry) and ("sitemap", loc) items from a sitemap or sitemap index
+
+    stream is a binary file object, gzip compressed or not. It is read and
+    decompressed in chunks and fed to an incremental XML parser; each
+    element is cleared once read, so large sitemaps are never held in
+    memory whole.
+    """
+    parser = ET.XMLPullParser(events=('end',))
+    decompressor = None
+    first = True
+    while True:
+        chunk = stream.read(chunk_size)
+        if first and chunk[:2] == GZIP_MAGIC:
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        first = False
+        if not chunk:
+            break
+        parser.feed(decompressor.decompress(chunk) if decompressor else chunk)
+        yield from _sitemap_items(parser)
+    parser.close()
+    yield from _sitemap_items(parser)
+
+
+def _sitemap_items(parser):
+    for _, element in parser.read_events():
+        kind = _local(element.tag)
+        if kind not in ('url', 'sitemap'):
+            continue
+        fields = {_local(child.tag): (child.text or '').strip() for child in element}
+        element.clear()
+        if not fields.get('loc'):
+            continue
+        if kind == 'sitemap':
+            yield "sitemap", fields['loc']
+            continue
+        try:
+            priority = float(fields['priority']) if fields.get('priority') else 0.5
+        except ValueError:
+            priority = 0.5
+        yield "url", {"url": fields['loc'], "priority": priority, "lastmod": fields.get('lastmod') or None}
+
+
+class SitemapSeeder:
+    """Pre-crawl discovery from robots.txt and sitemaps over plain HTTP
+
+    discover() reads robots.txt, follows the sitemaps it lists (or
+    /sitemap.xml when it lists none) including nested sitemap indexes, and
+    returns the same-site URLs robots.txt allows, highest priority and most
+    recently modified first. The parsed robots rules are kept in .robots and
+    the entries in .entries, keyed by URL, so the crawler can honour the
+    rules for links it finds later and tag pages with their lastmod.
+    """
+
+    def __init__(self, session=None, user_agent='*', max_urls=10000, max_sitemaps=50, timeout=10):
+        self.session = session or requests.Session()
+        self.user_agent = user_agent
+        self.max_urls = max_urls
+        self.max_sitemaps = max_sitemaps
+        self.timeout = timeout
+        self.robots = None
+        self.entries = {}
+        self.stats = {"sitemaps": 0, "urls": 0, "disallowed": 0, "failed_sitemaps": 0}
+
+    def fetch_robots(self, start_url):
+        """Parse the site's robots.txt; a missing file allows everything"""
+        robots_url = urljoin(start_url, '/robots.txt')
+        robots = robotparser.RobotFileParser(robots_url)
+        try:
+            response = self.session.get(robots_url, timeout=self.timeout)
+            if response.status_code in (401, 403):
+                robots.disallow_all = True
+            elif response.status_code < 400:
+                robots.parse(response.text.splitlines())
+            else:
+                robots.allow_all = True
+        except requests.RequestException as e:
+            print(f"Could not fetch {robots_url}: {e}")
+            robots.allow_all = True
+        self.robots = robots
+        return robots
+
+    def robots_for(self, start_url):
+        """The robots rules of start_url's site, fetched unless they already are"""
+        if self.robots is not None and self.robots.url == urljoin(start_url, '/robots.txt'):
+            return self.robots
+        return self.fetch_robots(start_url)
+
+    def allowed(self, url):
+        return self.robots is None or self.robots.can_fetch(self.user_agent, url)
+
+    def discover(self, start_url):
+        """Sitemap entries for start_url's site, as {"url", "priority", "lastmod"} dicts"""
+        robots = self.robots_for(start_url)
+        pending = list(robots.site_maps() or []) or [urljoin(start_url, '/sitemap.xml')]
+        host = urlparse(start_url).netloc.lower()
+        seen_sitemaps = set()
+        entries = {}
+
+        while pending and len(seen_sitemaps) < self.max_sitemaps and len(entries) < self.max_urls:
+            sitemap_url = pending.pop(0)
+            if sitemap_url in seen_sitemaps:
+                continue
+            seen_sitemaps.add(sitemap_url)
+            try:
+                for kind, item in self._read_sitemap(sitemap_url):
+                    if kind == "sitemap":
+                        pending.append(item)
+                        continue
+                    loc = urljoin(sitemap_url, item["url"])
+                    url = canonicalize_url(loc)
+                    if urlparse(url).netloc.lower() != host or url in entries:
+                        continue
+                    if not self.allowed(loc):
+                        self.stats["disallowed"] += 1
+                        continue
+                    # url is the identity key; loc is the address as listed, which is loaded
+                    entries[url] = dict(item, url=url, loc=loc)
+                    if len(entries) >= self.max_urls:
+                        break
+            except (requests.RequestException, ET.ParseError, zlib.error) as e:
+                self.stats["failed_sitemaps"] += 1
+                print(f"Could not read sitemap {sitemap_url}: {e}")
+
+        self.entries = entries
+        self.stats["sitemaps"] = len(seen_sitemaps)
+        self.stats["urls"] = len(entries)
+        # lastmod is ISO 8601, so string order is date order
+        newest_first = sorted(entries.values(), key=lambda entry: entry["lastmod"] or '', reverse=True)
+        return sorted(newest_first, key=lambda entry: entry["priority"], reverse=True)
+
+    def _read_sitemap(self, sitemap_url):
+        response = self.session.get(sitemap_url, timeout=self.timeout, stream=True)
+        try:
+            if response.status_code >= 400:
+                raise requests.RequestException(f"HTTP {response.status_code}")
+            # Let urllib3 undo Content-Encoding; a .xml.gz body stays gzip and
+            # is detected by iter_sitemap
+            response.raw.decode_content = True
+            yield from iter_sitemap(response.raw)
+        finally:
+            response.close()
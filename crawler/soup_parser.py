@@ -2,7 +2,21 @@ from bs4 import BeautifulSoup
 from sklearn.feature_extraction.text import TfidfVectorizer
 import re
 
-def parse_html(html):
+SOCIAL_PLATFORMS = ['facebook', 'twitter', 'instagram', 'linkedin', 'youtube']
+
+# Parser backends selectable with parse_html(html, backend=...)
+PARSER_BACKENDS = ('bs4', 'lxml')
+
+def parse_html(html, backend="bs4", keywords=True):
+    # With keywords=False the per-page TF-IDF fit is skipped and the cleaned
+    # text is returned as "keyword_text" for corpus-level keyword extraction
+    if backend == "lxml":
+        # Single-pass lxml walk producing the same dict
+        from .lxml_parser import parse_html_lxml
+        return parse_html_lxml(html, keywords=keywords)
+    if backend != "bs4":
+        raise ValueError(f"Unknown parser backend: {backend}")
+
     soup = BeautifulSoup(html, "lxml")
 
     # Remove script and style elements
@@ -15,11 +29,6 @@ def parse_html(html):
 
     # Get all visible text for word count and analysis
     visible_text = soup.get_text()
-    words = visible_text.split()
-    word_count = len(words)
-    
-    # Extract important keywords using TF-IDF
-    important_words = extract_keywords(visible_text)
     
     # Extract meta information
     meta_description = ""
@@ -75,26 +84,59 @@ def parse_html(html):
             'items': list_items[:10]  # Limit to first 10 items
         })
 
-    # Extract all text content for analysis
-    all_text = soup.get_text()
-    sentences = [s.strip() for s in all_text.split('.') if s.strip()]
-    
     # Extract social media links
     social_links = []
     for link in soup.find_all('a', href=True):
-        href = link['href']
-        if any(social in href.lower() for social in ['facebook', 'twitter', 'instagram', 'linkedin', 'youtube']):
+        platform = _social_platform(link['href'])
+        if platform:
             social_links.append({
-                'platform': next(social for social in ['facebook', 'twitter', 'instagram', 'linkedin', 'youtube'] if social in href.lower()),
-                'url': href
+                'platform': platform,
+                'url': link['href']
             })
 
-    return {
+    return _assemble_result(
+        headings=headings,
+        paragraphs=paragraphs,
+        links=links,
+        visible_text=visible_text,
+        title=soup.title.string if soup.title else "No title",
+        meta_description=meta_description,
+        forms_data=forms_data,
+        images_data=images_data,
+        tables_data=tables_data,
+        lists_data=lists_data,
+        social_links=social_links,
+        keywords=keywords,
+        page_structure={
+            "has_navigation": bool(soup.find('nav')),
+            "has_footer": bool(soup.find('footer')),
+            "has_header": bool(soup.find('header')),
+            "has_main": bool(soup.find('main')),
+            "has_aside": bool(soup.find('aside'))
+        }
+    )
+
+def _social_platform(href):
+    """Name of the social network an href points to, if any"""
+    href = href.lower()
+    return next((social for social in SOCIAL_PLATFORMS if social in href), None)
+
+def _assemble_result(headings, paragraphs, links, visible_text, title, meta_description,
+                     forms_data, images_data, tables_data, lists_data, social_links,
+                     page_structure, keywords=True):
+    """Build parse_html's output dict; shared by every parser backend"""
+    # Extract all text content for analysis
+    sentences = [s.strip() for s in visible_text.split('.') if s.strip()]
+
+    # Extract important keywords using TF-IDF
+    important_words = extract_keywords(visible_text) if keywords else []
+
+    result = {
         "headings": headings[:10],
         "paragraphs": paragraphs[:5],
         "links": links[:20],
-        "word_count": word_count,
-        "title": soup.title.string if soup.title else "No title",
+        "word_count": len(visible_text.split()),
+        "title": title,
         "meta_description": meta_description,
         "important_words": important_words[:15],
         "text_content": visible_text[:1000] + "..." if len(visible_text) > 1000 else visible_text,
@@ -113,28 +155,29 @@ def parse_html(html):
             "tables": len(tables_data),
             "lists": len(lists_data)
         },
-        "page_structure": {
-            "has_navigation": bool(soup.find('nav')),
-            "has_footer": bool(soup.find('footer')),
-            "has_header": bool(soup.find('header')),
-            "has_main": bool(soup.find('main')),
-            "has_aside": bool(soup.find('aside'))
-        }
+        "page_structure": page_structure
     }
+    if not keywords:
+        result["keyword_text"] = keyword_text(visible_text)
+    return result
+
+def keyword_text(text):
+    """Lowercased text with punctuation and words of 3 letters or fewer removed"""
+    cleaned_text = re.sub(r'[^\w\s]', ' ', text.lower())
+    return ' '.join(word for word in cleaned_text.split() if len(word) > 3)
 
 def extract_keywords(text, max_features=20):
     """Extract important keywords using TF-IDF"""
     try:
         # Clean and prepare text
-        cleaned_text = re.sub(r'[^\w\s]', ' ', text.lower())
-        words = [word for word in cleaned_text.split() if len(word) > 3]
+        words = keyword_text(text)
         
         if not words:
             return []
             
         # Use TF-IDF to find important terms
         vectorizer = TfidfVectorizer(max_features=max_features, stop_words='english')
-        tfidf_matrix = vectorizer.fit_transform([' '.join(words)])
+        tfidf_matrix = vectorizer.fit_transform([words])
         feature_names = vectorizer.get_feature_names_out()
         
         # Get top terms by TF-IDF scores
@@ -0,0 +1,78 @@
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only carry campaign/click tracking and never change
+# the page that is served. Entries ending in "_" are matched as prefixes.
+DEFAULT_TRACKING_PARAMS = (
+    'utm_',
+    'gclid',
+    'dclid',
+    'fbclid',
+    'msclkid',
+    'mc_cid',
+    'mc_eid',
+    '_ga',
+    '_gl',
+    'yclid',
+    'igshid',
+)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def _is_tracking_param(name, tracking_params):
+    name = name.lower()
+    for param in tracking_params:
+        if param.endswith('_') and name.startswith(param):
+            return True
+        if name == param:
+            return True
+    return False
+
+
+def canonicalize_url(url, tracking_params=DEFAULT_TRACKING_PARAMS, strip_trailing_slash=True):
+    """Reduce a URL to the canonical form used to decide if two links are the same page
+
+    Strips the fragment, lowercases scheme and host, drops default ports,
+    removes tracking parameters, sorts the query string and (optionally)
+    drops the trailing slash of non-root paths. Non-HTTP URLs such as
+    mailto: or javascript: are returned unchanged.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.netloc:
+        return url
+
+    host = (parts.hostname or '').rstrip('.')
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+
+    netloc = host
+    if ':' in host:
+        # IPv6 literal
+        netloc = f'[{host}]'
+    if port and port != DEFAULT_PORTS[scheme]:
+        netloc += f':{port}'
+    if parts.username:
+        userinfo = parts.username
+        if parts.password:
+            userinfo += f':{parts.password}'
+        netloc = f'{userinfo}@{netloc}'
+
+    path = parts.path or '/'
+    if strip_trailing_slash and len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/') or '/'
+
+    query_pairs = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name, tracking_params)
+    ]
+    query = urlencode(sorted(query_pairs))
+
+    return urlunsplit((scheme, netloc, path, query, ''))
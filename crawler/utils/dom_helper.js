@@ -1,9 +1,122 @@
-(() => {
-  const elements = document.querySelectorAll("button, a, [role='button']");
-  return Array.from(elements).map(el => ({
-    text: el.innerText || el.ariaLabel || "Unnamed",
-    tag: el.tagName,
-    href: el.href || null,
-    type: el.type || null
-  }));
-})();
+// Single-pass page extraction, evaluated once per page by crawler/extraction.py.
+// Returns page metadata, links, clickable elements and (optionally) the
+// serialized HTML in one round-trip instead of one call per piece.
+(options = {}) => {
+  const {
+    metadata = true,
+    links = true,
+    clickables = true,
+    html = true
+  } = options;
+
+  const result = {};
+
+  if (metadata) {
+    result.metadata = {
+      document_title: document.title,
+      document_url: document.URL,
+      document_referrer: document.referrer,
+      document_domain: document.domain,
+      window_location: {
+        href: window.location.href,
+        protocol: window.location.protocol,
+        host: window.location.host,
+        pathname: window.location.pathname,
+        search: window.location.search,
+        hash: window.location.hash
+      },
+      page_ready_state: document.readyState,
+      user_agent: navigator.userAgent,
+      language: navigator.language,
+      cookie_enabled: navigator.cookieEnabled,
+      on_line: navigator.onLine,
+      screen_resolution: {
+        width: screen.width,
+        height: screen.height
+      },
+      window_size: {
+        width: window.innerWidth,
+        height: window.innerHeight
+      },
+      forms_count: document.forms.length,
+      images_count: document.images.length,
+      scripts_count: document.scripts.length,
+      stylesheets_count: document.styleSheets.length,
+      meta_tags: Array.from(document.querySelectorAll('meta')).map(meta => ({
+        name: meta.name,
+        content: meta.content,
+        property: meta.property,
+        charset: meta.charset
+      }))
+    };
+  }
+
+  if (links) {
+    result.links = Array.from(document.querySelectorAll('a[href]'))
+      .map(link => ({
+        href: link.href,
+        text: link.innerText.trim(),
+        title: link.title
+      }))
+      .filter(link => link.href && link.href !== window.location.href);
+  }
+
+  if (clickables) {
+    const selectors = [
+      'button:not([disabled])',
+      'a:not([href^="#"]):not([href="javascript:void(0)"])',
+      '[role="button"]:not([disabled])',
+      '[onclick]',
+      'input[type="button"]:not([disabled])',
+      'input[type="submit"]:not([disabled])',
+      '.btn:not([disabled])',
+      '.button:not([disabled])'
+    ];
+
+    // Each clickable is tagged with a page-unique data-crawler-id so the
+    // crawler can click it through a direct attribute selector. Ids survive
+    // repeated extractions on the same document.
+    const seen = new Set();
+    window.__crawlerNextId = window.__crawlerNextId || 0;
+    const elements = [];
+    selectors.forEach(selector => {
+      document.querySelectorAll(selector).forEach(el => {
+        if (el.offsetParent !== null && !seen.has(el)) { // Check if visible
+          seen.add(el);
+          let crawlerId = el.getAttribute('data-crawler-id');
+          if (crawlerId === null) {
+            crawlerId = String(window.__crawlerNextId++);
+            el.setAttribute('data-crawler-id', crawlerId);
+          }
+          elements.push({
+            crawler_id: crawlerId,
+            selector: `[data-crawler-id="${crawlerId}"]`,
+            tag: el.tagName,
+            text: el.innerText?.trim() || el.value || el.getAttribute('aria-label') || 'Unnamed',
+            type: el.type || '',
+            href: el.href || '',
+            onclick: el.onclick ? 'has_onclick' : '',
+            role: el.getAttribute('role') || '',
+            // Markup that usually means a script handles the click
+            scripted: [
+              'aria-haspopup', 'aria-expanded', 'aria-controls',
+              'data-toggle', 'data-bs-toggle', 'data-action'
+            ].some(name => el.hasAttribute(name)),
+            id: el.id || '',
+            className: el.className || ''
+          });
+        }
+      });
+    });
+    result.clickables = elements;
+  }
+
+  if (html) {
+    const doctype = document.doctype
+      ? new XMLSerializer().serializeToString(document.doctype)
+      : '';
+    result.html = doctype + document.documentElement.outerHTML;
+  }
+
+  return result;
+}
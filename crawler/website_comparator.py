@@ -1,14 +1,37 @@
 from .soup_parser import parse_html
 from .playwright_crawler import RecursiveWebCrawler
+from .url_normalizer import canonicalize_url
+from .resource_policy import ResourceBlockingPolicy
+from .result_sink import JsonlResultSink, FanOutSink
+from .crawl_store import CrawlStoreSink, page_links
+from .sitemap import SitemapSeeder
+import asyncio
+import os
 import time
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urljoin
 import json
 
 class WebsiteComparator:
-    def __init__(self, max_depth=2, max_pages=30, delay=0):
+    def __init__(self, max_depth=2, max_pages=30, delay=0, concurrency=4, block_resources=False,
+                 readiness=None, parse_workers=None, results_dir=None, store=None, politeness=None,
+                 seed_sitemaps=False):
         self.max_depth = max_depth
         self.max_pages = max_pages
         self.delay = delay
+        self.concurrency = concurrency
+        self.block_resources = block_resources
+        self.readiness = readiness
+        self.parse_workers = parse_workers
+        # One PolitenessScheduler for both crawls; its limits are per host
+        self.politeness = politeness
+        self.seed_sitemaps = seed_sitemaps
+        # When set, each crawl streams its logs to websiteN_logs.jsonl there
+        # and the logs are read back from disk instead of held in memory
+        self.results_dir = results_dir
+        # When set (a CrawlStore), both crawls are also written to the crawl
+        # database and links and errors are counted by querying it
+        self.store = store
+        self.crawl_ids = {}
         self.website1_data = {}
         self.website2_data = {}
         self.comparison_results = {}
@@ -17,18 +40,11 @@ class WebsiteComparator:
         """Compare two websites comprehensively"""
         print(f"Starting comparison between {url1} and {url2}")
         
-        # Crawl both websites
-        print("\nCrawling Website 1...")
-        crawler1 = RecursiveWebCrawler(self.max_depth, self.max_pages, self.delay)
-        website1_logs = crawler1.crawl_website(url1)
-        
-        print("\nCrawling Website 2...")
-        crawler2 = RecursiveWebCrawler(self.max_depth, self.max_pages, self.delay)
-        website2_logs = crawler2.crawl_website(url2)
-        
-        # Process and analyze data
-        self.website1_data = self._process_website_data(website1_logs, url1)
-        self.website2_data = self._process_website_data(website2_logs, url2)
+        # Crawl both websites at once, each in its own browser with its own
+        # page budget; whichever finishes first is processed straight away
+        (website1_logs, self.website1_data), (website2_logs, self.website2_data) = asyncio.run(
+            self._crawl_both(url1, url2)
+        )
         
         # Generate comparison
         self.comparison_results = self._generate_comparison()
@@ -38,11 +54,45 @@ class WebsiteComparator:
             "website2": self.website2_data,
             "comparison": self.comparison_results,
             "website1_logs": website1_logs,
-            "website2_logs": website2_logs
+            "website2_logs": website2_logs,
+            "crawl_ids": dict(self.crawl_ids)
         }
 
-    def _process_website_data(self, logs, base_url):
-        """Process raw crawl logs into structured data"""
+    async def _crawl_both(self, url1, url2):
+        """Run both crawls concurrently in one event loop"""
+        return await asyncio.gather(self._crawl_and_process("website1", url1),
+                                    self._crawl_and_process("website2", url2))
+
+    async def _crawl_and_process(self, name, url):
+        """Crawl one site, then process its logs without waiting for the other site"""
+        print(f"\nCrawling {name}: {url}")
+        crawler = self._create_crawler(name, url)
+        logs = await crawler.crawl_website_async(url)
+        print(f"\nFinished crawling {name}, processing its data")
+        return logs, self._process_website_data(logs, url, self.crawl_ids.get(name))
+
+    def _create_crawler(self, name="website", start_url=None):
+        """Build a crawler for one side of the comparison"""
+        # Each crawl gets its own policy since it tracks the first-party domain
+        resource_policy = ResourceBlockingPolicy() if self.block_resources else None
+        result_sink = None
+        if self.results_dir:
+            result_sink = JsonlResultSink(os.path.join(self.results_dir, f"{name}_logs.jsonl"))
+        if self.store is not None:
+            store_sink = CrawlStoreSink(self.store, start_url=start_url)
+            store_sink.open()
+            self.crawl_ids[name] = store_sink.crawl_id
+            result_sink = FanOutSink(result_sink, store_sink) if result_sink else store_sink
+        return RecursiveWebCrawler(self.max_depth, self.max_pages, self.delay, self.concurrency,
+                                   resource_policy=resource_policy, readiness=self.readiness,
+                                   parse_workers=self.parse_workers, politeness=self.politeness,
+                                   seeder=SitemapSeeder() if self.seed_sitemaps else None,
+                                   result_sink=result_sink,
+                                   keep_results=result_sink is None)
+
+    def _process_website_data(self, logs, base_url, crawl_id=None):
+        """Process raw crawl logs into structured data; crawl_id reads links and errors from the store"""
+        from_store = self.store is not None and crawl_id is not None
         data = {
             "base_url": base_url,
             "domain": urlparse(base_url).netloc,
@@ -76,9 +126,13 @@ class WebsiteComparator:
                 if page_data.get("title"):
                     data["page_titles"].add(page_data["title"])
                 
-                # Collect all links
-                if page_data.get("links"):
-                    data["all_links"].update(page_data["links"])
+                # Collect all links, resolved against the page so that
+                # /a, /a/ and /a#top on different pages count once
+                if not from_store:
+                    page_url = log.get("url", base_url)
+                    data["all_links"].update(
+                        canonicalize_url(urljoin(page_url, link)) for link in page_links(log)
+                    )
                 
                 # Collect forms
                 if page_data.get("forms"):
@@ -131,7 +185,7 @@ class WebsiteComparator:
                     "url": log.get("url", ""),
                     "title": page_data.get("title", ""),
                     "word_count": page_data.get("word_count", 0),
-                    "links_count": len(page_data.get("links", [])),
+                    "links_count": len(page_links(log)),
                     "images_count": len(page_data.get("images", [])),
                     "forms_count": len(page_data.get("forms", [])),
                     "headings": page_data.get("headings", []),
@@ -139,13 +193,17 @@ class WebsiteComparator:
                 })
             
             # Collect errors
-            if "error" in log:
+            if "error" in log and not from_store:
                 data["errors"].append({
                     "url": log.get("url", ""),
                     "error": log["error"],
                     "action": log.get("action", "")
                 })
         
+        if from_store:
+            data["all_links"] = self.store.link_targets(crawl_id)
+            data["errors"] = self.store.errors(crawl_id)
+        
         # Convert sets to lists for JSON serialization
         data["all_links"] = list(data["all_links"])
         data["unique_keywords"] = list(data["unique_keywords"])
@@ -1,12 +1,30 @@
-from crawler.playwright_crawler import crawl_website
+from crawler.playwright_crawler import RecursiveWebCrawler
 from crawler.report_generator import generate_report
 from crawler.website_comparator import WebsiteComparator
 from crawler.comparison_report_generator import ComparisonReportGenerator
+from crawler.resource_policy import ResourceBlockingPolicy
+from crawler.readiness import ReadinessPolicy
+from crawler.politeness import PolitenessScheduler
+from crawler.sitemap import SitemapSeeder
+from crawler.http_fetch import HttpFetcher
+from crawler.http_cache import HttpCache
+from crawler.parse_pool import default_parse_workers
+from crawler.sharding import ShardedCrawler
+from crawler.result_sink import JsonlResultSink, FanOutSink, export_json
+from crawler.crawl_store import CrawlStore, CrawlStoreSink
+from crawler.incremental import CrawlBaseline
+from crawler.columnar_export import export_parquet, export_comparison_parquet
 import json
 import os
 import requests
 from urllib.parse import urljoin, urlparse
 
+CHECKPOINT_PATH = "output/checkpoint.json"
+LOGS_PATH = "output/logs.jsonl"
+STORE_PATH = "output/crawls.db"
+HTTP_CACHE_PATH = "output/http_cache.db"
+DELTA_PATH = "output/delta.json"
+
 def validate_url(url):
     """Validate and normalize URL"""
     if not url.startswith(('http://', 'https://')):
@@ -19,6 +37,35 @@ def validate_url(url):
         print(f"Warning: Could not validate URL {url}: {e}")
         return url, None
 
+def export_parquet_files(export, source, directory):
+    """Write the Parquet tables when pyarrow is installed; returns whether it did"""
+    try:
+        export(source, directory)
+        return True
+    except ImportError as e:
+        print(f"Skipping Parquet export: {e}")
+        return False
+
+def ask_readiness():
+    """Ask how long to wait for each page before extracting it"""
+    choice = input("Page readiness (networkidle/load/domcontentloaded/dom_quiet, "
+                   "default networkidle): ").strip() or "networkidle"
+    try:
+        return ReadinessPolicy(choice)
+    except ValueError:
+        print("Unknown readiness strategy, using networkidle")
+        return ReadinessPolicy()
+
+def ask_politeness():
+    """Ask how fast each host may be crawled; the rate then adapts to the host"""
+    try:
+        rate = float(input("Starting requests/sec per host, adapts to 429s and latency "
+                           "(default 4, 0 = no limit): ") or "4")
+    except ValueError:
+        print("Not a number, using 4 requests/sec")
+        rate = 4
+    return PolitenessScheduler(rate=rate) if rate > 0 else None
+
 def main():
     # Choose mode
     print("Website Crawler - Choose Mode:")
@@ -41,10 +88,25 @@ def crawl_single_website():
     try:
         max_depth = int(input("Max depth (default 3): ") or "3")
         max_pages = int(input("Max pages to crawl (default 50): ") or "50")
+        concurrency = int(input("Concurrent pages (default 4): ") or "4")
+        parse_workers = int(input(f"Parse worker processes (default {default_parse_workers()}, 0 = inline): ")
+                            or str(default_parse_workers()))
+        shards = int(input("Browser processes (default 1, more for large crawls): ") or "1")
         delay = 0  # No delay, we go fast!
     except ValueError:
-        max_depth, max_pages, delay = 3, 50, 0
-        print("Using default values: depth=3, max_pages=50, delay=0 (NO DELAY!)")
+        max_depth, max_pages, concurrency, delay, shards = 3, 50, 4, 0, 1
+        parse_workers = default_parse_workers()
+        print("Using default values: depth=3, max_pages=50, concurrency=4, delay=0 (NO DELAY!)")
+    block_resources = input("Block images, fonts, media and trackers? (Y/n): ").strip().lower() != "n"
+    resource_policy = ResourceBlockingPolicy() if block_resources else None
+    readiness = ask_readiness()
+    politeness = ask_politeness()
+    seed_sitemaps = input("Seed from robots.txt and sitemaps, honouring robots.txt? (Y/n): ").strip().lower() != "n"
+    seeder = SitemapSeeder() if seed_sitemaps else None
+    http_first = input("Fetch static pages over plain HTTP first? (Y/n): ").strip().lower() != "n"
+    # Pages are revalidated against the previous crawls' cached copies
+    os.makedirs("output", exist_ok=True)
+    http_fetcher = HttpFetcher(cache=HttpCache(HTTP_CACHE_PATH)) if http_first else None
     
     # Validate URL
     url, status_code = validate_url(url)
@@ -54,31 +116,100 @@ def crawl_single_website():
     
     # Start crawling
     print(f"\nStarting recursive crawl process...")
-    print(f"Configuration: depth={max_depth}, max_pages={max_pages}, delay={delay}s")
-    logs = crawl_website(url, max_depth=max_depth, max_pages=max_pages, delay=delay)
+    print(f"Configuration: depth={max_depth}, max_pages={max_pages}, concurrency={concurrency}, delay={delay}s")
+    # Records go both to logs.jsonl and to the crawl database, which keeps
+    # the history of every crawl
+    store = CrawlStore(STORE_PATH)
+    store_sink = CrawlStoreSink(store, start_url=url)
+    result_sink = FanOutSink(JsonlResultSink(LOGS_PATH), store_sink)
+    # A finished earlier crawl of this URL lets unchanged pages skip parsing and clicking
+    baseline = None
+    previous_crawl = store.latest_finished_crawl(url)
+    if (shards <= 1 and previous_crawl is not None and
+            input(f"Re-crawl incrementally against crawl #{previous_crawl}, "
+                  "re-processing only changed pages? (Y/n): ").strip().lower() != "n"):
+        baseline = CrawlBaseline.from_store(store, previous_crawl)
+    if shards > 1:
+        # Each process runs its own browser and parses inline
+        crawler = ShardedCrawler(shards=shards, max_depth=max_depth, max_pages=max_pages, delay=delay,
+                                 concurrency=concurrency, resource_policy=resource_policy,
+                                 readiness=readiness, politeness=politeness, seeder=seeder,
+                                 http_fetcher=http_fetcher, result_sink=result_sink)
+    else:
+        crawler = RecursiveWebCrawler(max_depth=max_depth, max_pages=max_pages, delay=delay,
+                                      concurrency=concurrency, resource_policy=resource_policy,
+                                      readiness=readiness, parse_workers=parse_workers,
+                                      politeness=politeness, seeder=seeder, http_fetcher=http_fetcher,
+                                      baseline=baseline, checkpoint_path=CHECKPOINT_PATH,
+                                      result_sink=result_sink, keep_results=False)
+    if (shards <= 1 and os.path.exists(CHECKPOINT_PATH) and
+            input(f"Resume the interrupted crawl saved in {CHECKPOINT_PATH}? (y/N): ").strip().lower() == "y"):
+        logs = crawler.resume()
+    else:
+        logs = crawler.crawl_website(url)
+    stats = crawler.crawl_stats()
 
-    # Save results
-    os.makedirs("output", exist_ok=True)
-    with open("output/logs.json", "w", encoding='utf-8') as f:
-        json.dump(logs, f, indent=2, ensure_ascii=False)
+    # Records were streamed to output/logs.jsonl; logs reads them back from disk
+    export_json(logs, "output/logs.json")
+    parquet_saved = export_parquet_files(export_parquet, logs, "output")
+    delta = crawler.crawl_delta(logs) if baseline is not None else None
+    if delta is not None:
+        with open(DELTA_PATH, "w", encoding="utf-8") as f:
+            json.dump(delta, f, indent=2, ensure_ascii=False)
+    # The crawl finished, so there is nothing left to resume
+    if os.path.exists(CHECKPOINT_PATH):
+        os.remove(CHECKPOINT_PATH)
 
     # Generate report
     generate_report(logs, "output/report.pdf")
     print("\nCrawl complete! Report saved to output/report.pdf")
     
-    # Print comprehensive summary
-    total_actions = len(logs)
-    successful_actions = len([log for log in logs if 'error' not in log])
-    pages_visited = len(set(log.get('url', '') for log in logs))
-    buttons_clicked = len([log for log in logs if 'clicked' in log.get('action', '').lower()])
-    
-    print(f"\nCRAWLING SUMMARY:")
-    print(f"   • Total actions: {total_actions}")
-    print(f"   • Successful actions: {successful_actions}")
-    print(f"   • Pages visited: {pages_visited}")
-    print(f"   • Buttons clicked: {buttons_clicked}")
-    print(f"   • Unique URLs discovered: {len(set(log.get('url', '') for log in logs))}")
-    print(f"   • Files saved: output/logs.json, output/report.pdf")
+    # Print comprehensive summary, counted by the crawl database
+    summary = store.crawl_summary(store_sink.crawl_id)
+    store.close()
+    
+    print(f"\nCRAWLING SUMMARY (crawl #{store_sink.crawl_id} in {STORE_PATH}):")
+    print(f"   • Total actions: {summary['total_actions']}")
+    print(f"   • Successful actions: {summary['total_actions'] - summary['errors']}")
+    print(f"   • Pages visited: {summary['pages_visited']}")
+    print(f"   • Buttons clicked: {summary['buttons_clicked']}")
+    print(f"   • Unique link targets discovered: {summary['link_targets']}")
+    if "resource_blocking" in stats:
+        print(f"   • Requests blocked: {stats['resource_blocking']['blocked']} "
+              f"(allowed: {stats['resource_blocking']['allowed']})")
+    for host, host_stats in stats.get("politeness", {}).items():
+        print(f"   • {host}: {host_stats['rate']} req/s now, {host_stats['throttled']} throttled responses, "
+              f"{host_stats['slowdowns']} latency slowdowns, {host_stats['failures']} failures")
+    if "http_fast_path" in stats:
+        fast_path = stats["http_fast_path"]
+        print(f"   • Pages served over plain HTTP: {fast_path['http_only']}/{fast_path['pages']} "
+              f"(escalated to the browser: {fast_path['escalation_ratio']:.0%}, "
+              f"reasons: {fast_path['escalation_reasons']})")
+        cache = fast_path["cache"]
+        print(f"   • HTTP cache: {cache['hits']} not modified, {cache['misses']} downloaded "
+              f"(hit rate {cache['hit_rate']:.0%}, {cache['parse_hits']} parses reused, "
+              f"{cache['evictions']} evicted)")
+    if delta is not None:
+        pages = delta["pages"]
+        print(f"   • Since crawl #{delta['previous_crawl_id']}: {len(pages['new'])} new, "
+              f"{len(pages['changed'])} changed, {len(pages['removed'])} removed, "
+              f"{pages['unchanged']} unchanged pages (carried forward: {stats['incremental']['unchanged']})")
+        print(f"   • Links: {len(delta['links']['added'])} added, {len(delta['links']['removed'])} removed "
+              f"(details in {DELTA_PATH})")
+    if "pages_per_shard" in stats:
+        print(f"   • Pages per browser process: {stats['pages_per_shard']}")
+    else:
+        print(f"   • Parse cache hit rate: {stats['parse_cache']['hit_rate']:.0%} "
+              f"({stats['parse_cache']['hits']} hits, {stats['parse_cache']['misses']} misses)")
+        print(f"   • Clicks per second: {stats['clicks']['clicks_per_second']} "
+              f"({stats['clicks']['restore_failures']} failed page restores)")
+        print(f"   • Link clicks skipped (already queued): {stats['clicks']['skipped_navigations']}")
+    print(f"   • Files saved: {LOGS_PATH}, {STORE_PATH}, output/logs.json, output/report.pdf")
+    if http_fetcher is not None:
+        http_fetcher.cache.close()
+        print(f"   • HTTP cache: {HTTP_CACHE_PATH}")
+    if parquet_saved:
+        print("   • Parquet tables: output/pages.parquet, output/links.parquet, output/clickables.parquet")
 
 def compare_websites():
     """Compare two websites"""
@@ -94,10 +225,18 @@ def compare_websites():
     try:
         max_depth = int(input("Max depth for each site (default 2): ") or "2")
         max_pages = int(input("Max pages per site (default 30): ") or "30")
+        concurrency = int(input("Concurrent pages per site (default 4): ") or "4")
+        parse_workers = int(input(f"Parse worker processes per site (default {default_parse_workers()}, 0 = inline): ")
+                            or str(default_parse_workers()))
         delay = 0  # No delay, we go fast!
     except ValueError:
-        max_depth, max_pages, delay = 2, 30, 0
-        print("Using default values: depth=2, max_pages=30, delay=0 (NO DELAY!)")
+        max_depth, max_pages, concurrency, delay = 2, 30, 4, 0
+        parse_workers = default_parse_workers()
+        print("Using default values: depth=2, max_pages=30, concurrency=4, delay=0 (NO DELAY!)")
+    block_resources = input("Block images, fonts, media and trackers? (Y/n): ").strip().lower() != "n"
+    readiness = ask_readiness()
+    politeness = ask_politeness()
+    seed_sitemaps = input("Seed from robots.txt and sitemaps, honouring robots.txt? (Y/n): ").strip().lower() != "n"
     
     # Validate URLs
     url1, status1 = validate_url(url1)
@@ -112,24 +251,31 @@ def compare_websites():
     
     # Start comparison
     print(f"\nStarting website comparison...")
-    print(f"Configuration: depth={max_depth}, max_pages={max_pages}, delay={delay}s")
+    print(f"Configuration: depth={max_depth}, max_pages={max_pages}, concurrency={concurrency}, delay={delay}s")
     
-    comparator = WebsiteComparator(max_depth=max_depth, max_pages=max_pages, delay=delay)
-    comparison_data = comparator.compare_websites(url1, url2)
-    
-    # Save results
     os.makedirs("output", exist_ok=True)
+    store = CrawlStore(STORE_PATH)
+    comparator = WebsiteComparator(max_depth=max_depth, max_pages=max_pages, delay=delay,
+                                   concurrency=concurrency, block_resources=block_resources,
+                                   readiness=readiness, parse_workers=parse_workers,
+                                   politeness=politeness, seed_sitemaps=seed_sitemaps,
+                                   results_dir="output", store=store)
+    comparison_data = comparator.compare_websites(url1, url2)
+    store.close()
     
-    # Save detailed comparison data
+    # Save detailed comparison data; the crawl logs are referenced by file
+    # rather than embedded, since they were streamed to disk
     with open("output/comparison_data.json", "w", encoding='utf-8') as f:
-        json.dump(comparison_data, f, indent=2, ensure_ascii=False)
+        json.dump({
+            **comparison_data,
+            "website1_logs": comparison_data["website1_logs"].path,
+            "website2_logs": comparison_data["website2_logs"].path
+        }, f, indent=2, ensure_ascii=False)
     
     # Save individual website logs
-    with open("output/website1_logs.json", "w", encoding='utf-8') as f:
-        json.dump(comparison_data["website1_logs"], f, indent=2, ensure_ascii=False)
-    
-    with open("output/website2_logs.json", "w", encoding='utf-8') as f:
-        json.dump(comparison_data["website2_logs"], f, indent=2, ensure_ascii=False)
+    export_json(comparison_data["website1_logs"], "output/website1_logs.json")
+    export_json(comparison_data["website2_logs"], "output/website2_logs.json")
+    parquet_saved = export_parquet_files(export_comparison_parquet, comparison_data, "output")
     
     # Generate comparison report
     report_generator = ComparisonReportGenerator()
@@ -140,6 +286,10 @@ def compare_websites():
     print("   • output/comparison_data.json - Detailed comparison data")
     print("   • output/website1_logs.json - Website 1 crawl logs")
     print("   • output/website2_logs.json - Website 2 crawl logs")
+    if parquet_saved:
+        print("   • output/website1_*.parquet, output/website2_*.parquet - Pages, links and clickables tables")
+    print(f"   • {STORE_PATH} - Crawl database (crawls {comparison_data['crawl_ids']['website1']} "
+          f"and {comparison_data['crawl_ids']['website2']})")
     
     # Print comparison summary
     comparison = comparison_data["comparison"]
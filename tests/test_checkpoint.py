@@ -0,0 +1,105 @@
+import asyncio
+import json
+import os
+import pytest
+from crawler.checkpoint import load_checkpoint, save_checkpoint
+from crawler.frontier import URLFrontier
+from crawler.playwright_crawler import RecursiveWebCrawler
+
+def test_save_and_load_round_trip(tmp_path):
+    """Test a checkpoint reads back as written and leaves no temp file"""
+    path = tmp_path / "crawl" / "checkpoint.json"
+
+    save_checkpoint(str(path), {"results": [{"url": "https://example.com/"}]})
+
+    assert load_checkpoint(str(path))["results"] == [{"url": "https://example.com/"}]
+    assert os.listdir(path.parent) == ["checkpoint.json"]
+
+def test_unknown_version_rejected(tmp_path):
+    """Test checkpoints from another format version are not loaded"""
+    path = tmp_path / "checkpoint.json"
+    path.write_text(json.dumps({"version": 99}))
+
+    with pytest.raises(ValueError):
+        load_checkpoint(str(path))
+
+def test_frontier_snapshot_restore():
+    """Test the frontier keeps its order and seen set across a snapshot"""
+    frontier = URLFrontier()
+    frontier.push("https://example.com/a", 1)
+    frontier.push("https://example.com/b", 2)
+    frontier.pop()
+
+    restored = URLFrontier()
+    restored.restore(json.loads(json.dumps(frontier.snapshot())))
+
+    assert restored.pop() == ("https://example.com/b", 2)
+    assert "https://example.com/a" in restored
+    assert not restored.push("https://example.com/a", 1)
+
+def test_crawler_checkpoint_requeues_in_flight_pages(tmp_path):
+    """Test pages interrupted mid-crawl are queued again on resume"""
+    path = str(tmp_path / "checkpoint.json")
+    crawler = RecursiveWebCrawler(checkpoint_path=path)
+    crawler.start_url = "https://example.com/"
+    crawler.visited_urls = {"https://example.com/", "https://example.com/slow"}
+    crawler.visited_buttons = {"BUTTON_Done_submit", "BUTTON_Half_submit"}
+    crawler._in_flight = {"https://example.com/slow": ("https://example.com/slow/", 1)}
+    crawler._in_flight_buttons = {"https://example.com/slow": {"BUTTON_Half_submit"}}
+    crawler.pages_to_visit.push("https://example.com/next", 1)
+    page = {"title": "Home"}
+    crawler.results = [{"action": "Loaded page (depth 0)", "data": page}]
+    crawler.result_count = 1
+    crawler.site_keywords.add(page, "home page words", 0)
+
+    crawler._write_checkpoint()
+    resumed = RecursiveWebCrawler()
+    resumed._restore_checkpoint(load_checkpoint(path))
+
+    assert resumed.visited_urls == {"https://example.com/"}
+    assert resumed.visited_buttons == {"BUTTON_Done_submit"}
+    assert resumed.pages_to_visit.pop() == ("https://example.com/slow/", 1)
+    assert resumed.pages_to_visit.pop() == ("https://example.com/next", 1)
+    assert len(resumed.site_keywords) == 1
+    resumed.site_keywords.apply()
+    assert resumed.results[0]["data"]["important_words"]
+
+def test_checkpoint_leaves_out_records_of_in_flight_pages(tmp_path):
+    """Test a page that already emitted its record is checkpointed as queued, not as crawled"""
+    path = str(tmp_path / "checkpoint.json")
+    crawler = RecursiveWebCrawler(checkpoint_path=path, parse_workers=0)
+    crawler.start_url = "https://example.com/"
+    crawler.pages_to_visit.push("https://example.com/slow", 1)
+
+    async def crawl_page_http(url, depth, href=None):
+        crawler._emit({"action": "Loaded page (depth 1)", "url": url, "depth": depth})
+        # Another worker checkpoints while this page is still clicking
+        crawler._write_checkpoint()
+        return True
+
+    crawler._crawl_page_http = crawl_page_http
+    asyncio.run(crawler._crawl_worker(None))
+
+    state = load_checkpoint(path)
+    assert state["results"] == [] and state["result_count"] == 0
+    assert state["frontier"]["queue"] == [["https://example.com/slow", 1]]
+    assert [record["url"] for record in crawler.results] == ["https://example.com/slow"]
+    assert crawler._in_flight == {}
+
+def test_streamed_crawl_checkpoint_refers_to_keyword_spool(tmp_path):
+    """Test a checkpoint records the keyword spool's length instead of copying its texts"""
+    path = str(tmp_path / "checkpoint.json")
+    crawler = RecursiveWebCrawler(checkpoint_path=path, keep_results=False)
+    crawler.start_url = "https://example.com/"
+    crawler.result_count = 1
+    crawler.site_keywords.add(None, "home page words", 0)
+
+    crawler._write_checkpoint()
+    state = load_checkpoint(path)
+
+    assert "pending_keywords" not in state
+    assert state["keyword_spool"]["path"] == f"{path}.keywords"
+    assert state["keyword_spool"]["record_indexes"] == [0]
+    resumed = RecursiveWebCrawler(keep_results=False)
+    resumed._restore_checkpoint(state)
+    assert list(resumed.site_keywords.apply()) == [0]
@@ -0,0 +1,127 @@
+import asyncio
+from crawler.click_exploration import ClickStats, is_plain_navigation, restore_page
+from crawler.playwright_crawler import RecursiveWebCrawler
+from crawler.politeness import PolitenessScheduler
+from crawler.readiness import ReadinessPolicy
+
+class FakePage:
+    """Just enough of a Playwright page for restore_page"""
+
+    def __init__(self, url, history=(), back_works=True):
+        self.url = url
+        self.history = list(history)
+        self.back_works = back_works
+        self.gotos = []
+
+    async def go_back(self, **kwargs):
+        if self.back_works and self.history:
+            self.url = self.history.pop()
+
+    async def goto(self, url, **kwargs):
+        self.gotos.append(url)
+        self.url = url
+
+def test_restore_prefers_back_navigation():
+    """Test going back avoids reloading the page"""
+    page = FakePage("https://example.com/next", history=["https://example.com/"])
+
+    method = asyncio.run(restore_page(page, "https://example.com/", ReadinessPolicy("load"), str))
+
+    assert method == "back"
+    assert page.gotos == []
+
+def test_restore_falls_back_to_reload():
+    """Test a failed go_back reloads the original URL"""
+    page = FakePage("https://example.com/next", back_works=False)
+
+    method = asyncio.run(restore_page(page, "https://example.com/", ReadinessPolicy("load"), str))
+
+    assert method == "reload"
+    assert page.gotos == ["https://example.com/"]
+
+def test_reload_mode_skips_back():
+    """Test reload mode navigates even when history is available"""
+    page = FakePage("https://example.com/next", history=["https://example.com/"])
+
+    method = asyncio.run(restore_page(page, "https://example.com/", ReadinessPolicy("load"), str,
+                                      mode="reload"))
+
+    assert method == "reload"
+    assert page.history == ["https://example.com/"]
+
+def test_restore_goes_through_politeness():
+    """Test go_back and the reload are both counted against the host's limits"""
+    page = FakePage("https://example.com/next", back_works=False)
+    politeness = PolitenessScheduler()
+
+    method = asyncio.run(restore_page(page, "https://example.com/", ReadinessPolicy("load"), str,
+                                      politeness=politeness))
+
+    assert method == "reload"
+    assert politeness.stats()["example.com"]["requests"] == 2
+
+def test_click_stats_throughput():
+    """Test clicks per second counts click and restore time"""
+    stats = ClickStats()
+    stats.clicks = 10
+    stats.click_time = 1.5
+    stats.restore_time = 0.5
+    stats.restored["back"] = 3
+
+    summary = stats.stats()
+
+    assert summary["clicks_per_second"] == 5.0
+    assert summary["restored"] == {"back": 3, "reload": 0}
+    assert ClickStats().stats()["clicks_per_second"] == 0.0
+
+def test_wall_clock_throughput_with_parallel_pages():
+    """Test parallel pages raise wall-clock clicks per second above per-page throughput"""
+    stats = ClickStats()
+    stats.clicks = 20
+    stats.click_time = 4.0
+    stats.exploration_time = 1.0
+
+    summary = stats.stats()
+
+    assert summary["clicks_per_second"] == 5.0
+    assert summary["wall_clicks_per_second"] == 20.0
+
+def test_plain_links_are_left_to_link_following():
+    """Test ordinary anchors are classified as plain navigations"""
+    link = {"tag": "A", "href": "https://example.com/about", "onclick": "", "role": "", "scripted": False}
+
+    assert is_plain_navigation(link)
+    assert is_plain_navigation(dict(link, href="https://other.com/"))
+
+def test_interactive_elements_are_still_clicked():
+    """Test buttons, scripted anchors and non-http links are not skipped"""
+    link = {"tag": "A", "href": "https://example.com/about", "onclick": "", "role": "", "scripted": False}
+
+    assert not is_plain_navigation(dict(link, tag="BUTTON", href=""))
+    assert not is_plain_navigation(dict(link, onclick="has_onclick"))
+    assert not is_plain_navigation(dict(link, role="button"))
+    assert not is_plain_navigation(dict(link, scripted=True))
+    assert not is_plain_navigation(dict(link, href="javascript:openMenu()"))
+    assert not is_plain_navigation(dict(link, href="mailto:team@example.com"))
+
+def test_only_queued_links_are_left_unclicked():
+    """Test plain links are clicked when link following did not queue them: off-site or past max_depth"""
+    crawler = RecursiveWebCrawler(max_depth=1)
+    crawler._follow_links([{"href": "/a"}], "https://example.com/", 0)
+    clicked = []
+
+    async def explore(page, origin_url, url, depth, items, state_hash=None):
+        clicked.extend(clickable["text"] for _, clickable in items)
+        return []
+
+    class Page:
+        url = "https://example.com/a"
+
+    crawler._explore_clicks = explore
+    links = [{"tag": "A", "text": text, "type": "", "href": href} for text, href in
+             [("A", "https://example.com/a#top"), ("Partner", "https://partner.net/x"),
+              ("Deep", "https://example.com/deep")]]
+    asyncio.run(crawler._click_all_buttons(Page(), "https://example.com/a", 1, links))
+
+    assert clicked == ["Partner", "Deep"]
+    assert crawler.click_stats.skipped_navigations == 1
@@ -0,0 +1,50 @@
+import pytest
+from crawler.columnar_export import export_comparison_parquet, export_parquet, flatten_records
+
+RECORDS = [
+    {"action": "Loaded page (depth 0)", "url": "https://example.com/", "depth": 0,
+     "readiness": {"strategy": "load", "wait_time": 0.5, "condition_met": True},
+     "data": {"title": "Home", "word_count": 10, "links": ["/a", "/a#top"],
+              "total_elements": {"headings": 2, "links": 2}, "page_structure": {"has_navigation": True}}},
+    {"action": "Clicked 'Menu' - No content change", "url": "https://example.com/", "depth": 0,
+     "clicked_element": {"tag": "button", "text": "Menu", "selector": "[data-crawler-id=\"1\"]"},
+     "click_time": 0.1, "unchanged": True},
+    {"action": "Failed to crawl page (depth 1)", "url": "https://example.com/b", "depth": 1,
+     "error": "Timeout", "readiness": {"wait_time": 30.0}}
+]
+
+def test_flatten_records_splits_tables():
+    """Test records become flat page, link and clickable rows"""
+    rows = list(flatten_records(RECORDS))
+
+    assert [table for table, row in rows] == ["pages", "links", "links", "clickables", "pages"]
+    page = rows[0][1]
+    assert page["total_elements.headings"] == 2 and page["total_elements.forms"] is None
+    assert page["page_structure.has_navigation"] is True
+    assert page["wait_time"] == 0.5 and page["readiness_strategy"] == "load"
+    assert rows[1][1]["target_url"] == rows[2][1]["target_url"] == "https://example.com/a"
+    assert rows[3][1]["outcome"] == "unchanged"
+    assert rows[4][1]["error"] == "Timeout"
+
+def test_export_parquet_writes_dictionary_encoded_tables(tmp_path):
+    """Test each table round-trips through Parquet with URLs dictionary encoded"""
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    paths = export_parquet(iter(RECORDS), str(tmp_path), batch_size=1)
+
+    pages = pq.read_table(paths["pages"])
+    assert pages.column("url").to_pylist() == ["https://example.com/", "https://example.com/b"]
+    assert pa.types.is_dictionary(pages.schema.field("url").type)
+    assert pages.column("wait_time").to_pylist() == [0.5, 30.0]
+    assert pq.read_table(paths["links"]).num_rows == 2
+    assert pq.read_table(paths["clickables"]).column("tag").to_pylist() == ["button"]
+
+def test_export_comparison_parquet_prefixes_sites(tmp_path):
+    """Test a comparison result exports one set of tables per website"""
+    pytest.importorskip("pyarrow")
+
+    paths = export_comparison_parquet({"website1_logs": RECORDS, "website2_logs": []}, str(tmp_path))
+
+    assert paths["website1"]["pages"].endswith("website1_pages.parquet")
+    assert (tmp_path / "website2_clickables.parquet").exists()
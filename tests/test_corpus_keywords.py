@@ -0,0 +1,64 @@
+import pytest
+from crawler.corpus_keywords import extract_corpus_keywords, SiteKeywordIndex
+from crawler.soup_parser import keyword_text, parse_html
+
+def test_corpus_idf_ranks_shared_terms_last():
+    """Test terms on every page rank below terms specific to one page"""
+    documents = [
+        keyword_text("Crawler pricing pricing plans"),
+        keyword_text("Crawler support tickets tickets"),
+        keyword_text("Crawler careers hiring")
+    ]
+    
+    keywords = extract_corpus_keywords(documents)
+    
+    assert keywords[0][0] == "pricing"
+    assert keywords[1][0] == "tickets"
+    assert keywords[0][-1] == "crawler"
+    assert all("crawler" in page for page in keywords)
+
+def test_corpus_keywords_empty_documents():
+    """Test empty and stop-word-only pages get no keywords"""
+    assert extract_corpus_keywords([]) == []
+    assert extract_corpus_keywords(["", ""]) == [[], []]
+    assert extract_corpus_keywords([keyword_text("this that with from")]) == [[]]
+    assert extract_corpus_keywords(["", keyword_text("python crawler")])[0] == []
+
+def test_corpus_keywords_top_n():
+    """Test the number of terms per page is capped"""
+    text = keyword_text(" ".join(f"term{i}word" for i in range(40)))
+    
+    assert len(extract_corpus_keywords([text], top_n=5)[0]) == 5
+
+def test_site_keyword_index_fills_page_data():
+    """Test deferred keywords are written back into each page's data"""
+    index = SiteKeywordIndex()
+    pages = []
+    for html in ["<p>Python tutorials tutorials</p>", "<p>Python recipes recipes</p>"]:
+        data = parse_html(html, keywords=False)
+        assert data["important_words"] == []
+        index.add(data, data.pop("keyword_text"))
+        pages.append(data)
+    
+    index.apply()
+    
+    assert pages[0]["important_words"][0] == "tutorials"
+    assert pages[1]["important_words"][0] == "recipes"
+    assert len(index) == 0
+
+def test_persistent_spool_resumes_from_its_length(tmp_path):
+    """Test a restored spool drops texts written after its state was taken"""
+    path = str(tmp_path / "checkpoint.json.keywords")
+    index = SiteKeywordIndex(spool_path=path)
+    index.add(None, "python tutorials tutorials", 0)
+    index.add(None, "python recipes recipes", 1)
+    state = index.spool_state()
+    index.add(None, "python lost lost", 2)
+
+    restored = SiteKeywordIndex()
+    restored.restore_spool(state)
+
+    words = restored.apply()
+    assert list(words) == [0, 1]
+    assert words[0][0] == "tutorials" and words[1][0] == "recipes"
+    assert not (tmp_path / "checkpoint.json.keywords").exists()
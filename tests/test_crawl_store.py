@@ -0,0 +1,137 @@
+from crawler.crawl_store import CrawlStore, CrawlStoreSink, click_outcome
+from crawler.result_sink import FanOutSink, JsonlResultSink, read_jsonl
+from crawler.website_comparator import WebsiteComparator
+
+RECORDS = [
+    {"action": "Loaded page (depth 0)", "url": "https://example.com/", "depth": 0,
+     "readiness": {"wait_time": 0.5},
+     "data": {"title": "Home", "word_count": 10, "links": ["/a", "/a#top", "mailto:hi@example.com"],
+              "images": [{}], "forms": [], "content_hash": "h0"}},
+    {"action": "Clicked 'Menu' - No content change", "url": "https://example.com/", "depth": 0,
+     "clicked_element": {"tag": "button", "text": "Menu"}, "click_time": 0.1, "unchanged": True},
+    {"action": "Clicked 'About' - Navigated to new page", "url": "https://example.com/about",
+     "previous_url": "https://example.com/", "depth": 0, "clicked_element": {"tag": "div", "text": "About"},
+     "click_time": 0.2, "data": {"title": "About", "word_count": 5, "links": []}},
+    {"action": "Failed to click button: Buy", "url": "https://example.com/", "depth": 0,
+     "error": "Element not found", "click_time": 0.3},
+    {"action": "Loaded page (depth 1)", "url": "https://example.com/a", "depth": 1,
+     "data": {"title": "A", "word_count": 7, "links": ["/"]}}
+]
+
+def write_crawl(store, records=RECORDS, start_url="https://example.com/"):
+    sink = CrawlStoreSink(store, start_url=start_url)
+    sink.open()
+    for record in records:
+        sink.write(record)
+    return sink
+
+def test_records_are_normalized_into_tables(tmp_path):
+    """Test pages, links, clicks and errors rows are derived from the records"""
+    store = CrawlStore(str(tmp_path / "crawls.db"), batch_size=2)
+    sink = write_crawl(store)
+
+    pages = store.pages(sink.crawl_id)
+    assert [page["url"] for page in pages] == ["https://example.com/", "https://example.com/about",
+                                               "https://example.com/a"]
+    assert pages[0]["links_count"] == 3 and pages[0]["wait_time"] == 0.5
+    assert [page["url"] for page in store.pages(sink.crawl_id, depth=1)] == ["https://example.com/a"]
+    assert store.link_targets(sink.crawl_id) == {"https://example.com/a", "https://example.com/",
+                                                 "mailto:hi@example.com"}
+    assert store.errors(sink.crawl_id) == [{"url": "https://example.com/", "action": "Failed to click button: Buy",
+                                            "error": "Element not found"}]
+    assert store.crawl_summary(sink.crawl_id) == {
+        "total_actions": 5, "errors": 1, "pages_visited": 3, "buttons_clicked": 2,
+        "total_words": 22, "link_targets": 3
+    }
+    assert list(sink.records()) == RECORDS
+    assert len(sink.records()) == 5
+
+def test_links_come_from_the_full_link_list(tmp_path):
+    """Test link edges use record["links"], not parse_html's first 20"""
+    links = [f"/p{i}" for i in range(25)]
+    record = {"action": "Loaded page (depth 0)", "url": "https://example.com/", "depth": 0,
+              "links": links, "data": {"title": "Home", "links": links[:20]}}
+    store = CrawlStore(str(tmp_path / "crawls.db"))
+    sink = write_crawl(store, records=[record])
+    store.flush()
+
+    assert store.pages(sink.crawl_id)[0]["links_count"] == 25
+    assert len(store.link_targets(sink.crawl_id)) == 25
+
+def test_click_outcome():
+    """Test click records are classified by what the click did"""
+    assert [click_outcome(record) for record in RECORDS[1:4]] == ["unchanged", "navigated", "failed"]
+    assert click_outcome({"action": "Clicked 'Tab' - Content changed"}) == "content_changed"
+
+def test_keywords_are_applied_and_crawl_finished(tmp_path):
+    """Test apply_keywords updates stored records and closes the crawl"""
+    store = CrawlStore(str(tmp_path / "crawls.db"))
+    sink = write_crawl(store)
+    assert store.latest_unfinished_crawl() == sink.crawl_id
+
+    sink.apply_keywords({0: ["home", "welcome"], 4: ["home"]})
+    sink.close()
+
+    records = list(sink.records())
+    assert records[0]["data"]["important_words"] == ["home", "welcome"]
+    assert records[4]["data"]["important_words"] == ["home"]
+    assert store.top_keywords(sink.crawl_id) == [("home", 2), ("welcome", 1)]
+    assert store.latest_unfinished_crawl() is None
+    assert store.crawls()[0]["finished_at"] is not None
+
+def test_resume_continues_unfinished_crawl(tmp_path):
+    """Test open(keep) reuses the interrupted crawl and drops rows past the checkpoint"""
+    store = CrawlStore(str(tmp_path / "crawls.db"))
+    first = write_crawl(store)
+    first.close()
+
+    resumed = CrawlStoreSink(store)
+    resumed.open(keep=2)
+    resumed.write(RECORDS[4])
+
+    assert resumed.crawl_id == first.crawl_id
+    assert list(resumed.records()) == [RECORDS[0], RECORDS[1], RECORDS[4]]
+    assert len(store.crawls()) == 1
+
+def test_crawls_are_kept_as_history(tmp_path):
+    """Test each crawl gets its own id and rows in the same database"""
+    path = str(tmp_path / "crawls.db")
+    store = CrawlStore(path)
+    first = write_crawl(store)
+    first.apply_keywords({})
+    store.close()
+
+    store = CrawlStore(path)
+    second = write_crawl(store, RECORDS[:1], start_url="https://example.org/")
+
+    assert second.crawl_id != first.crawl_id
+    assert [crawl["start_url"] for crawl in store.crawls()] == ["https://example.org/", "https://example.com/"]
+    assert len(store.records(first.crawl_id)) == 5
+    assert len(store.records(second.crawl_id)) == 1
+
+def test_fan_out_sink_writes_jsonl_and_store(tmp_path):
+    """Test one crawl can stream to a JSONL file and the crawl database at once"""
+    store = CrawlStore(str(tmp_path / "crawls.db"))
+    store_sink = CrawlStoreSink(store)
+    sink = FanOutSink(JsonlResultSink(str(tmp_path / "logs.jsonl")), store_sink)
+    sink.open()
+    for record in RECORDS:
+        sink.write(record)
+    sink.apply_keywords({4: ["alpha"]})
+    sink.close()
+
+    assert sink.written == 5
+    assert list(sink.records()) == list(store_sink.records())
+    assert list(read_jsonl(str(tmp_path / "logs.jsonl")))[4]["data"]["important_words"] == ["alpha"]
+
+def test_comparator_reads_links_and_errors_from_store(tmp_path):
+    """Test a comparator with a store counts links and errors by querying it"""
+    store = CrawlStore(str(tmp_path / "crawls.db"))
+    sink = write_crawl(store)
+
+    comparator = WebsiteComparator(store=store)
+    result = comparator._process_website_data(sink.records(), "https://example.com", sink.crawl_id)
+
+    assert sorted(result["all_links"]) == sorted(store.link_targets(sink.crawl_id))
+    assert result["errors"] == store.errors(sink.crawl_id)
+    assert result["total_word_count"] == 22
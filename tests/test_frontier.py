@@ -0,0 +1,35 @@
+import pytest
+from crawler.frontier import URLFrontier
+
+def test_frontier_fifo_order():
+    """Test URLs come out in the order they were queued"""
+    frontier = URLFrontier()
+    frontier.push("https://example.com/a", 1)
+    frontier.push("https://example.com/b", 1)
+    
+    assert frontier.pop() == ("https://example.com/a", 1)
+    assert frontier.pop() == ("https://example.com/b", 1)
+    assert not frontier
+
+def test_frontier_dedup_at_enqueue():
+    """Test a URL is only queued once no matter how often it is linked"""
+    frontier = URLFrontier()
+    
+    assert frontier.push("https://example.com/a", 1) == True
+    assert frontier.push("https://example.com/a", 2) == False
+    assert len(frontier) == 1
+    
+    # Still deduplicated after it has been dequeued
+    frontier.pop()
+    assert frontier.push("https://example.com/a", 1) == False
+    assert len(frontier) == 0
+
+def test_frontier_dedupes_by_key_and_keeps_url():
+    """Test URLs are deduplicated by their key but queued as given"""
+    frontier = URLFrontier()
+
+    assert frontier.push("https://example.com/docs/", 1, key="https://example.com/docs")
+    assert not frontier.push("https://example.com/docs", 1, key="https://example.com/docs")
+
+    assert frontier.pop() == ("https://example.com/docs/", 1)
+    assert "https://example.com/docs" in frontier
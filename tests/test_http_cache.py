@@ -0,0 +1,108 @@
+import os
+import asyncio
+from crawler.http_cache import HttpCache
+from crawler.http_fetch import HttpFetcher
+from crawler.playwright_crawler import RecursiveWebCrawler
+
+PAGE = "<html><head><title>Cached</title></head><body><p>" + " ".join(["text"] * 40) + "</p></body></html>"
+
+class FakeResponse:
+    def __init__(self, url, status_code=200, text="", headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = {"content-type": "text/html", **(headers or {})}
+
+class ETagServer:
+    """Serves PAGE with an ETag and answers matching If-None-Match with 304"""
+    headers = {}
+
+    def __init__(self, etag='"v1"'):
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.requests.append(dict(headers or {}))
+        if headers and headers.get("If-None-Match") == self.etag:
+            return FakeResponse(url, 304)
+        return FakeResponse(url, text=PAGE, headers={"etag": self.etag})
+
+def test_revalidation_serves_cached_body(tmp_path):
+    """Test a second fetch sends If-None-Match and a 304 returns the stored body"""
+    server = ETagServer()
+    fetcher = HttpFetcher(session=server, cache=HttpCache(str(tmp_path / "cache.db")))
+
+    first = fetcher.fetch("https://example.com/")
+    second = fetcher.fetch("https://example.com/")
+
+    assert server.requests == [{}, {"If-None-Match": '"v1"'}]
+    assert second.text == first.text == PAGE
+    assert second.from_cache and second.status_code == 200
+    assert fetcher.cache.stats()["hits"] == 1 and fetcher.cache.stats()["misses"] == 1
+
+def test_changed_page_replaces_entry(tmp_path):
+    """Test a 200 for a changed page replaces the cached validators"""
+    cache = HttpCache(str(tmp_path / "cache.db"))
+    server = ETagServer()
+    fetcher = HttpFetcher(session=server, cache=cache)
+    fetcher.fetch("https://example.com/")
+
+    server.etag = '"v2"'
+    response = fetcher.fetch("https://example.com/")
+
+    assert not getattr(response, "from_cache", False)
+    assert cache.conditional_headers("https://example.com/") == {"If-None-Match": '"v2"'}
+
+def test_responses_without_validators_are_not_cached(tmp_path):
+    """Test pages with no ETag or Last-Modified are left out of the cache"""
+    cache = HttpCache(str(tmp_path / "cache.db"))
+
+    assert not cache.store("https://example.com/", FakeResponse("https://example.com/", text=PAGE))
+    assert cache.conditional_headers("https://example.com/") == {}
+
+def test_eviction_keeps_cache_within_max_bytes(tmp_path):
+    """Test the least recently used entries are evicted once the cache is over size"""
+    cache = HttpCache(str(tmp_path / "cache.db"), max_bytes=500)
+    for i in range(3):
+        # Random hex compresses to about half its length, so two bodies fit
+        body = os.urandom(200).hex()
+        cache.store(f"https://example.com/{i}", FakeResponse("", text=body, headers={"etag": str(i)}))
+
+    assert cache.total_bytes <= 500
+    assert cache.stats()["evictions"] >= 1
+    assert cache.conditional_headers("https://example.com/0") == {}
+    assert cache.conditional_headers("https://example.com/2") == {"If-None-Match": "2"}
+
+def test_recrawl_reuses_stored_parse(tmp_path):
+    """Test a page revalidated on the next crawl is recorded from the cached parse"""
+    path = str(tmp_path / "cache.db")
+    server = ETagServer()
+    first = RecursiveWebCrawler(parse_workers=0, http_fetcher=HttpFetcher(session=server, cache=HttpCache(path)))
+    asyncio.run(first._crawl_page_http("https://example.com/", 0))
+
+    fetcher = HttpFetcher(session=server, cache=HttpCache(path))
+    second = RecursiveWebCrawler(parse_workers=0, http_fetcher=fetcher)
+    asyncio.run(second._crawl_page_http("https://example.com/", 0))
+
+    record = second.results[0]
+    assert record["fetched_with"] == "http_cache"
+    assert record["data"]["content_hash"] == first.results[0]["data"]["content_hash"]
+    assert second.parse_cache.stats()["misses"] == 0
+    assert fetcher.stats()["cache"]["parse_hits"] == 1
+
+def test_cache_is_keyed_by_canonical_url(tmp_path):
+    """Test a page loaded from a non-canonical href is revalidated and reuses its parse"""
+    path = str(tmp_path / "cache.db")
+    server = ETagServer()
+    href = "https://example.com/docs/?utm_source=x"
+    first = RecursiveWebCrawler(parse_workers=0, http_fetcher=HttpFetcher(session=server, cache=HttpCache(path)))
+    asyncio.run(first._crawl_page_http(first._canonicalize(href), 0, href))
+
+    fetcher = HttpFetcher(session=server, cache=HttpCache(path))
+    second = RecursiveWebCrawler(parse_workers=0, http_fetcher=fetcher)
+    asyncio.run(second._crawl_page_http(second._canonicalize(href), 0, href))
+
+    assert server.requests[-1] == {"If-None-Match": '"v1"'}
+    assert second.results[0]["fetched_with"] == "http_cache"
+    assert fetcher.stats()["cache"]["parse_hits"] == 1
+    assert fetcher.cache.conn.execute("SELECT url FROM responses").fetchall() == [(first._canonicalize(href),)]
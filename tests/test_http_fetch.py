@@ -0,0 +1,97 @@
+import asyncio
+from crawler.http_fetch import HttpFetcher, PageScan, escalation_reason
+from crawler.playwright_crawler import RecursiveWebCrawler
+
+TEXT = "<p>" + " ".join(["word"] * 40) + "</p>"
+
+class FakeResponse:
+    def __init__(self, html, status_code=200, content_type="text/html; charset=utf-8", url="https://example.com/"):
+        self.text = html
+        self.status_code = status_code
+        self.headers = {"content-type": content_type}
+        self.url = url
+
+class FakeSession:
+    headers = {}
+
+    def __init__(self, html):
+        self.html = html
+
+    def get(self, url, timeout=None):
+        return FakeResponse(self.html, url=url)
+
+def scan(html, skip_link_clicks=True):
+    page_scan = PageScan("https://example.com/dir/", skip_link_clicks)
+    page_scan.feed(html)
+    page_scan.close()
+    return page_scan
+
+def test_static_page_needs_no_browser():
+    """Test a server-rendered page with text and plain links stays on the HTTP path"""
+    page_scan = scan(f"<html><body>{TEXT}<a href='/a'>A</a><a href='b'>B</a><a href='#top'>Top</a>"
+                     "<script>var x = 1;</script></body></html>")
+
+    assert escalation_reason(FakeResponse(""), page_scan) is None
+    assert [link["href"] for link in page_scan.links] == ["https://example.com/a", "https://example.com/dir/b",
+                                                         "https://example.com/dir/#top"]
+    assert page_scan.words == 43
+
+def test_escalation_heuristics():
+    """Test JS shells, noscript warnings, thin pages and clickables go to the browser"""
+    ok = FakeResponse("")
+
+    assert escalation_reason(ok, scan(f"{TEXT}<div id='root'></div>")) == "app_root"
+    assert escalation_reason(ok, scan(f"{TEXT}<div id='root'><main>{TEXT}</main></div>")) is None
+    assert escalation_reason(ok, scan(f"{TEXT}<noscript>Please enable JavaScript to continue</noscript>")) == "noscript"
+    assert escalation_reason(ok, scan("<p>Loading...</p><script>" + "x " * 100 + "</script>")) == "empty_body"
+    assert escalation_reason(ok, scan(f"{TEXT}<button>Open menu</button>")) == "clickables"
+    assert escalation_reason(ok, scan(f"{TEXT}<a href='/a' aria-expanded='false'>Menu</a>")) == "clickables"
+    assert escalation_reason(ok, scan(f"{TEXT}<a href='/a'>A</a>", skip_link_clicks=False)) == "clickables"
+    assert escalation_reason(FakeResponse("", status_code=500), scan(TEXT)) == "status"
+    assert escalation_reason(FakeResponse("", content_type="application/pdf"), scan(TEXT)) == "not_html"
+
+def test_links_resolve_against_served_address_and_base():
+    """Test links resolve against response.url after a redirect, and against <base href> when present"""
+    fetcher = HttpFetcher(session=FakeSession(""))
+    redirected = FakeResponse(f"{TEXT}<a href='next'>Next</a>", url="https://example.com/docs/")
+    page_scan, _ = fetcher.scan("https://example.com/docs", redirected)
+    assert [link["href"] for link in page_scan.links] == ["https://example.com/docs/next"]
+
+    page_scan = scan(f"<head><base href='/static/'></head>{TEXT}<a href='a'>A</a>")
+    assert [link["href"] for link in page_scan.links] == ["https://example.com/static/a"]
+
+def test_visited_buttons_do_not_escalate():
+    """Test clickables the crawler already clicked elsewhere keep the page on the HTTP path"""
+    ok = FakeResponse("")
+    page_scan = scan(f"{TEXT}<button>  Open\n menu </button><input type='submit' value='Go'>"
+                     "<div class='btn'><span>Close</span></div>")
+
+    assert page_scan.clickable_ids == ["BUTTON_Open menu_submit", "INPUT_Go_submit", "DIV_Close_"]
+    assert escalation_reason(ok, page_scan, visited_buttons={"BUTTON_Open menu_submit", "INPUT_Go_submit",
+                                                             "DIV_Close_"}) is None
+    assert escalation_reason(ok, page_scan, visited_buttons={"BUTTON_Open menu_submit"}) == "clickables"
+
+def test_crawler_records_http_pages_and_follows_links():
+    """Test a static page is recorded and its links queued without opening a browser page"""
+    fetcher = HttpFetcher(session=FakeSession(f"<html><head><title>Static</title></head><body>{TEXT}"
+                                              "<a href='/next'>Next</a></body></html>"))
+    crawler = RecursiveWebCrawler(parse_workers=0, http_fetcher=fetcher)
+
+    assert asyncio.run(crawler._crawl_page_http("https://example.com/", 0))
+
+    record = crawler.results[0]
+    assert record["fetched_with"] == "http" and record["status"] == 200
+    assert record["data"]["title"] == "Static"
+    assert crawler.pages_to_visit.pop() == ("https://example.com/next", 1)
+    assert fetcher.stats()["escalation_ratio"] == 0.0
+
+def test_crawler_escalates_js_shell():
+    """Test a JS-rendered shell is left to the browser and counted as escalated"""
+    fetcher = HttpFetcher(session=FakeSession("<html><body><div id='app'></div></body></html>"))
+    crawler = RecursiveWebCrawler(parse_workers=0, http_fetcher=fetcher)
+
+    assert not asyncio.run(crawler._crawl_page_http("https://example.com/", 0))
+
+    assert crawler.results == []
+    assert fetcher.stats()["escalation_reasons"] == {"app_root": 1}
+    assert fetcher.stats()["escalation_ratio"] == 1.0
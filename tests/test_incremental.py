@@ -0,0 +1,115 @@
+import asyncio
+from crawler.crawl_store import CrawlStore, CrawlStoreSink
+from crawler.http_fetch import HttpFetcher
+from crawler.incremental import CrawlBaseline, crawl_delta
+from crawler.playwright_crawler import RecursiveWebCrawler
+
+PREVIOUS = [
+    {"action": "Loaded page (depth 0)", "url": "https://example.com/", "depth": 0,
+     "data": {"title": "Home", "links": ["/a", "/b"], "content_hash": "home"}},
+    {"action": "Clicked 'Menu' - No content change", "url": "https://example.com/", "depth": 0,
+     "clicked_element": {"tag": "BUTTON", "text": "Menu", "type": "button"}, "unchanged": True},
+    {"action": "Clicked 'Shop' - Navigated to new page", "url": "https://example.com/shop",
+     "previous_url": "https://example.com/", "depth": 0,
+     "clicked_element": {"tag": "DIV", "text": "Shop", "type": ""}, "data": {"links": []}},
+    {"action": "Loaded page (depth 1)", "url": "https://example.com/b", "depth": 1,
+     "sitemap": {"priority": 0.9, "lastmod": None}, "data": {"title": "B", "links": [], "content_hash": "b"}},
+    {"action": "Loaded page (depth 1)", "url": "https://example.com/a", "depth": 1,
+     "data": {"title": "A", "links": ["/"], "content_hash": "a"}}
+]
+
+def test_baseline_index_and_match():
+    """Test pages are revisited shallowest and highest priority first, and matched by content hash"""
+    baseline = CrawlBaseline(PREVIOUS, crawl_id=1)
+
+    assert baseline.revisit_order() == [("https://example.com/", 0), ("https://example.com/b", 1),
+                                        ("https://example.com/a", 1)]
+    page, clicks = baseline.match("https://example.com/", "home")
+    assert page is PREVIOUS[0] and clicks == PREVIOUS[1:3]
+    assert baseline.match("https://example.com/a", "edited") is None
+    assert baseline.match("https://example.com/c", "c") is None
+    assert baseline.stats() == {"previous_crawl_id": 1, "unchanged": 1, "changed": 1, "new": 1}
+
+def test_baseline_from_store_reads_records_on_demand(tmp_path):
+    """Test a store-backed baseline returns the same records as an in-memory one"""
+    store = CrawlStore(str(tmp_path / "crawls.db"))
+    sink = CrawlStoreSink(store, start_url="https://example.com/")
+    sink.open()
+    for record in PREVIOUS:
+        sink.write(record)
+    sink.apply_keywords({})
+
+    assert store.latest_finished_crawl("https://example.com/") == sink.crawl_id
+    baseline = CrawlBaseline.from_store(store, sink.crawl_id)
+    assert baseline.match("https://example.com/", "home") == (PREVIOUS[0], PREVIOUS[1:3])
+
+def test_crawl_delta():
+    """Test new, changed, removed and unreached pages and link changes are reported"""
+    current = [
+        dict(PREVIOUS[0], data={"links": ["/a", "/c"], "content_hash": "home2"}),
+        {"action": "Loaded page (depth 1)", "url": "https://example.com/c", "depth": 1,
+         "data": {"links": [], "content_hash": "c"}},
+        {"action": "Loaded page (depth 1)", "url": "https://example.com/a", "depth": 1, "status": 404,
+         "data": {"links": [], "content_hash": "gone"}}
+    ]
+
+    delta = crawl_delta(CrawlBaseline(PREVIOUS, crawl_id=1), current, unreached=["https://example.com/b"])
+
+    assert delta["pages"] == {"new": ["https://example.com/c"], "changed": ["https://example.com/"],
+                              "removed": ["https://example.com/a"], "not_revisited": ["https://example.com/b"],
+                              "unchanged": 0}
+    assert delta["links"]["added"] == [{"page_url": "https://example.com/", "target_url": "https://example.com/c"}]
+    assert delta["links"]["removed"] == [
+        {"page_url": "https://example.com/", "target_url": "https://example.com/b"},
+        {"page_url": "https://example.com/a", "target_url": "https://example.com/"}
+    ]
+
+class FakeResponse:
+    status_code = 200
+    headers = {"content-type": "text/html"}
+
+    def __init__(self, url, text):
+        self.url = url
+        self.text = text
+
+class FakeSession:
+    headers = {}
+
+    def __init__(self, html):
+        self.html = html
+
+    def get(self, url, timeout=None):
+        return FakeResponse(url, self.html)
+
+def test_unchanged_page_is_carried_forward():
+    """Test a page with the same HTML re-emits its previous records without a parse"""
+    html = "<html><body><p>" + " ".join(["word"] * 40) + "</p><a href='/next'>Next</a></body></html>"
+    first = RecursiveWebCrawler(parse_workers=0, http_fetcher=HttpFetcher(session=FakeSession(html)))
+    asyncio.run(first._crawl_page_http("https://example.com/", 0))
+
+    baseline = CrawlBaseline(first.results, crawl_id=7)
+    second = RecursiveWebCrawler(parse_workers=0, http_fetcher=HttpFetcher(session=FakeSession(html)),
+                                 baseline=baseline)
+    asyncio.run(second._crawl_page_http("https://example.com/", 0))
+
+    record = second.results[0]
+    assert record["carried_from"] == 7
+    assert record["data"] == first.results[0]["data"]
+    assert second.parse_cache.stats()["misses"] == 0
+    assert second.pages_to_visit.pop() == ("https://example.com/next", 1)
+    assert second.crawl_delta(second.results)["pages"]["unchanged"] == 1
+
+def test_carried_navigating_click_queues_the_loaded_address():
+    """Test a carried-forward click queues the address it loaded, deduplicated by its canonical url"""
+    page = {"action": "Loaded page (depth 0)", "url": "https://example.com/", "depth": 0,
+            "data": {"links": [], "content_hash": "home"}}
+    click = {"action": "Clicked 'Docs' - Navigated to new page", "url": "https://example.com/docs",
+             "previous_url": "https://example.com/", "depth": 0,
+             "clicked_element": {"tag": "DIV", "text": "Docs", "type": ""},
+             "data": {"url": "https://example.com/docs/?utm_source=menu", "links": []}}
+    crawler = RecursiveWebCrawler(baseline=CrawlBaseline([page, click], crawl_id=3))
+
+    crawler._carry_forward(crawler.baseline.match("https://example.com/", "home"), "https://example.com/", 0, {})
+
+    assert crawler.pages_to_visit.pop() == ("https://example.com/docs/?utm_source=menu", 1)
+    assert not crawler._queue("https://example.com/docs", 1)
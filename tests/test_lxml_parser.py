@@ -0,0 +1,137 @@
+import pytest
+from crawler.soup_parser import parse_html
+
+# Documents from test_soup_parser.py plus the markup edge cases the
+# single-pass walk has to mirror BeautifulSoup on
+PARITY_DOCUMENTS = {
+    "basic": """
+    <html>
+        <head>
+            <title>Test Page</title>
+            <meta name="description" content="Test description">
+        </head>
+        <body>
+            <h1>Main Heading</h1>
+            <h2>Sub Heading</h2>
+            <p>This is a test paragraph with some content.</p>
+            <a href="https://example.com">Link 1</a>
+            <a href="/internal">Link 2</a>
+            <img src="image.jpg" alt="Test Image">
+            <form action="/submit" method="post">
+                <input type="text" name="username">
+                <input type="password" name="password">
+            </form>
+        </body>
+    </html>
+    """,
+    "navigation": """
+    <html>
+        <body>
+            <header><h1>Header</h1></header>
+            <nav><a href="/home">Home</a></nav>
+            <main><p>Main content</p></main>
+            <footer><p>Footer</p></footer>
+        </body>
+    </html>
+    """,
+    "empty_body": "<html><body></body></html>",
+    "empty_html": "<html></html>",
+    "empty_string": "",
+    "whitespace_only": "   \n  ",
+    "forms": """
+    <html>
+        <body>
+            <form action="/login" method="post">
+                <input type="email" name="email" placeholder="Enter email" required>
+                <input type="password" name="pass">
+                <input type="submit" value="Login">
+            </form>
+            <form method=""><input></form>
+        </body>
+    </html>
+    """,
+    "lists": """
+    <html>
+        <body>
+            <ul>
+                <li>Item 1</li>
+                <li>Item 2 <ol><li>Nested 1</li><li>Nested 2</li></ol></li>
+            </ul>
+            <ol>
+                <li>Ordered 1</li>
+            </ol>
+        </body>
+    </html>
+    """,
+    "social_links": """
+    <html>
+        <body>
+            <a href="https://facebook.com/page">Facebook</a>
+            <a href="https://twitter.com/user">Twitter</a>
+            <a href="https://linkedin.com/company">LinkedIn</a>
+            <a href="">Empty</a>
+            <a>No href</a>
+        </body>
+    </html>
+    """,
+    "malformed": "<html><body><h1>Unclosed heading<p>Paragraph</body>",
+    "scripts_comments_templates": """
+    <html>
+        <head><title>  </title><style>p { color: red; }</style></head>
+        <body>
+            <!-- a comment --> after comment
+            <p>Text <script>var hidden = 1;</script>tail <!-- inline --> more</p>
+            <template><h1>Template heading</h1><p>Template text</p></template>
+            <h2>Ruby <ruby>漢<rt>kan</rt><rp>(</rp></ruby> heading</h2>
+            <pre>  keep   this  </pre>
+            <textarea>   </textarea>
+            <noscript><p>Enable JavaScript</p></noscript>
+        </body>
+    </html>
+    """,
+    "tables": """
+    <html>
+        <body>
+            <table>
+                <tr><th>Name</th><th> </th></tr>
+                <tr><td>Inner <table><tr><th>Nested</th></tr></table></td></tr>
+            </table>
+        </body>
+    </html>
+    """,
+    "meta_and_title_edge_cases": """
+    <html>
+        <head>
+            <title></title>
+            <meta name="description">
+            <meta name="description" content="Second description">
+        </head>
+        <body><svg><title>Icon</title></svg><p>Body. More. Sentences.</p></body>
+    </html>
+    """,
+    "long_text": "<html><body>" + "<p>word. " * 400 + "</body></html>",
+}
+
+@pytest.mark.parametrize("name", sorted(PARITY_DOCUMENTS))
+def test_lxml_backend_matches_bs4(name):
+    """Test the lxml backend returns exactly the BeautifulSoup backend's dict"""
+    html = PARITY_DOCUMENTS[name]
+    
+    assert parse_html(html, backend="lxml") == parse_html(html, backend="bs4")
+
+def test_lxml_backend_expectations():
+    """Test the lxml backend against test_soup_parser's expectations"""
+    result = parse_html(PARITY_DOCUMENTS["basic"], backend="lxml")
+    
+    assert result["title"] == "Test Page"
+    assert result["meta_description"] == "Test description"
+    assert result["headings"] == ["Main Heading", "Sub Heading"]
+    assert len(result["links"]) == 2
+    assert len(result["images"]) == 1
+    assert len(result["forms"]) == 1
+    assert result["word_count"] > 0
+
+def test_unknown_backend():
+    """Test an unknown backend name is rejected"""
+    with pytest.raises(ValueError):
+        parse_html("<html></html>", backend="html5lib")
@@ -0,0 +1,47 @@
+from crawler.parse_cache import ParseCache, content_hash
+
+
+def test_content_hash_is_stable_and_content_sensitive():
+    """Identical HTML hashes the same; any change gives a new key"""
+    assert content_hash("<p>a</p>") == content_hash("<p>a</p>")
+    assert content_hash("<p>a</p>") != content_hash("<p>b</p>")
+    assert len(content_hash("")) == 32
+
+
+def test_hit_and_miss_counts():
+    """Lookups are counted and reported as a hit rate"""
+    cache = ParseCache()
+    assert cache.get("k") is None
+    cache.put("k", {"title": "T"})
+    assert cache.get("k") == {"title": "T"}
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 1}
+
+
+def test_get_returns_a_copy():
+    """Callers can mutate what they get back without touching the cache"""
+    cache = ParseCache()
+    cache.put("k", {"title": "T", "keyword_text": "words"})
+    first = cache.get("k")
+    first.pop("keyword_text")
+    first["content_hash"] = "k"
+    assert cache.get("k") == {"title": "T", "keyword_text": "words"}
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Reading an entry keeps it alive past the size limit"""
+    cache = ParseCache(maxsize=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.get("a")
+    cache.put("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+
+
+def test_zero_size_disables_caching():
+    """maxsize=0 never stores anything"""
+    cache = ParseCache(maxsize=0)
+    cache.put("k", {"n": 1})
+    assert cache.get("k") is None
+    assert cache.stats()["size"] == 0
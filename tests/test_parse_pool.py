@@ -0,0 +1,35 @@
+import asyncio
+import pytest
+from crawler.parse_pool import ParsePool
+from crawler.soup_parser import parse_html
+
+HTML = """
+<html>
+    <head><title>Pool Test</title></head>
+    <body><h1>Heading</h1><p>Parsed in a worker process.</p><a href="/a">A</a></body>
+</html>
+"""
+
+def _parse_all(pool, documents):
+    async def run():
+        pool.start()
+        try:
+            return await asyncio.gather(*(pool.parse(html) for html in documents))
+        finally:
+            pool.close()
+    return asyncio.run(run())
+
+def test_parse_pool_inline():
+    """Test workers=0 parses on the calling thread with the same output"""
+    results = _parse_all(ParsePool(workers=0), [HTML])
+    
+    assert results[0] == parse_html(HTML)
+
+def test_parse_pool_worker_processes():
+    """Test parsing in worker processes matches parse_html and keeps order"""
+    documents = [HTML.replace("Pool Test", f"Page {i}") for i in range(6)]
+    
+    results = _parse_all(ParsePool(workers=2, max_pending=2), documents)
+    
+    assert [result["title"] for result in results] == [f"Page {i}" for i in range(6)]
+    assert results[0]["headings"] == ["Heading"]
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from crawler.politeness import HostLimiter, PolitenessScheduler
+
+class FakeResponse:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+def test_throttled_response_backs_off_and_retries():
+    """Test a 429 halves the host rate, honours Retry-After and is retried"""
+    scheduler = PolitenessScheduler(rate=4.0)
+    responses = [FakeResponse(429, {"retry-after": "0.2"}), FakeResponse(200)]
+
+    async def request():
+        return responses.pop(0), {"wait_time": 0}
+
+    started = time.monotonic()
+    response, info = asyncio.run(scheduler.run("https://example.com/a", request))
+
+    assert response.status == 200
+    assert time.monotonic() - started >= 0.2
+    stats = scheduler.stats()["example.com"]
+    assert stats["throttled"] == 1 and stats["requests"] == 2
+    assert stats["rate"] == 2.5
+
+def test_gives_up_after_max_retries():
+    """Test a host that keeps throttling gets its response back after max_retries"""
+    scheduler = PolitenessScheduler(max_retries=1)
+    calls = []
+
+    async def request():
+        calls.append(1)
+        return FakeResponse(503, {"retry-after": "0"}), {}
+
+    response, _ = asyncio.run(scheduler.run("https://example.com/", request))
+
+    assert response.status == 503
+    assert len(calls) == 2
+
+def test_rate_grows_then_adapts_to_latency():
+    """Test healthy responses raise the rate and a latency spike lowers it"""
+    limiter = HostLimiter(rate=2.0, max_rate=5.0, min_rate=0.5, max_concurrency=2, burst=2)
+
+    limiter.observe(200, 0.1)
+    limiter.observe(200, 0.1)
+    assert limiter.rate == 4.5
+    limiter.observe(200, 0.1)
+    assert limiter.rate == 5.0
+
+    limiter.observe(200, 1.0)
+    assert limiter.rate == 4.0 and limiter.slowdowns == 1
+    limiter.observe(200, 0.1)
+    assert limiter.rate == 4.5
+
+def test_failures_back_off_and_latency_is_server_time():
+    """Test failed loads and 5xx cut the rate, and latency comes from the response's own timing"""
+    scheduler = PolitenessScheduler(rate=4.0)
+
+    async def fails():
+        raise TimeoutError("navigation timed out")
+
+    async def server_error():
+        return FakeResponse(500), {}
+
+    async def slow_render():
+        response = FakeResponse(200)
+        response.request = type("Request", (), {"timing": {"responseStart": 50.0}})()
+        await asyncio.sleep(0.2)
+        return response, {}
+
+    async def crawl():
+        try:
+            await scheduler.run("https://example.com/", fails)
+        except TimeoutError:
+            pass
+        await scheduler.run("https://example.com/", server_error)
+        await scheduler.run("https://example.com/", slow_render)
+
+    asyncio.run(crawl())
+
+    stats = scheduler.stats()["example.com"]
+    assert stats["failures"] == 2 and stats["requests"] == 3
+    assert stats["rate"] == 1.5
+    assert stats["latency"] == 0.05
+
+def test_per_host_concurrency_and_rate():
+    """Test requests to one host respect its concurrency cap and token rate"""
+    scheduler = PolitenessScheduler(rate=20.0, max_rate=20.0, max_per_host=2, burst=2)
+    in_flight = {"now": 0, "max": 0}
+
+    async def request():
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.05)
+        in_flight["now"] -= 1
+        return FakeResponse(200), {}
+
+    async def crawl():
+        await asyncio.gather(*(scheduler.run(f"https://example.com/{i}", request) for i in range(6)),
+                             scheduler.run("https://other.example/", request))
+
+    started = time.monotonic()
+    asyncio.run(crawl())
+
+    assert in_flight["max"] <= 3
+    assert set(scheduler.stats()) == {"example.com", "other.example"}
+    # Two burst tokens, then four more at 20/s
+    assert time.monotonic() - started >= 0.15
@@ -0,0 +1,31 @@
+import pytest
+from crawler.readiness import ReadinessPolicy, ReadinessStrategy
+
+def test_default_strategy_is_networkidle():
+    """Test the default policy keeps the networkidle behaviour"""
+    policy = ReadinessPolicy()
+    
+    assert policy.strategy_for("https://example.com/").kind == "networkidle"
+
+def test_per_url_pattern_overrides():
+    """Test URL patterns pick their own strategy, first match wins"""
+    policy = ReadinessPolicy(
+        default="load",
+        overrides=[
+            (r"/app/", ReadinessStrategy("selector", selector="#root > *")),
+            (r"/live", "dom_quiet"),
+            (r"/app/live", "domcontentloaded")
+        ]
+    )
+    
+    assert policy.strategy_for("https://example.com/about").kind == "load"
+    assert policy.strategy_for("https://example.com/app/live").describe() == "selector:#root > *"
+    assert policy.strategy_for("https://example.com/live-feed").describe() == "dom_quiet:500ms"
+
+def test_invalid_strategies_rejected():
+    """Test unknown kinds and selector strategies without a selector raise"""
+    with pytest.raises(ValueError):
+        ReadinessStrategy("everything")
+    
+    with pytest.raises(ValueError):
+        ReadinessStrategy("selector")
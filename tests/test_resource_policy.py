@@ -0,0 +1,43 @@
+import pytest
+from crawler.resource_policy import ResourceBlockingPolicy
+
+def test_blocks_unused_resource_types():
+    """Test images, fonts and media are blocked by default"""
+    policy = ResourceBlockingPolicy()
+    
+    assert policy.should_block("https://example.com/logo.png", "image") == "resource_type"
+    assert policy.should_block("https://example.com/font.woff2", "font") == "resource_type"
+    assert policy.should_block("https://example.com/intro.mp4", "media") == "resource_type"
+    assert policy.should_block("https://example.com/app.js", "script") is None
+    assert policy.should_block("https://example.com/site.css", "stylesheet") is None
+
+def test_blocks_tracker_domains():
+    """Test analytics hosts and their subdomains are denied"""
+    policy = ResourceBlockingPolicy()
+    
+    assert policy.should_block("https://www.google-analytics.com/analytics.js", "script") == "deny_domain"
+    assert policy.should_block("https://stats.g.doubleclick.net/collect", "xhr") == "deny_domain"
+    assert policy.should_block("https://notdoubleclick.net/x.js", "script") is None
+
+def test_allow_domains_override_deny_list():
+    """Test allow list takes precedence over the deny list"""
+    policy = ResourceBlockingPolicy(allow_domains=["googletagmanager.com"])
+    
+    assert policy.should_block("https://www.googletagmanager.com/gtm.js", "script") is None
+
+def test_first_party_only():
+    """Test third-party requests are blocked in first-party mode"""
+    policy = ResourceBlockingPolicy(first_party_only=True, allow_domains=["cdn.partner.com"])
+    policy.first_party_domain = "example.com"
+    
+    assert policy.should_block("https://www.example.com/app.js", "script") is None
+    assert policy.should_block("https://static.example.com/app.js", "script") is None
+    assert policy.should_block("https://cdn.other.com/lib.js", "script") == "third_party"
+    assert policy.should_block("https://cdn.partner.com/lib.js", "script") is None
+
+def test_main_document_never_blocked():
+    """Test the page being crawled is always loaded"""
+    policy = ResourceBlockingPolicy(blocked_resource_types=["document"], first_party_only=True)
+    policy.first_party_domain = "example.com"
+    
+    assert policy.should_block("https://other.com/", "document", is_main_document=True) is None
@@ -0,0 +1,95 @@
+import json
+import pytest
+from crawler.playwright_crawler import RecursiveWebCrawler
+from crawler.result_sink import JsonlResultSink, export_json, read_jsonl
+from crawler.website_comparator import WebsiteComparator
+
+RECORDS = [
+    {"action": "Loaded page (depth 0)", "url": "https://example.com/", "data": {"title": "Home"}},
+    {"action": "Clicked 'Menu' - No content change", "url": "https://example.com/", "unchanged": True},
+    {"action": "Loaded page (depth 1)", "url": "https://example.com/a", "data": {"title": "Ünïcode"}}
+]
+
+@pytest.mark.parametrize("name", ["logs.jsonl", "logs.jsonl.gz"])
+def test_sink_round_trip(tmp_path, name):
+    """Test records read back in order, plain or gzip compressed"""
+    sink = JsonlResultSink(str(tmp_path / name))
+    sink.open()
+    for record in RECORDS:
+        sink.write(record)
+    sink.close()
+
+    records = read_jsonl(str(tmp_path / name))
+
+    assert list(records) == RECORDS
+    assert list(records) == RECORDS
+    assert len(records) == 3
+
+def test_apply_keywords_rewrites_records(tmp_path):
+    """Test site keywords are filled in after the records were written"""
+    sink = JsonlResultSink(str(tmp_path / "logs.jsonl"))
+    sink.open()
+    for record in RECORDS:
+        sink.write(record)
+
+    sink.apply_keywords({0: ["home"], 2: ["unicode"]})
+    sink.write({"action": "Late record"})
+    sink.close()
+
+    records = list(read_jsonl(sink.path))
+    assert records[0]["data"]["important_words"] == ["home"]
+    assert records[2]["data"]["important_words"] == ["unicode"]
+    assert records[3] == {"action": "Late record"}
+
+def test_open_keep_drops_records_after_checkpoint(tmp_path):
+    """Test resuming keeps only the records the checkpoint accounted for"""
+    sink = JsonlResultSink(str(tmp_path / "logs.jsonl.gz"))
+    sink.open()
+    for record in RECORDS:
+        sink.write(record)
+    sink.close()
+
+    resumed = JsonlResultSink(sink.path)
+    resumed.open(keep=1)
+    resumed.write({"action": "After resume"})
+    resumed.close()
+
+    assert list(read_jsonl(sink.path)) == [RECORDS[0], {"action": "After resume"}]
+    assert resumed.written == 2
+
+def test_export_json_matches_json_dump(tmp_path):
+    """Test the streamed JSON array is identical to json.dump output"""
+    for records in ([], RECORDS):
+        path = tmp_path / "logs.json"
+        export_json(iter(records), str(path))
+
+        assert path.read_text(encoding="utf-8") == json.dumps(records, indent=2, ensure_ascii=False)
+
+def test_crawler_streams_records_without_keeping_them(tmp_path):
+    """Test keep_results=False sends records to the sink only, keywords included"""
+    sink = JsonlResultSink(str(tmp_path / "logs.jsonl"))
+    crawler = RecursiveWebCrawler(result_sink=sink, keep_results=False)
+    sink.open()
+    crawler._emit({"url": "https://example.com/", "data": {"keyword_text": "pricing plans pricing"}})
+    crawler._emit({"url": "https://example.com/a", "data": {"keyword_text": "careers hiring careers"}})
+
+    sink.apply_keywords(crawler.site_keywords.apply())
+    sink.close()
+
+    records = list(read_jsonl(sink.path))
+    assert crawler.results == []
+    assert crawler.result_count == 2
+    assert records[0]["data"] == {"important_words": ["pricing", "plans"]}
+    assert records[1]["data"]["important_words"][0] == "careers"
+
+def test_comparator_processes_logs_from_disk(tmp_path):
+    """Test _process_website_data accepts records read back from a JSONL file"""
+    sink = JsonlResultSink(str(tmp_path / "website1_logs.jsonl"))
+    sink.open()
+    sink.write({"url": "https://example.com/", "data": {"title": "Home", "word_count": 10, "links": ["/a"]}})
+    sink.close()
+
+    result = WebsiteComparator()._process_website_data(read_jsonl(sink.path), "https://example.com")
+
+    assert result["total_word_count"] == 10
+    assert sorted(result["all_links"]) == ["https://example.com/a"]
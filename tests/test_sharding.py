@@ -0,0 +1,76 @@
+import queue
+from crawler.sharding import ShardedCrawler, ShardFrontier, _ShardCrawler, shard_for
+
+def test_shard_for_is_stable_and_spreads_urls():
+    """Test URLs map to the same shard every time and cover all shards"""
+    urls = [f"https://example.com/page/{i}" for i in range(200)]
+
+    shards = [shard_for(url, 4) for url in urls]
+
+    assert shards == [shard_for(url, 4) for url in urls]
+    assert set(shards) == {0, 1, 2, 3}
+    assert shard_for("https://example.com/", 1) == 0
+
+def test_shard_frontier_reports_and_receives_urls():
+    """Test pushes go to the coordinator and routed URLs come back from the inbox"""
+    inbox, outbox = queue.Queue(), queue.Queue()
+    frontier = ShardFrontier(inbox, outbox)
+
+    assert frontier.push("https://example.com/a", 1)
+    assert not frontier.push("https://example.com/a", 1)
+    assert outbox.get_nowait() == ("discovered", "https://example.com/a", 1)
+    assert outbox.empty()
+
+    assert not frontier
+    inbox.put(("https://example.com/b", 2))
+    assert frontier.pop() == ("https://example.com/b", 2)
+    assert frontier.more_expected()
+
+    inbox.put(None)
+    assert not frontier.more_expected()
+
+def test_coordinator_dedupes_and_enforces_budget():
+    """Test each URL is dispatched once and dispatching stops at max_pages"""
+    crawler = ShardedCrawler(shards=2, max_depth=1, max_pages=3)
+    crawler.inboxes = [queue.Queue(), queue.Queue()]
+
+    assert crawler._dispatch("https://example.com/", 0)
+    crawler._handle(("discovered", "https://example.com/", 1))
+    crawler._handle(("discovered", "https://example.com/deep", 2))
+    crawler._handle(("discovered", "https://example.com/a", 1))
+    crawler._handle(("discovered", "https://example.com/b", 1))
+    crawler._handle(("discovered", "https://example.com/c", 1))
+
+    assert crawler.dispatched == 3
+    assert crawler.visited_urls == {"https://example.com/", "https://example.com/a", "https://example.com/b"}
+    assert sum(inbox.qsize() for inbox in crawler.inboxes) == 3
+
+def test_merge_fits_keywords_across_shards():
+    """Test keyword text from every shard feeds one site-level keyword fit"""
+    crawler = ShardedCrawler(shards=2)
+    crawler._handle(("page_done", 1, [{"action": "Loaded page (depth 1)",
+                                       "data": {"keyword_text": "shared pricing plans"}}]))
+    crawler._handle(("page_done", 0, [{"action": "Loaded page (depth 0)",
+                                       "data": {"keyword_text": "shared company history"}}]))
+
+    results = crawler._merge()
+
+    assert crawler.completed == 2
+    assert [record["action"] for record in results] == ["Loaded page (depth 0)", "Loaded page (depth 1)"]
+    assert "keyword_text" not in results[0]["data"]
+    assert results[0]["data"]["important_words"][0] in ("company", "history")
+    assert results[1]["data"]["important_words"][0] in ("pricing", "plans")
+
+def test_shard_frees_records_once_streamed():
+    """Test a shard hands each page's records to the coordinator and keeps none of them"""
+    outbox = queue.Queue()
+    crawler = _ShardCrawler(0, outbox, parse_workers=0)
+    crawler.results = [{"action": "Loaded page (depth 0)", "url": "https://example.com/"}]
+
+    crawler._page_done()
+    crawler._page_done()
+
+    assert outbox.get_nowait() == ("page_done", 0, [{"action": "Loaded page (depth 0)",
+                                                     "url": "https://example.com/"}])
+    assert outbox.get_nowait() == ("page_done", 0, [])
+    assert crawler.results == []
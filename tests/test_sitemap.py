@@ -0,0 +1,125 @@
+import asyncio
+import gzip
+import io
+from crawler.playwright_crawler import RecursiveWebCrawler
+from crawler.sitemap import SitemapSeeder, iter_sitemap
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://example.com/old</loc><lastmod>2023-01-01</lastmod><priority>0.8</priority></url>
+  <url><loc>https://example.com/new</loc><lastmod>2024-05-01</lastmod><priority>0.8</priority></url>
+  <url><loc>https://example.com/private/page</loc></url>
+  <url><loc>https://other.example/elsewhere</loc></url>
+  <url><loc>https://example.com/low</loc><priority>0.1</priority></url>
+</urlset>"""
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/pages.xml.gz</loc></sitemap>
+  <sitemap><loc>https://example.com/missing.xml</loc></sitemap>
+</sitemapindex>"""
+
+ROBOTS = """User-agent: *
+Disallow: /private/
+Sitemap: https://example.com/sitemap_index.xml
+"""
+
+class FakeResponse:
+    def __init__(self, status_code, body=b""):
+        self.status_code = status_code
+        self.raw = io.BytesIO(body if isinstance(body, bytes) else body.encode())
+        self.text = body if isinstance(body, str) else ""
+
+    def close(self):
+        pass
+
+class FakeSession:
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        return self.pages.get(url) or FakeResponse(404)
+
+def make_seeder():
+    return SitemapSeeder(session=FakeSession({
+        "https://example.com/robots.txt": FakeResponse(200, ROBOTS),
+        "https://example.com/sitemap_index.xml": FakeResponse(200, INDEX),
+        "https://example.com/pages.xml.gz": FakeResponse(200, gzip.compress(URLSET))
+    }))
+
+def test_iter_sitemap_reads_plain_and_gzip():
+    """Test url entries and nested sitemaps are read from plain or gzip XML"""
+    plain = list(iter_sitemap(io.BytesIO(URLSET)))
+    compressed = list(iter_sitemap(io.BytesIO(gzip.compress(URLSET))))
+
+    assert plain == compressed
+    assert plain[0] == ("url", {"url": "https://example.com/old", "priority": 0.8, "lastmod": "2023-01-01"})
+    assert plain[2][1]["priority"] == 0.5
+    assert list(iter_sitemap(io.BytesIO(INDEX)))[0] == ("sitemap", "https://example.com/pages.xml.gz")
+
+def test_discover_follows_robots_and_nested_sitemaps():
+    """Test discovery honours disallow rules, stays on site and orders by priority and lastmod"""
+    seeder = make_seeder()
+
+    entries = seeder.discover("https://example.com/")
+
+    assert [entry["url"] for entry in entries] == ["https://example.com/new", "https://example.com/old",
+                                                   "https://example.com/low"]
+    assert seeder.stats == {"sitemaps": 3, "urls": 3, "disallowed": 1, "failed_sitemaps": 1}
+    assert not seeder.allowed("https://example.com/private/other")
+    assert seeder.entries["https://example.com/new"]["lastmod"] == "2024-05-01"
+
+def test_missing_robots_allows_everything_and_tries_default_sitemap():
+    """Test a site without robots.txt falls back to /sitemap.xml"""
+    seeder = SitemapSeeder(session=FakeSession({
+        "https://example.com/sitemap.xml": FakeResponse(200, URLSET)
+    }))
+
+    entries = seeder.discover("https://example.com/start")
+
+    assert seeder.allowed("https://example.com/private/page")
+    assert len(entries) == 4
+
+def test_crawler_seeds_frontier_and_skips_disallowed_links():
+    """Test the start page is queued first, seeds one level down and disallowed links not at all"""
+    seeder = make_seeder()
+    crawler = RecursiveWebCrawler(seeder=seeder)
+
+    # The sitemap lists the start page too; it keeps depth 0
+    asyncio.run(crawler._queue_start("https://example.com/old"))
+    crawler._follow_links([{"href": "/private/x"}, {"href": "/public"}], "https://example.com/old", 0)
+
+    assert crawler.pages_to_visit.pop() == ("https://example.com/old", 0)
+    assert crawler.pages_to_visit.pop() == ("https://example.com/new", 1)
+    queued = [crawler.pages_to_visit.pop()[0] for _ in range(len(crawler.pages_to_visit))]
+    assert queued == ["https://example.com/low", "https://example.com/public"]
+    assert seeder.session.requested.count("https://example.com/robots.txt") == 1
+
+def test_disallowed_start_url_is_not_queued():
+    """Test a start URL robots.txt disallows is left out while the sitemap seeds are queued"""
+    crawler = RecursiveWebCrawler(seeder=make_seeder())
+
+    asyncio.run(crawler._queue_start("https://example.com/private/page"))
+
+    queued = [crawler.pages_to_visit.pop()[0] for _ in range(len(crawler.pages_to_visit))]
+    assert queued == ["https://example.com/new", "https://example.com/old", "https://example.com/low"]
+
+def test_click_onto_disallowed_page_is_not_read():
+    """Test a click that lands on a robots.txt-disallowed page is recorded without reading or queueing it"""
+    class Page:
+        url = "https://example.com/private/x"
+
+    crawler = RecursiveWebCrawler(seeder=make_seeder())
+    asyncio.run(crawler._seed_frontier("https://example.com/"))
+    queued = len(crawler.pages_to_visit)
+    records = []
+
+    state = asyncio.run(crawler._record_page_after_click(Page(), {"text": "Secret"}, "https://example.com/",
+                                                         "https://example.com/private/x", 0, 0.1, records))
+
+    assert state is None
+    assert records[0]["action"] == "Clicked 'Secret' - Navigated to a page disallowed by robots.txt"
+    assert "data" not in records[0]
+    assert len(crawler.pages_to_visit) == queued
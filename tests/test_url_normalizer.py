@@ -0,0 +1,81 @@
+import pytest
+from crawler.url_normalizer import canonicalize_url
+from crawler.playwright_crawler import RecursiveWebCrawler
+
+# (raw URL, expected canonical form)
+CANONICAL_CORPUS = [
+    ("https://example.com/a", "https://example.com/a"),
+    ("https://example.com/a/", "https://example.com/a"),
+    ("https://example.com/a#section", "https://example.com/a"),
+    ("https://example.com/a?utm_source=x", "https://example.com/a"),
+    ("https://example.com/a?utm_source=x&utm_medium=email&gclid=1", "https://example.com/a"),
+    ("HTTP://Example.COM/a", "http://example.com/a"),
+    ("https://example.com:443/a", "https://example.com/a"),
+    ("http://example.com:80/a", "http://example.com/a"),
+    ("http://example.com:8080/a", "http://example.com:8080/a"),
+    ("https://example.com", "https://example.com/"),
+    ("https://example.com/", "https://example.com/"),
+    ("https://example.com/?b=2&a=1", "https://example.com/?a=1&b=2"),
+    ("https://example.com/search?q=x&fbclid=abc#results", "https://example.com/search?q=x"),
+    ("https://example.com/a?empty=", "https://example.com/a?empty="),
+    ("https://example.com/Path/Case", "https://example.com/Path/Case"),
+    ("https://user:pw@Example.com/a", "https://user:pw@example.com/a"),
+    ("https://[::1]:443/a", "https://[::1]/a"),
+    ("mailto:someone@example.com", "mailto:someone@example.com"),
+    ("javascript:void(0)", "javascript:void(0)"),
+]
+
+@pytest.mark.parametrize("raw,expected", CANONICAL_CORPUS)
+def test_canonicalize_url_corpus(raw, expected):
+    """Test canonical forms for the URL corpus"""
+    assert canonicalize_url(raw) == expected
+
+@pytest.mark.parametrize("raw,expected", CANONICAL_CORPUS)
+def test_canonicalize_url_idempotent(raw, expected):
+    """Test canonicalizing a canonical URL leaves it unchanged"""
+    assert canonicalize_url(canonicalize_url(raw)) == expected
+
+def test_canonicalize_url_duplicates_collapse():
+    """Test the usual duplicate spellings of one page collapse to a single URL"""
+    variants = [
+        "https://example.com/a",
+        "https://example.com/a/",
+        "https://example.com/a#section",
+        "https://example.com/a?utm_source=x",
+        "HTTPS://EXAMPLE.com:443/a",
+    ]
+    
+    assert len({canonicalize_url(url) for url in variants}) == 1
+
+def test_canonicalize_url_custom_tracking_params():
+    """Test tracking parameter stripping is configurable"""
+    url = "https://example.com/a?ref=home&utm_source=x"
+    
+    assert canonicalize_url(url) == "https://example.com/a?ref=home"
+    assert canonicalize_url(url, tracking_params=("ref",)) == "https://example.com/a?utm_source=x"
+    assert canonicalize_url(url, tracking_params=()) == "https://example.com/a?ref=home&utm_source=x"
+
+def test_canonicalize_url_keep_trailing_slash():
+    """Test trailing slash stripping can be turned off"""
+    assert canonicalize_url("https://example.com/a/", strip_trailing_slash=False) == "https://example.com/a/"
+
+def test_crawler_queues_links_as_written_and_dedupes_canonically():
+    """Test links are loaded from their own address while the canonical form decides identity"""
+    crawler = RecursiveWebCrawler()
+    crawler.visited_urls.add("https://example.com/docs")
+
+    crawler._follow_links([{"href": "intro/"}, {"href": "/a?flag#top"}, {"href": "/docs/"},
+                           {"href": "/a?flag="}], "https://example.com/docs/", 0)
+
+    assert crawler.pages_to_visit.pop() == ("https://example.com/docs/intro/", 1)
+    assert crawler.pages_to_visit.pop() == ("https://example.com/a?flag", 1)
+    assert not crawler.pages_to_visit
+
+def test_links_of_a_page_redirected_off_site_stay_external():
+    """Test the same-domain check uses the queued page, not where a redirect ended"""
+    crawler = RecursiveWebCrawler()
+
+    crawler._follow_links([{"href": "https://partner.net/a"}, {"href": "/b"}], "https://example.com/out", 0,
+                          "https://partner.net/landing")
+
+    assert not crawler.pages_to_visit
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from crawler.website_comparator import WebsiteComparator
 
@@ -116,3 +117,44 @@ def test_detect_technologies():
     assert "WordPress" in data["technologies_detected"]
     assert "Responsive Design" in data["technologies_detected"]
     assert "Open Graph" in data["technologies_detected"]
+
+def test_process_website_data_canonical_links():
+    """Test duplicate spellings of the same link are counted once"""
+    comparator = WebsiteComparator()
+    
+    logs = [
+        {"url": "https://example.com/", "data": {"links": ["/a", "/a/", "/a#top", "https://example.com/a?utm_source=x"]}},
+        {"url": "https://example.com/b", "data": {"links": ["HTTPS://Example.com/a", "/c"]}}
+    ]
+    
+    result = comparator._process_website_data(logs, "https://example.com")
+    
+    assert sorted(result["all_links"]) == ["https://example.com/a", "https://example.com/c"]
+
+def test_compare_websites_crawls_sites_concurrently():
+    """Test both crawls run at once and the faster site is processed first"""
+    events = []
+
+    class FakeCrawler:
+        def __init__(self, name, pause):
+            self.name = name
+            self.pause = pause
+
+        async def crawl_website_async(self, url):
+            events.append(f"start {self.name}")
+            await asyncio.sleep(self.pause)
+            events.append(f"done {self.name}")
+            return [{"url": url, "data": {"title": self.name, "word_count": 5}}]
+
+    comparator = WebsiteComparator()
+    comparator._create_crawler = lambda name, url: FakeCrawler(name, 0.05 if name == "website1" else 0.01)
+    processed = []
+    process = comparator._process_website_data
+    comparator._process_website_data = lambda logs, url, crawl_id=None: processed.append(url) or process(logs, url)
+
+    result = comparator.compare_websites("https://one.example", "https://two.example")
+
+    assert events[:2] == ["start website1", "start website2"]
+    assert processed == ["https://two.example", "https://one.example"]
+    assert result["website1"]["page_titles"] == ["website1"]
+    assert result["website2"]["total_word_count"] == 5